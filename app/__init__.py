@@ -1,7 +1,7 @@
 from flask import Flask
 import os
 from app.config import config_by_name as config
-from app.extensions import db, login_manager, mail
+from app.extensions import db, login_manager, mail, job_queue
 from flask_wtf.csrf import CSRFProtect
 from flask_migrate import Migrate
 import importlib.util
@@ -53,6 +53,7 @@ def create_app(config_name="default"):
     db.init_app(app)
     login_manager.init_app(app)
     mail.init_app(app)
+    job_queue.init_app(app)
 
     # Initialize Flask-Migrate
     Migrate(app, db)
@@ -84,13 +85,29 @@ def create_app(config_name="default"):
     # API endpoints typically don't need CSRF protection
     csrf.exempt(api_bp)
 
+    from app.api.gemini_analysis import bp as gemini_api_bp
+    app.register_blueprint(gemini_api_bp, url_prefix="/api")
+    csrf.exempt(gemini_api_bp)
+
     from app.sharing import bp as sharing_bp
     app.register_blueprint(sharing_bp, url_prefix="/share")
 
+    # Parse uploaded tables in the background
+    from app.datasets.tasks import ingest_dataset
+    job_queue.register_handler("dataset_ingest", ingest_dataset)
+
     # Initialize scout report analysis module (only initialize service, no route registration)
     if app.config.get("ENABLE_SCOUT_ANALYSIS", False):
         from app.scout_analysis import scout_bp
         app.register_blueprint(scout_bp)  # No URL prefix set
+
+        from app.scout_analysis.tasks import (
+            run_scout_analysis,
+            mark_scout_analysis_failed,
+        )
+        job_queue.register_handler(
+            "scout_analysis", run_scout_analysis, on_failure=mark_scout_analysis_failed
+        )
         app.logger.info("Scout analysis module initialized")
 
     # Ensure all database tables are created in the application context
@@ -99,15 +116,27 @@ def create_app(config_name="default"):
         from app.models.user import User
         from app.models.dataset import Dataset
         from app.models.share import Share
+        from app.models.job import BackgroundJob
+        from app.models.dataset_profile import DatasetProfile
+        from app.models.dataset_schema import DatasetSchema
+        from app.models.blob import StoredBlob
+        from app.models.dataset_result import DatasetResult
 
         # If scout report analysis is enabled, import its models
         if app.config.get("ENABLE_SCOUT_ANALYSIS", False):
-            from app.scout_analysis.models import ScoutReportAnalysis
+            from app.scout_analysis.models import (
+                ScoutReportAnalysis,
+                AnalysisCacheEntry,
+            )
 
         # Create all tables
         db.create_all()
         app.logger.info("Database tables created successfully")
 
+    # Start background workers, which also resume jobs left over from a restart
+    if app.config["JOB_QUEUE_AUTOSTART"] and not app.config["JOB_QUEUE_EAGER"]:
+        job_queue.start(app)
+
     # Log file configuration
     import logging
     from logging.handlers import RotatingFileHandler
@@ -1,6 +1,14 @@
 from flask import Blueprint, request, current_app, jsonify
+from flask_login import current_user
+from app.extensions import get_gemini_api
+from app.utils.text_analysis import (
+    analyze_sentiment,
+    extract_keywords,
+    summarize_text,
+    classify_text,
+)
 
-bp = Blueprint("api", __name__, url_prefix="/api")
+bp = Blueprint("gemini_api", __name__)
 
 
 @bp.route("/analyze", methods=["POST"])
@@ -22,8 +30,14 @@ def analyze_text():
     Returns:
         JSON with analysis results
     """
+    # Each request spends the server's Gemini quota, so only users may call it
+    if not current_user.is_authenticated:
+        return jsonify({"error": "Authentication required"}), 401
+
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "A JSON object body is required"}), 400
 
         # Log request start
         current_app.logger.info("Received Gemini analysis request")
@@ -42,37 +56,32 @@ def analyze_text():
         options = data.get("options", {})
         current_app.logger.info(f"Analysis options: {options}")
 
-        # Check if Gemini instance exists
-        gemini_instance = current_app.config.get("GEMINI_INSTANCE")
-        if not gemini_instance:
-            current_app.logger.error("GEMINI_INSTANCE not found in app.config!")
+        # Check if the shared Gemini client is configured
+        if not get_gemini_api().api_key:
+            current_app.logger.error("GEMINI_API_KEY is not configured")
             return jsonify({"error": "Gemini API not configured"}), 500
 
-        current_app.logger.info(
-            f"Found GEMINI_INSTANCE, API key: {gemini_instance.api_key[:5]}..."
-        )
-
         # Perform the requested analysis
         result = None
 
         if analysis_type == "sentiment":
             current_app.logger.info("Calling sentiment analysis...")
-            result = gemini_instance.analyze_sentiment(text)
+            result = analyze_sentiment(text)
         elif analysis_type == "keywords":
             current_app.logger.info("Calling keyword extraction...")
-            result = gemini_instance.extract_keywords(text)
+            result = extract_keywords(text)
         elif analysis_type == "summary":
             max_words = options.get("max_words", 100)
             current_app.logger.info(
                 f"Calling text summarization, max words: {max_words}..."
             )
-            result = gemini_instance.summarize(text, max_words=max_words)
+            result = summarize_text(text, max_words=max_words)
         elif analysis_type == "classification":
             categories = options.get("categories", [])
             current_app.logger.info(
                 f"Calling text classification, categories: {categories}..."
             )
-            result = gemini_instance.classify(text, categories=categories)
+            result = classify_text(text, categories=categories)
         else:
             current_app.logger.error(f"Unsupported analysis type: {analysis_type}")
             return (
@@ -1,12 +1,37 @@
-from flask import jsonify, request, current_app
+from flask import Response, jsonify, request, current_app, stream_with_context
 from flask_login import current_user
 from app.api import bp
 from app.models.dataset import Dataset
 from app.models.share import Share
+from app.utils.frame_cache import (
+    frame_cache,
+    load_dataset_columns,
+    load_dataset_frame,
+)
+from app.datasets.profiling import (
+    get_profile,
+    save_profile,
+    save_streamed_profile,
+    use_streaming,
+)
+from app.datasets.schema import (
+    column_entries,
+    get_schema,
+    read_options_for,
+    record_frame_schema,
+)
+from app.datasets.exploration import (
+    CORRELATION_METHODS,
+    cached_result,
+    correlation_matrix,
+    histogram,
+)
 from app.utils import load_dataset
+from app.utils.aggregate import aggregate_frame, parse_aggregations, parse_filters
+from app.utils.downsample import downsample_chart
+from app.utils.row_index import INDEXABLE_EXTENSIONS, read_rows
+from app.utils.workbook import EXCEL_EXTENSIONS, sheet_catalog
 from app.extensions import db
-import numpy as np
-import pandas as pd
 import datetime
 
 
@@ -46,155 +71,360 @@ def health_check():
     return jsonify(response), http_status
 
 
-def analyze_dataset(df):
-    """Analyze the dataset, generate statistics and insights"""
-    result = {
-        "column_count": len(df.columns),
-        "row_count": len(df),
-        "preview": df.head(10).to_dict("records"),
-    }
-
-    # Calculate statistics for numeric columns
-    numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_columns = [col for col in df.columns if col not in numeric_columns]
-
-    result["numeric_columns"] = numeric_columns
-    result["categorical_columns"] = categorical_columns
-
-    if numeric_columns:
-        # Calculate basic statistics for numeric columns
-        stats = df[numeric_columns].describe().to_dict()
-        result["statistics"] = stats
-
-        # Generate insights
-        insights = []
-        for col in numeric_columns[:3]:  # Limit to first 3 numeric columns
-            max_value = df[col].max()
-            min_value = df[col].min()
-            mean_value = df[col].mean()
-            median_value = df[col].median()
-
-            if not pd.isna(max_value) and not pd.isna(min_value):
-                insights.append(
-                    f"Column {col} has a maximum value of {max_value:.2f} "
-                    f"and a minimum value of {min_value:.2f}."
-                )
-
-            if not pd.isna(mean_value) and not pd.isna(median_value):
-                if mean_value > median_value:
-                    insights.append(
-                        f"Column {col} has a positively skewed distribution "
-                        f"(mean > median)."
-                    )
-                elif mean_value < median_value:
-                    insights.append(
-                        f"Column {col} has a negatively skewed distribution "
-                        f"(mean < median)."
-                    )
-
-        result["insights"] = insights
+@bp.route("/metrics")
+def metrics():
+    """Runtime counters for monitoring systems"""
+    from app.extensions import get_gemini_api
+    from app.scout_analysis.cache import analysis_cache
 
-    return result
+    return jsonify(
+        {
+            "gemini": get_gemini_api().state(),
+            "scout_analysis_cache": analysis_cache.stats(),
+            "dataframe_cache": frame_cache.stats(),
+        }
+    )
 
 
-@bp.route("/dataset/<int:dataset_id>/analyze")
-def dataset_analyze(dataset_id):
-    """Dataset analysis API endpoint"""
+def _dataset_access_error(dataset):
+    """Return an error response if the current user cannot see the dataset"""
     if not current_user.is_authenticated:
         return jsonify({"error": "Authentication required"}), 401
 
-    user_id = current_user.id
-    dataset = Dataset.query.get_or_404(dataset_id)
-
     # Check if the user owns the dataset or the dataset is shared with them
+    user_id = current_user.id
     is_owner = dataset.user_id == user_id
     is_shared = (
-        Share.query.filter_by(dataset_id=dataset_id, shared_with_id=user_id).first()
+        Share.query.filter_by(dataset_id=dataset.id, shared_with_id=user_id).first()
         is not None
     )
 
     if not (is_owner or is_shared):
         return jsonify({"error": "Permission denied"}), 403
+    return None
 
-    # Load and analyze the dataset
-    df, error = load_dataset(dataset.file_path)
-    if error:
-        return jsonify({"error": error}), 400
-
-    # Perform analysis
-    analysis_result = analyze_dataset(df)
 
-    return jsonify(analysis_result)
+@bp.route("/dataset/<int:dataset_id>/analyze")
+def dataset_analyze(dataset_id):
+    """Dataset analysis API endpoint"""
+    dataset = Dataset.query.get_or_404(dataset_id)
+    error_response = _dataset_access_error(dataset)
+    if error_response is not None:
+        return error_response
+
+    # Serve the stored profile when it matches the current file
+    profile = get_profile(dataset)
+    if profile is None and use_streaming(dataset.file_path):
+        try:
+            profile = save_streamed_profile(dataset)
+        except Exception as e:
+            return jsonify({"error": f"Error loading dataset: {str(e)}"}), 400
+    if profile is None:
+        df, error = load_dataset_frame(dataset)
+        if error:
+            return jsonify({"error": error}), 400
+        profile = save_profile(dataset, df)
+
+    return jsonify(profile.to_dict())
 
 
 @bp.route("/dataset/<int:dataset_id>/visualize", methods=["GET"])
 def dataset_visualize(dataset_id):
     """Dataset visualization API endpoint"""
-    if not current_user.is_authenticated:
-        return jsonify({"error": "Authentication required"}), 401
-
-    user_id = current_user.id
     dataset = Dataset.query.get_or_404(dataset_id)
-
-    # Check if the user owns the dataset or the dataset is shared with them
-    is_owner = dataset.user_id == user_id
-    is_shared = (
-        Share.query.filter_by(dataset_id=dataset_id, shared_with_id=user_id).first()
-        is not None
-    )
-
-    if not (is_owner or is_shared):
-        return jsonify({"error": "Permission denied"}), 403
+    error_response = _dataset_access_error(dataset)
+    if error_response is not None:
+        return error_response
 
     # Get visualization parameters
     chart_type = request.args.get("chart_type", "bar")
     x_column = request.args.get("x_column")
     y_column = request.args.get("y_column")
+    sheet = request.args.get("sheet")
+    max_points = request.args.get(
+        "max_points", current_app.config["VISUALIZE_MAX_POINTS"], type=int
+    )
+    max_points = min(
+        max(max_points, 3), current_app.config["VISUALIZE_MAX_POINTS_LIMIT"]
+    )
 
-    # Load the dataset
-    df, error = load_dataset(dataset.file_path)
-    if error:
-        return jsonify({"error": error}), 400
+    # Column names and types come from the schema index recorded at upload,
+    # so only the plotted columns have to be loaded
+    df = None
+    if sheet:
+        # Other workbook sheets are read whole from their own sidecar
+        df, error = load_dataset(dataset.file_path, sheet=sheet)
+        if error:
+            return jsonify({"error": error}), 400
+        entries = column_entries(df.dtypes.to_dict())
+        columns = [entry["name"] for entry in entries]
+        numeric_cols = [entry["name"] for entry in entries if entry["numeric"]]
+    else:
+        schema = get_schema(dataset)
+        if schema is None:
+            df, error = load_dataset_frame(dataset)
+            if error:
+                return jsonify({"error": error}), 400
+            schema = record_frame_schema(dataset, df)
+        columns = schema.column_names()
+        numeric_cols = schema.numeric_columns()
 
     if not x_column:
         # If not specified, default to the first column
-        x_column = df.columns[0] if len(df.columns) > 0 else None
+        x_column = columns[0] if len(columns) > 0 else None
 
     if not y_column:
         # Default to the second column or the first numeric column (if any)
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
         if len(numeric_cols) > 0:
             y_column = numeric_cols[0]
-        elif len(df.columns) > 1:
-            y_column = df.columns[1]
+        elif len(columns) > 1:
+            y_column = columns[1]
         else:
-            y_column = df.columns[0] if len(df.columns) > 0 else None
+            y_column = columns[0] if len(columns) > 0 else None
 
-    # Generate visualization data
-    try:
-        if chart_type == "pie":
-            if x_column and y_column:
-                # For pie charts, we need categories and values
-                result = {
-                    "labels": df[x_column].tolist(),
-                    "values": df[y_column].tolist(),
-                }
-        else:
-            # For other chart types (bar, line, scatter)
-            result = {
-                "x": df[x_column].tolist() if x_column else [],
-                "y": df[y_column].tolist() if y_column else [],
-                "type": chart_type,
-            }
+    for column in (x_column, y_column):
+        if column is not None and column not in columns:
+            return jsonify({"error": f"Column not found: {column}"}), 400
+
+    if df is None:
+        df, error = load_dataset_columns(
+            dataset, [column for column in (x_column, y_column) if column]
+        )
+        if error:
+            return jsonify({"error": error}), 400
 
+    # Generate visualization data, reduced to a bounded number of points
+    try:
+        result = downsample_chart(df, chart_type, x_column, y_column, max_points)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 
-@bp.route("/scout-analysis/<int:dataset_id>")
-def scout_analysis(dataset_id):
-    """Scout report analysis API endpoint"""
+@bp.route("/dataset/<int:dataset_id>/aggregate")
+def dataset_aggregate(dataset_id):
+    """Grouped and aggregated dataset rows for bar and pie charts"""
+    dataset = Dataset.query.get_or_404(dataset_id)
+    error_response = _dataset_access_error(dataset)
+    if error_response is not None:
+        return error_response
+
+    group_by = request.args.getlist("group_by")
+    sort = request.args.get("sort")
+    ascending = request.args.get("order", "desc") == "asc"
+    max_groups = current_app.config["AGGREGATE_MAX_GROUPS"]
+    limit = min(max(request.args.get("limit", max_groups, type=int), 1), max_groups)
+    sheet = request.args.get("sheet")
+    try:
+        aggregations = parse_aggregations(request.args.getlist("agg"))
+        filters = parse_filters(request.args.getlist("filter"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    needed = list(
+        dict.fromkeys(
+            group_by
+            + [a["column"] for a in aggregations if a["column"] is not None]
+            + [column for column, _, _ in filters]
+        )
+    )
+
+    df = None
+    if sheet:
+        df, error = load_dataset(dataset.file_path, sheet=sheet)
+        if error:
+            return jsonify({"error": error}), 400
+        columns = [str(col) for col in df.columns]
+    else:
+        schema = get_schema(dataset)
+        if schema is None:
+            df, error = load_dataset_frame(dataset)
+            if error:
+                return jsonify({"error": error}), 400
+            schema = record_frame_schema(dataset, df)
+        columns = schema.column_names()
+
+    for column in needed:
+        if column not in columns:
+            return jsonify({"error": f"Column not found: {column}"}), 400
+    if not columns:
+        return jsonify({"error": "Dataset has no columns"}), 400
+
+    if df is None:
+        # The row count needs a column even when nothing else is referenced
+        df, error = load_dataset_columns(dataset, needed or columns[:1])
+        if error:
+            return jsonify({"error": error}), 400
+
+    try:
+        result = aggregate_frame(
+            df, group_by, aggregations, filters, sort, ascending, limit
+        )
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    result["group_by"] = group_by
+    result["aggregations"] = aggregations
+    return jsonify(result)
+
+
+@bp.route("/dataset/<int:dataset_id>/correlations")
+def dataset_correlations(dataset_id):
+    """Correlation matrix of a dataset's numeric columns"""
+    dataset = Dataset.query.get_or_404(dataset_id)
+    error_response = _dataset_access_error(dataset)
+    if error_response is not None:
+        return error_response
+
+    method = request.args.get("method", "pearson")
+    if method not in CORRELATION_METHODS:
+        methods = ", ".join(CORRELATION_METHODS)
+        return jsonify({"error": f"method must be one of {methods}"}), 400
+
+    schema = get_schema(dataset)
+    if schema is None:
+        df, error = load_dataset_frame(dataset)
+        if error:
+            return jsonify({"error": error}), 400
+        schema = record_frame_schema(dataset, df)
+    numeric_cols = schema.numeric_columns()
+
+    max_columns = current_app.config["CORRELATION_MAX_COLUMNS"]
+    columns = request.args.getlist("columns")
+    for column in columns:
+        if column not in numeric_cols:
+            return jsonify({"error": f"Numeric column not found: {column}"}), 400
+    if len(columns) > max_columns:
+        return (
+            jsonify({"error": f"At most {max_columns} columns can be correlated"}),
+            400,
+        )
+    truncated = not columns and len(numeric_cols) > max_columns
+    columns = list(dict.fromkeys(columns)) or numeric_cols[:max_columns]
+
+    def compute():
+        df, error = load_dataset_columns(dataset, columns)
+        if error:
+            raise ValueError(error)
+        return correlation_matrix(df, columns, method)
+
+    try:
+        result, cached = cached_result(
+            dataset, "correlations", {"method": method, "columns": columns}, compute
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    result["truncated"] = truncated
+    result["cached"] = cached
+    return jsonify(result)
+
+
+@bp.route("/dataset/<int:dataset_id>/histogram/<path:column>")
+def dataset_histogram(dataset_id, column):
+    """Histogram of one numeric column"""
+    dataset = Dataset.query.get_or_404(dataset_id)
+    error_response = _dataset_access_error(dataset)
+    if error_response is not None:
+        return error_response
+
+    bins = request.args.get(
+        "bins", current_app.config["HISTOGRAM_DEFAULT_BINS"], type=int
+    )
+    bins = min(max(bins, 1), current_app.config["HISTOGRAM_MAX_BINS"])
+
+    schema = get_schema(dataset)
+    if schema is None:
+        df, error = load_dataset_frame(dataset)
+        if error:
+            return jsonify({"error": error}), 400
+        schema = record_frame_schema(dataset, df)
+    if column not in schema.column_names():
+        return jsonify({"error": f"Column not found: {column}"}), 400
+    if column not in schema.numeric_columns():
+        return jsonify({"error": f"Column is not numeric: {column}"}), 400
+
+    def compute():
+        df, error = load_dataset_columns(dataset, [column])
+        if error:
+            raise ValueError(error)
+        return histogram(dataset, df[column], bins)
+
+    try:
+        result, cached = cached_result(
+            dataset, "histogram", {"column": column, "bins": bins}, compute
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    result["cached"] = cached
+    return jsonify(result)
+
+
+@bp.route("/dataset/<int:dataset_id>/rows")
+def dataset_rows(dataset_id):
+    """Window of dataset rows for paging through large files"""
+    dataset = Dataset.query.get_or_404(dataset_id)
+    error_response = _dataset_access_error(dataset)
+    if error_response is not None:
+        return error_response
+
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    limit = request.args.get("limit", 100, type=int)
+    limit = min(max(limit, 0), current_app.config["DATASET_ROWS_MAX_LIMIT"])
+
+    ext = dataset.file_path.rsplit(".", 1)[-1].lower()
+    if ext in INDEXABLE_EXTENSIONS:
+        # Delimited files are read with one seek through the row index
+        try:
+            df, total_rows = read_rows(
+                dataset.file_path, offset, limit, read_options_for(dataset)
+            )
+        except Exception as e:
+            return jsonify({"error": f"Error loading dataset: {str(e)}"}), 400
+    else:
+        sheet = request.args.get("sheet")
+        if sheet:
+            df, error = load_dataset(dataset.file_path, sheet=sheet)
+        else:
+            df, error = load_dataset_frame(dataset)
+        if error:
+            return jsonify({"error": error}), 400
+        total_rows = len(df)
+        df = df.iloc[offset : offset + limit]
+
+    return jsonify(
+        {
+            "offset": offset,
+            "limit": limit,
+            "total_rows": total_rows,
+            "columns": [str(col) for col in df.columns],
+            "rows": df.astype(object).where(df.notna(), None).to_dict("records"),
+        }
+    )
+
+
+@bp.route("/dataset/<int:dataset_id>/sheets")
+def dataset_sheets(dataset_id):
+    """Sheet catalog of an Excel workbook"""
+    dataset = Dataset.query.get_or_404(dataset_id)
+    error_response = _dataset_access_error(dataset)
+    if error_response is not None:
+        return error_response
+
+    ext = dataset.file_path.rsplit(".", 1)[-1].lower()
+    if ext not in EXCEL_EXTENSIONS:
+        return jsonify({"error": "Dataset is not an Excel workbook"}), 400
+
+    try:
+        catalog = sheet_catalog(dataset.file_path)
+    except Exception as e:
+        return jsonify({"error": f"Error loading dataset: {str(e)}"}), 400
+    return jsonify({"sheets": catalog["sheets"]})
+
+
+def _scout_access_error(dataset_id):
+    """Return an error response if the current user cannot see the dataset"""
     if not current_user.is_authenticated:
         return (
             jsonify(
@@ -223,6 +453,62 @@ def scout_analysis(dataset_id):
             ),
             403,
         )
+    return None
+
+
+def _scout_analysis_payload(analysis, dataset_id):
+    """Build the API response body for a scout report analysis record"""
+    # If the analysis is still queued or in progress
+    if analysis.processing_status in ("pending", "processing"):
+        return {
+            "processing_status": analysis.processing_status,
+            "dataset_id": dataset_id,
+            "message": "Analysis is in progress",
+        }
+
+    # If the analysis failed
+    if analysis.processing_status == "failed":
+        return {
+            "processing_status": "failed",
+            "dataset_id": dataset_id,
+            "error": "Analysis process failed",
+        }
+
+    # If the analysis completed successfully
+    if analysis.analysis_result:
+        try:
+            import json
+
+            analysis_data = json.loads(analysis.analysis_result)
+            # Add additional information
+            analysis_data["processing_status"] = "completed"
+            analysis_data["dataset_id"] = dataset_id
+            return analysis_data
+        except Exception as e:
+            current_app.logger.error(f"Error parsing analysis result JSON: {str(e)}")
+            # If JSON parsing fails, return the original string as a summary
+            return {
+                "processing_status": "completed",
+                "dataset_id": dataset_id,
+                "summary": analysis.analysis_result,
+                "error": "Result format parsing error",
+            }
+
+    # If there are no analysis results
+    return {
+        "processing_status": "completed",
+        "dataset_id": dataset_id,
+        "summary": "Analysis completed but no results returned",
+        "error": "No analysis data available",
+    }
+
+
+@bp.route("/scout-analysis/<int:dataset_id>")
+def scout_analysis(dataset_id):
+    """Scout report analysis API endpoint"""
+    error_response = _scout_access_error(dataset_id)
+    if error_response is not None:
+        return error_response
 
     # Retrieve the scout report analysis
     try:
@@ -242,72 +528,205 @@ def scout_analysis(dataset_id):
                 404,
             )
 
-        # If the analysis is still in progress
-        if analysis.processing_status == "pending":
-            return jsonify(
-                {
-                    "processing_status": "pending",
-                    "dataset_id": dataset_id,
-                    "message": "Analysis is in progress",
-                }
-            )
+        return jsonify(_scout_analysis_payload(analysis, dataset_id))
 
-        # If the analysis failed
-        if analysis.processing_status == "failed":
-            return jsonify(
+    except Exception as e:
+        current_app.logger.error(f"Error getting scout analysis data: {str(e)}")
+        return (
+            jsonify(
                 {
-                    "processing_status": "failed",
-                    "dataset_id": dataset_id,
-                    "error": "Analysis process failed",
+                    "processing_status": "error",
+                    "error": f"Error retrieving analysis data: {str(e)}",
                 }
-            )
+            ),
+            500,
+        )
 
-        # If the analysis completed successfully
-        if analysis.analysis_result:
-            try:
-                import json
-
-                analysis_data = json.loads(analysis.analysis_result)
-                # Add additional information
-                analysis_data["processing_status"] = "completed"
-                analysis_data["dataset_id"] = dataset_id
-                return jsonify(analysis_data)
-            except Exception as e:
-                current_app.logger.error(
-                    f"Error parsing analysis result JSON: {str(e)}"
-                )
-                # If JSON parsing fails, return the original string as a summary
-                return jsonify(
-                    {
-                        "processing_status": "completed",
-                        "dataset_id": dataset_id,
-                        "summary": analysis.analysis_result,
-                        "error": "Result format parsing error",
-                    }
-                )
-        else:
-            # If there are no analysis results
-            return jsonify(
+
+@bp.route("/scout-analysis/<int:dataset_id>/status")
+def scout_analysis_status(dataset_id):
+    """
+    Long-poll for a change in scout report analysis status
+
+    Query parameters:
+        status: Status the client already knows about
+        wait: Seconds to hold the request open waiting for a change
+
+    The request is answered as soon as an analysis worker in this process
+    signals a new status. Jobs run by other processes cannot signal it, so
+    the record is also re-read every SCOUT_STATUS_RECHECK_SECONDS.
+    """
+    import time
+    from app.scout_analysis.events import event_hub
+    from app.scout_analysis.models import ScoutReportAnalysis
+
+    error_response = _scout_access_error(dataset_id)
+    if error_response is not None:
+        return error_response
+
+    analysis = ScoutReportAnalysis.query.filter_by(dataset_id=dataset_id).first()
+    if not analysis:
+        return (
+            jsonify(
                 {
-                    "processing_status": "completed",
-                    "dataset_id": dataset_id,
-                    "summary": "Analysis completed but no results returned",
-                    "error": "No analysis data available",
+                    "processing_status": "not_found",
+                    "error": "No scout analysis report found for this dataset",
                 }
-            )
+            ),
+            404,
+        )
 
-    except Exception as e:
-        current_app.logger.error(f"Error getting scout analysis data: {str(e)}")
+    status = analysis.processing_status
+    known_status = request.args.get("status")
+    max_wait = current_app.config.get("SCOUT_STATUS_MAX_WAIT_SECONDS", 30)
+    wait = min(max(request.args.get("wait", 0, type=float), 0), max_wait)
+    recheck = current_app.config.get("SCOUT_STATUS_RECHECK_SECONDS", 3)
+
+    # Release the database connection while the request is parked
+    analysis_id = analysis.id
+    db.session.remove()
+
+    deadline = time.monotonic() + wait
+    while status == known_status and status in ("pending", "processing"):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        status = event_hub.wait_for_status(
+            analysis_id, known_status, min(recheck, remaining)
+        ) or _scout_analysis_status(analysis_id)
+
+    return jsonify(
+        {
+            "processing_status": status,
+            "dataset_id": dataset_id,
+            "changed": status != known_status,
+        }
+    )
+
+
+def _scout_analysis_status(analysis_id):
+    """Re-read an analysis status without holding on to the connection"""
+    from app.scout_analysis.models import ScoutReportAnalysis
+
+    try:
+        analysis = db.session.get(ScoutReportAnalysis, analysis_id)
+        return analysis.processing_status if analysis is not None else "failed"
+    finally:
+        db.session.remove()
+
+
+def _sse_event(event, data):
+    """Format one Server-Sent Event"""
+    import json
+
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@bp.route("/scout-analysis/<int:dataset_id>/stream")
+def scout_analysis_stream(dataset_id):
+    """
+    Stream scout report analysis progress as Server-Sent Events
+
+    Sends "delta" events with summary text as Gemini generates it, then a
+    final "complete" or "failed" event carrying the persisted analysis.
+    """
+    import queue
+    import time
+    from app.scout_analysis.events import event_hub
+    from app.scout_analysis.models import ScoutReportAnalysis
+
+    error_response = _scout_access_error(dataset_id)
+    if error_response is not None:
+        return error_response
+
+    analysis = ScoutReportAnalysis.query.filter_by(dataset_id=dataset_id).first()
+    if not analysis:
         return (
             jsonify(
                 {
-                    "processing_status": "error",
-                    "error": f"Error retrieving analysis data: {str(e)}",
+                    "processing_status": "not_found",
+                    "error": "No scout analysis report found for this dataset",
                 }
             ),
-            500,
+            404,
         )
 
+    analysis_id = analysis.id
+    keepalive = current_app.config.get("SCOUT_STREAM_KEEPALIVE_SECONDS", 15)
+    timeout = current_app.config.get("SCOUT_STREAM_TIMEOUT_SECONDS", 300)
+    recheck = current_app.config.get("SCOUT_STATUS_RECHECK_SECONDS", 3)
+
+    # Release the database connection while the stream is open
+    db.session.remove()
+
+    def final_event():
+        """Return the closing event if the analysis has finished"""
+        try:
+            analysis = db.session.get(ScoutReportAnalysis, analysis_id)
+            if analysis is None:
+                payload = {
+                    "processing_status": "failed",
+                    "dataset_id": dataset_id,
+                    "error": "Analysis no longer exists",
+                }
+            elif analysis.processing_status in ("pending", "processing"):
+                return None
+            else:
+                payload = _scout_analysis_payload(analysis, dataset_id)
+        finally:
+            db.session.remove()
+        event = "complete" if payload["processing_status"] == "completed" else "failed"
+        return _sse_event(event, payload)
+
+    def generate():
+        # Subscribe before checking the record so no event is missed
+        subscriber = event_hub.subscribe(analysis_id)
+        try:
+            closing = final_event()
+            if closing is not None:
+                yield closing
+                return
+
+            deadline = time.monotonic() + timeout
+            next_recheck = time.monotonic() + recheck
+            next_keepalive = time.monotonic() + keepalive
+            while time.monotonic() < deadline:
+                now = time.monotonic()
+                if now >= next_recheck:
+                    # The job may be running in another process, which cannot
+                    # signal this hub, so the record is re-read now and then
+                    next_recheck = now + recheck
+                    closing = final_event()
+                    if closing is not None:
+                        yield closing
+                        return
+                if now >= next_keepalive:
+                    next_keepalive = now + keepalive
+                    yield ": keepalive\n\n"
+                try:
+                    event, data = subscriber.get(
+                        timeout=max(
+                            min(next_keepalive, next_recheck, deadline) - now, 0
+                        )
+                    )
+                except queue.Empty:
+                    continue
+
+                if event in event_hub.FINAL_EVENTS:
+                    yield final_event() or _sse_event(event, data)
+                    return
+                yield _sse_event(event, data)
+
+            yield _sse_event("timeout", {"processing_status": "processing"})
+        finally:
+            event_hub.unsubscribe(analysis_id, subscriber)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @bp.route("/test-api")
 def test_api():
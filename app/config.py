@@ -31,10 +31,68 @@ class Config:
         "pdf",
         "docx",
     }  # Supported file formats for scout reports
+    SCOUT_CHUNK_TOKENS = 2000  # Token budget per chunk of a long report
+    SCOUT_CHUNK_CONCURRENCY = 8  # Chunks analyzed in parallel
+    SCOUT_CACHE_TTL_SECONDS = 7 * 24 * 3600  # Lifetime of cached Gemini results
+    SCOUT_CACHE_MAX_ENTRIES = 10000  # Rows kept in the shared cache table
+    SCOUT_CACHE_MEMORY_ENTRIES = 256  # Hot entries kept in each process
+    SCOUT_STREAMING_ENABLED = True  # Stream Gemini output to the browser
+    SCOUT_STREAM_KEEPALIVE_SECONDS = 15  # Interval between SSE keep-alive comments
+    SCOUT_STREAM_TIMEOUT_SECONDS = 300  # Longest an SSE connection is held open
+    SCOUT_STATUS_MAX_WAIT_SECONDS = 30  # Longest a status long-poll is held open
+    SCOUT_STATUS_RECHECK_SECONDS = 3  # DB re-check for jobs run by other processes
+
+    # Dataset loading configuration
+    DATASET_SIDECAR_ENABLED = True  # Cache parsed uploads in columnar sidecar files
+    DATAFRAME_CACHE_MAX_BYTES = int(
+        os.environ.get("DATAFRAME_CACHE_MAX_BYTES", 256 * 1024**2)
+    )  # Memory budget for loaded DataFrames in each process
+    DATASET_STREAMING_THRESHOLD_BYTES = int(
+        os.environ.get("DATASET_STREAMING_THRESHOLD_BYTES", 128 * 1024**2)
+    )  # Larger CSV/TXT files are profiled in chunks instead of loaded whole
+    DATASET_STREAMING_CHUNK_ROWS = 50000  # Rows parsed per chunk when streaming
+    DATASET_ROWS_MAX_LIMIT = 1000  # Most rows returned by one /rows request
+    VISUALIZE_MAX_POINTS = 5000  # Default point budget for chart data
+    VISUALIZE_MAX_POINTS_LIMIT = 50000  # Largest max_points a client may request
+    AGGREGATE_MAX_GROUPS = 1000  # Most groups returned by one /aggregate request
+    CORRELATION_MAX_COLUMNS = 100  # Most columns in one correlation matrix
+    HISTOGRAM_DEFAULT_BINS = 20  # Bins when a histogram request names none
+    HISTOGRAM_MAX_BINS = 200  # Most bins a histogram request may ask for
+
+    # Background job configuration
+    JOB_WORKER_THREADS = int(os.environ.get("JOB_WORKER_THREADS", 4))
+    JOB_QUEUE_EAGER = False  # Run jobs inline instead of in worker threads
+    # Start worker threads in create_app; turn off for scripts and CLI commands
+    JOB_QUEUE_AUTOSTART = (
+        os.environ.get("JOB_QUEUE_AUTOSTART", "true").lower() == "true"
+    )
+    JOB_POLL_INTERVAL = 2.0  # Seconds between polls of the job table
+    JOB_LEASE_SECONDS = 300  # Renewed while a job runs; retried once a lease lapses
+    JOB_MAX_ATTEMPTS = 3
+    JOB_RETRY_BACKOFF_SECONDS = 10  # Doubled after each failed attempt
 
     # API key configuration - read from environment variables
     GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 
+    # Gemini HTTP client configuration
+    GEMINI_API_BASE_URL = os.environ.get(
+        "GEMINI_API_BASE_URL", "https://generativelanguage.googleapis.com/v1beta"
+    )
+    GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash")
+    GEMINI_POOL_SIZE = int(os.environ.get("GEMINI_POOL_SIZE", 10))
+    GEMINI_CONNECT_TIMEOUT = 5  # Seconds to establish a connection
+    GEMINI_READ_TIMEOUT = 60  # Seconds to wait for a response
+    GEMINI_HTTP2 = (
+        os.environ.get("GEMINI_HTTP2", "false").lower() == "true"
+    )  # Requires httpx[http2]
+    GEMINI_BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures before failing fast
+    GEMINI_BREAKER_RECOVERY_SECONDS = 30  # Wait before sending a half-open probe
+    GEMINI_RATE_LIMIT_PER_MINUTE = int(
+        os.environ.get("GEMINI_RATE_LIMIT_PER_MINUTE", 60)
+    )  # 0 turns the client-side rate limit off
+    GEMINI_RATE_LIMIT_BURST = 10
+    GEMINI_RATE_LIMIT_WAIT_SECONDS = 5  # Longest wait for a token before falling back
+
     # Email configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
@@ -81,6 +139,7 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"  # Use in-memory database for testing
+    JOB_QUEUE_EAGER = True  # Run background jobs synchronously in tests
 
 
 class ProductionConfig(Config):
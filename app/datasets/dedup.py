@@ -0,0 +1,115 @@
+"""
+Reuse of work already done for identical uploads
+
+Datasets uploaded with the same content share one stored file, so the
+profile, schema and scout analysis of an earlier dataset apply unchanged to
+a new one and are copied instead of being computed again.
+"""
+from app.extensions import db
+from app.models.dataset import Dataset
+
+# Scout analysis fields copied from a completed analysis
+ANALYSIS_FIELDS = (
+    "analysis_result",
+    "player_name",
+    "position",
+    "team",
+    "offensive_rating",
+    "defensive_rating",
+    "physical_rating",
+    "technical_rating",
+    "potential_rating",
+    "overall_rating",
+)
+
+
+def _siblings(dataset):
+    return (
+        Dataset.query.filter(
+            Dataset.file_path == dataset.file_path, Dataset.id != dataset.id
+        )
+        .order_by(Dataset.id)
+        .all()
+    )
+
+
+def reuse_ingest(dataset):
+    """
+    Copy the profile and schema of another dataset with the same file
+
+    Returns:
+        bool: True if both were copied and the dataset needs no ingest job
+    """
+    from app.datasets.profiling import profile_version
+    from app.models.dataset_profile import DatasetProfile
+    from app.models.dataset_schema import DatasetSchema
+
+    version = profile_version(dataset.file_path)
+    for sibling in _siblings(dataset):
+        profile, schema = sibling.profile, sibling.schema
+        if (
+            profile is None
+            or schema is None
+            or profile.file_version != version
+            or schema.file_version != version
+        ):
+            continue
+        db.session.add(
+            DatasetProfile(
+                dataset_id=dataset.id,
+                file_version=profile.file_version,
+                row_count=profile.row_count,
+                column_count=profile.column_count,
+                column_types=profile.column_types,
+                numeric_columns=profile.numeric_columns,
+                categorical_columns=profile.categorical_columns,
+                statistics=profile.statistics,
+                preview=profile.preview,
+                insights=profile.insights,
+                categorical_summary=profile.categorical_summary,
+            )
+        )
+        db.session.add(
+            DatasetSchema(
+                dataset_id=dataset.id,
+                file_version=schema.file_version,
+                columns=schema.columns,
+                parse_options=schema.parse_options,
+                storage_dtypes=schema.storage_dtypes,
+            )
+        )
+        db.session.commit()
+        return True
+    return False
+
+
+def reuse_analysis(dataset):
+    """
+    Copy a completed scout analysis of another dataset with the same file
+
+    Returns:
+        ScoutReportAnalysis: The new completed analysis, or None
+    """
+    from app.scout_analysis.models import ScoutReportAnalysis
+
+    sibling_ids = [sibling.id for sibling in _siblings(dataset)]
+    if not sibling_ids:
+        return None
+    source = (
+        ScoutReportAnalysis.query.filter(
+            ScoutReportAnalysis.dataset_id.in_(sibling_ids),
+            ScoutReportAnalysis.processing_status == "completed",
+        )
+        .order_by(ScoutReportAnalysis.id.desc())
+        .first()
+    )
+    if source is None:
+        return None
+    analysis = ScoutReportAnalysis(
+        dataset_id=dataset.id,
+        processing_status="completed",
+        **{field: getattr(source, field) for field in ANALYSIS_FIELDS},
+    )
+    db.session.add(analysis)
+    db.session.commit()
+    return analysis
@@ -0,0 +1,187 @@
+"""
+Correlation matrices and histograms for exploring a dataset
+
+One correlation request covers every pair of numeric columns, replacing a
+series of single x/y charts. Both results are computed with vectorized
+NumPy and stored in the dataset_results table under the file version they
+were computed from, so repeated requests are served from the database until
+the file changes.
+"""
+import hashlib
+import json
+
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+
+from app.datasets.numeric_stats import numeric_block
+from app.datasets.profiling import get_profile, profile_version
+from app.extensions import db
+from app.models.dataset_result import DatasetResult
+
+CORRELATION_METHODS = ("pearson", "spearman")
+
+
+def _cache_key(kind, params):
+    payload = json.dumps([kind, params], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_result(dataset, kind, params, compute):
+    """
+    Return a stored result for the dataset's current file, or compute it
+
+    Args:
+        dataset (Dataset): Dataset record
+        kind (str): Request kind, such as "correlations"
+        params (dict): JSON-serializable request parameters
+        compute (callable): Returns the result dict when nothing is stored
+
+    Returns:
+        tuple: (result dict, True if it was served from the cache)
+    """
+    key = _cache_key(kind, params)
+    version = profile_version(dataset.file_path)
+    entry = DatasetResult.query.filter_by(dataset_id=dataset.id, cache_key=key).first()
+    if entry is not None and entry.file_version == version:
+        return entry.get_result(), True
+
+    result = compute()
+    if entry is None:
+        entry = DatasetResult(dataset_id=dataset.id, cache_key=key)
+        db.session.add(entry)
+    entry.file_version = version
+    entry.result = json.dumps(result)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request stored the same result first
+        db.session.rollback()
+    return result, False
+
+
+def _json_matrix(matrix):
+    """Nested lists with None in place of NaN"""
+    return [[None if np.isnan(v) else float(v) for v in row] for row in matrix]
+
+
+def _rank_columns(block):
+    """Average ranks of each column, keeping NaN where values are missing"""
+    ranks = np.full(block.shape, np.nan)
+    for i in range(block.shape[1]):
+        values = block[:, i]
+        present = np.flatnonzero(~np.isnan(values))
+        order = present[np.argsort(values[present], kind="stable")]
+        ordered = values[order]
+        # Tied values share the mean of their positions
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        ends = np.r_[starts[1:], len(ordered)]
+        average = (starts + ends - 1) / 2.0 + 1
+        ranks[order, i] = np.repeat(average, ends - starts)
+    return ranks
+
+
+def _pairwise_pearson(block):
+    """
+    Pearson correlation of every column pair over rows where both are present
+
+    Sums over pairwise-complete rows are obtained for all pairs at once as
+    matrix products of the zero-filled values and the presence mask.
+    """
+    present = ~np.isnan(block)
+    mask = present.astype(np.float64)
+    # Centering first keeps the sums of squares from cancelling
+    totals = np.where(present, block, 0.0).sum(axis=0)
+    means = totals / np.maximum(present.sum(axis=0), 1)
+    values = np.where(present, block - means, 0.0)
+
+    counts = mask.T @ mask
+    sums = values.T @ mask  # sums[i, j]: sum of column i where j is present
+    squares = (values**2).T @ mask
+    products = values.T @ values
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = products - sums * sums.T / counts
+        variance_x = squares - sums**2 / counts
+        variance_y = variance_x.T
+        matrix = covariance / np.sqrt(variance_x * variance_y)
+    matrix[counts < 2] = np.nan
+    return np.clip(matrix, -1.0, 1.0)
+
+
+def correlation_matrix(df, columns, method="pearson"):
+    """
+    Correlation matrix of numeric columns
+
+    Complete data goes straight to np.corrcoef. With missing values each
+    pair uses the rows where both columns are present, as pandas does; for
+    Spearman the ranks are taken over each column's present values.
+
+    Args:
+        df (DataFrame): Frame holding the columns
+        columns (list): Numeric column names
+        method (str): "pearson" or "spearman"
+
+    Returns:
+        dict: "method", "columns", "rows" and "matrix" (None where undefined)
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    block = numeric_block(df, columns)
+    if method == "spearman":
+        block = _rank_columns(block)
+
+    if len(block) < 2 or not len(columns):
+        matrix = np.full((len(columns), len(columns)), np.nan)
+    elif not np.isnan(block).any():
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = np.atleast_2d(np.corrcoef(block, rowvar=False))
+    else:
+        matrix = _pairwise_pearson(block)
+
+    return {
+        "method": method,
+        "columns": [str(col) for col in columns],
+        "rows": len(df),
+        "matrix": _json_matrix(matrix),
+    }
+
+
+def bin_edges(low, high, bins):
+    """Evenly spaced edges over [low, high], widened when the range is empty"""
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def histogram(dataset, series, bins):
+    """
+    Histogram of a numeric column
+
+    Bin edges come from the minimum and maximum in the stored profile when
+    there is one, so the values are only passed over once, by np.histogram.
+
+    Returns:
+        dict: "column", "edges", "counts", "nulls", "min" and "max"
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    finite = values[np.isfinite(values)]
+
+    profile = get_profile(dataset)
+    statistics = (profile.to_dict().get("statistics") or {}) if profile else {}
+    stats = statistics.get(str(series.name))
+    if stats and stats["count"] and np.isfinite([stats["min"], stats["max"]]).all():
+        low, high = stats["min"], stats["max"]
+    elif len(finite):
+        low, high = float(finite.min()), float(finite.max())
+    else:
+        low, high = None, None
+
+    edges = bin_edges(low, high, bins) if low is not None else bin_edges(0, 1, bins)
+    counts, _ = np.histogram(finite, bins=edges)
+    return {
+        "column": str(series.name),
+        "edges": edges.tolist(),
+        "counts": counts.tolist(),
+        "nulls": int(len(values) - len(finite)),
+        "min": low,
+        "max": high,
+    }
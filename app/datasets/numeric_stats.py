@@ -0,0 +1,99 @@
+"""
+Fused statistics kernel for numeric columns
+
+DataFrame.describe() reduces each column separately, once per statistic,
+and the insights used to call max, min, mean and median on top of that.
+Here all numeric columns are copied into one column-major float block and
+sorted once along the rows. Missing values sort last, so the count of each
+column locates its minimum, maximum and quartiles by indexing, and the sum
+and squared deviations are two reductions over the whole block.
+"""
+import numpy as np
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+def numeric_block(df, columns):
+    """Copy numeric columns into a column-major float64 array"""
+    block = np.empty((len(df), len(columns)), dtype=np.float64, order="F")
+    for i, col in enumerate(columns):
+        block[:, i] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return block
+
+
+def block_statistics(block):
+    """
+    Compute per-column statistics of a 2-D float array
+
+    Args:
+        block (ndarray): Values with one column per variable; NaN is missing
+
+    Returns:
+        dict: Arrays with one entry per column for "count", "nulls", "sum",
+            "mean", "var" (sample variance), "min", "max" and each quantile
+            in QUANTILES, keyed by the quantile
+    """
+    rows, width = block.shape
+    ordered = np.sort(block, axis=0)
+    count = rows - np.isnan(ordered).sum(axis=0)
+    present = np.arange(rows)[:, None] < count
+
+    values = np.where(present, ordered, 0.0)
+    total = values.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / count, np.nan)
+        deviations = np.where(present, ordered - mean, 0.0)
+        m2 = np.einsum("ij,ij->j", deviations, deviations)
+        var = np.where(count > 1, m2 / (count - 1), np.nan)
+
+    columns = np.arange(width)
+    last = np.maximum(count - 1, 0)
+    empty = count == 0
+    result = {
+        "count": count,
+        "nulls": rows - count,
+        "sum": total,
+        "mean": mean,
+        "var": var,
+        "min": np.where(empty, np.nan, ordered[0, columns] if rows else np.nan),
+        "max": np.where(empty, np.nan, ordered[last, columns] if rows else np.nan),
+    }
+    # Linear interpolation between the closest ranks, as pandas does
+    for q in QUANTILES:
+        position = q * last
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        if rows:
+            below, above = ordered[low, columns], ordered[high, columns]
+            value = below + (above - below) * (position - low)
+        else:
+            value = np.full(width, np.nan)
+        result[q] = np.where(empty, np.nan, value)
+    return result
+
+
+def describe_numeric(df, columns):
+    """
+    Statistics of numeric columns in DataFrame.describe() order
+
+    Returns:
+        dict: {column: {"count", "mean", "std", "min", "25%", "50%", "75%",
+            "max", "nulls", "sum", "var"}}
+    """
+    stats = block_statistics(numeric_block(df, columns))
+    described = {}
+    for i, col in enumerate(columns):
+        entry = {
+            "count": float(stats["count"][i]),
+            "mean": float(stats["mean"][i]),
+            "std": float(np.sqrt(stats["var"][i])),
+            "min": float(stats["min"][i]),
+        }
+        for q in QUANTILES:
+            entry[f"{q:.0%}"] = float(stats[q][i])
+        entry["max"] = float(stats["max"][i])
+        entry["nulls"] = int(stats["nulls"][i])
+        entry["sum"] = float(stats["sum"][i])
+        entry["var"] = float(stats["var"][i])
+        described[col] = entry
+    return described
@@ -0,0 +1,155 @@
+"""
+Dataset profiling
+
+Computes the statistics, preview and insights shown on the visualization
+page. Profiles are stored in the dataset_profiles table per file version, so
+they are computed once after upload rather than on every request. Files
+above DATASET_STREAMING_THRESHOLD_BYTES are profiled in chunks by
+app.datasets.streaming instead of being loaded whole.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from flask import current_app
+
+from app.datasets.numeric_stats import describe_numeric
+from app.datasets.sketches import summarize_categorical
+from app.extensions import db
+from app.models.dataset_profile import DatasetProfile
+
+
+def profile_version(file_path):
+    """Return the version string a profile of this file is stored under"""
+    from app.utils.frame_cache import file_version
+
+    version = file_version(file_path)
+    return f"{version[0]}-{version[1]}" if version else None
+
+
+def profile_dataframe(df):
+    """Analyze the dataset, generate statistics and insights"""
+    result = {
+        "column_count": len(df.columns),
+        "row_count": len(df),
+        "preview": df.head(10).to_dict("records"),
+        "column_types": {str(col): str(dtype) for col, dtype in df.dtypes.items()},
+    }
+
+    # Calculate statistics for numeric columns
+    numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    categorical_columns = [col for col in df.columns if col not in numeric_columns]
+
+    result["numeric_columns"] = numeric_columns
+    result["categorical_columns"] = categorical_columns
+    result["categorical_summary"] = summarize_categorical(df, categorical_columns)
+
+    if numeric_columns:
+        # All numeric columns are summarized in one pass over a float block
+        stats = describe_numeric(df, numeric_columns)
+        result["statistics"] = stats
+        result["insights"] = generate_insights(stats, numeric_columns)
+
+    return result
+
+
+def generate_insights(stats, numeric_columns):
+    """Describe the range and skew of the first numeric columns"""
+    insights = []
+    for col in numeric_columns[:3]:  # Limit to first 3 numeric columns
+        max_value = stats[col]["max"]
+        min_value = stats[col]["min"]
+        mean_value = stats[col]["mean"]
+        median_value = stats[col]["50%"]
+
+        if not pd.isna(max_value) and not pd.isna(min_value):
+            insights.append(
+                f"Column {col} has a maximum value of {max_value:.2f} "
+                f"and a minimum value of {min_value:.2f}."
+            )
+
+        if not pd.isna(mean_value) and not pd.isna(median_value):
+            if mean_value > median_value:
+                insights.append(
+                    f"Column {col} has a positively skewed distribution "
+                    f"(mean > median)."
+                )
+            elif mean_value < median_value:
+                insights.append(
+                    f"Column {col} has a negatively skewed distribution "
+                    f"(mean < median)."
+                )
+
+    return insights
+
+
+def use_streaming(file_path):
+    """Return True if a file is too large to profile in memory"""
+    from app.datasets.streaming import STREAMABLE_EXTENSIONS
+
+    ext = file_path.rsplit(".", 1)[1].lower() if "." in file_path else ""
+    if ext not in STREAMABLE_EXTENSIONS:
+        return False
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        return False
+    return size >= current_app.config["DATASET_STREAMING_THRESHOLD_BYTES"]
+
+
+def get_profile(dataset):
+    """Return the stored profile if it matches the dataset's current file"""
+    profile = DatasetProfile.query.filter_by(dataset_id=dataset.id).first()
+    if profile is not None and profile.file_version == profile_version(
+        dataset.file_path
+    ):
+        return profile
+    return None
+
+
+def store_profile(dataset, result):
+    """
+    Store a profile dict for a dataset, replacing any older profile
+
+    Returns:
+        DatasetProfile: The stored profile
+    """
+    profile = DatasetProfile.query.filter_by(dataset_id=dataset.id).first()
+    if profile is None:
+        profile = DatasetProfile(dataset_id=dataset.id)
+        db.session.add(profile)
+    profile.update_from_profile(result, profile_version(dataset.file_path))
+    db.session.commit()
+    return profile
+
+
+def save_profile(dataset, df):
+    """
+    Compute and store the profile of a loaded dataset
+
+    Returns:
+        DatasetProfile: The stored profile
+    """
+    return store_profile(dataset, profile_dataframe(df))
+
+
+def save_streamed_profile(dataset, read_options=None):
+    """
+    Profile a dataset file in chunks without loading it whole, and store it
+
+    Args:
+        dataset (Dataset): Dataset record
+        read_options (dict): read_csv arguments; looked up when not given
+
+    Returns:
+        DatasetProfile: The stored profile
+    """
+    from app.datasets.schema import read_options_for
+    from app.datasets.streaming import profile_file
+
+    result = profile_file(
+        dataset.file_path,
+        current_app.config["DATASET_STREAMING_CHUNK_ROWS"],
+        read_options or read_options_for(dataset),
+    )
+    return store_profile(dataset, result)
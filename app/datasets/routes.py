@@ -1,17 +1,14 @@
 # filepath: e:\5505\5505_group_project\app\datasets\routes.py
 from flask import render_template, redirect, url_for, flash, current_app
 from werkzeug.utils import secure_filename
-import os
 from app.datasets import bp
 from app.models.dataset import Dataset
-from app.extensions import db
-from app.utils import generate_unique_filename, sanitize_filename
+from app.extensions import db, job_queue
+from app.utils import sanitize_filename
 from app.datasets.forms import UploadDatasetForm
 from flask_login import login_required, current_user
 
 # These modules will be imported inside functions when needed
-# from app.scout_analysis.processors import is_scout_report
-# from app.scout_analysis.services import ScoutAnalysisService
 # from app.scout_analysis.models import ScoutReportAnalysis
 
 
@@ -30,16 +27,14 @@ def upload():
         filename = secure_filename(file.filename)
         filename = sanitize_filename(filename)
 
-        # Generate a unique filename
-        unique_filename = generate_unique_filename(filename)
+        # Save the file once per content; identical uploads share it
+        from app.utils.blob_store import store_upload
 
-        # Ensure the upload directory exists
-        upload_folder = current_app.config["UPLOAD_FOLDER"]
-        os.makedirs(upload_folder, exist_ok=True)
-
-        # Save the file
-        file_path = os.path.join(upload_folder, unique_filename)
-        file.save(file_path)
+        extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        blob, duplicate = store_upload(
+            file, current_app.config["UPLOAD_FOLDER"], extension
+        )
+        file_path = blob.path
 
         # Create dataset record
         new_dataset = Dataset(
@@ -51,60 +46,39 @@ def upload():
         db.session.add(new_dataset)
         db.session.commit()
 
-        # Automatically analyze any text file
+        # Parse tabular files once in the background so later loads are fast
+        from app.datasets.dedup import reuse_analysis, reuse_ingest
+        from app.datasets.tasks import TABULAR_EXTENSIONS
+
+        if extension in TABULAR_EXTENSIONS and not (
+            duplicate and reuse_ingest(new_dataset)
+        ):
+            job_queue.enqueue("dataset_ingest", dataset_id=new_dataset.id)
+
+        # Automatically analyze any text file in the background
         if current_app.config.get("ENABLE_SCOUT_ANALYSIS", False):
-            from app.scout_analysis.processors import extract_text_from_file
-            from app.scout_analysis.services import ScoutAnalysisService
             from app.scout_analysis.models import ScoutReportAnalysis
 
-            # No longer setting API key here, using Flask global config uniformly
+            if duplicate and reuse_analysis(new_dataset):
+                flash(
+                    "File uploaded successfully! The analysis of an identical file was reused.",
+                    "success",
+                )
+                return redirect(url_for("dashboard.index"))
+
             analysis = ScoutReportAnalysis(
                 dataset_id=new_dataset.id, processing_status="pending"
             )
             db.session.add(analysis)
             db.session.commit()
-            try:
-                text_content = extract_text_from_file(file_path)
-                current_app.logger.warning(
-                    f"[DEBUG] Extracted text content: {text_content[:200]}"
-                )
-                if (
-                    text_content
-                    and not text_content.startswith("ERROR")
-                    and len(text_content.strip()) > 0
-                ):
-                    analysis_result = ScoutAnalysisService.analyze_report(
-                        text_content,
-                        use_deep_analysis=current_app.config.get(
-                            "ENABLE_SCOUT_DEEP_ANALYSIS", False
-                        ),
-                    )
-                    current_app.logger.warning(
-                        f"[DEBUG] AI analysis result: {analysis_result}"
-                    )
-                    analysis.update_from_analysis_result(analysis_result)
-                    db.session.commit()
-                    flash(
-                        "File uploaded successfully! Text content has been automatically analyzed.",
-                        "success",
-                    )
-                else:
-                    analysis.processing_status = "failed"
-                    analysis.analysis_result = '{"error": "Unable to extract valid text content, unable to analyze."}'
-                    db.session.commit()
-                    flash(
-                        "File uploaded successfully! But unable to extract valid text content, unable to analyze.",
-                        "warning",
-                    )
-            except Exception as e:
-                current_app.logger.error(f"Scout report analysis error: {str(e)}")
-                analysis.processing_status = "failed"
-                analysis.analysis_result = f'{{"error": "Analysis error: {str(e)}"}}'
-                db.session.commit()
-                flash(
-                    "File uploaded successfully! But analysis error occurred.",
-                    "warning",
-                )
+
+            job_queue.enqueue(
+                "scout_analysis", analysis_id=analysis.id, file_path=file_path
+            )
+            flash(
+                "File uploaded successfully! Text content is being analyzed in the background.",
+                "success",
+            )
         else:
             flash("File uploaded successfully!", "success")
         return redirect(url_for("dashboard.index"))
@@ -116,17 +90,15 @@ def upload():
 def delete(dataset_id):
     """Delete a dataset by its owner"""
     from app.utils import validate_csrf_token
+    from app.utils.blob_store import release_file
+    from app.utils.frame_cache import frame_cache
     validate_csrf_token()
     dataset = Dataset.query.get_or_404(dataset_id)
     if dataset.user_id != current_user.id:
         flash("You do not have permission to delete this dataset.", "danger")
         return redirect(url_for("dashboard.index"))
-    # Delete the file from disk if it exists
-    try:
-        if os.path.exists(dataset.file_path):
-            os.remove(dataset.file_path)
-    except Exception as e:
-        current_app.logger.warning(f"Failed to delete file: {e}")
+    file_path = dataset.file_path
+    frame_cache.invalidate(dataset.id)
     # Delete related scout analyses (for safety, without using backref)
     from app.scout_analysis.models import ScoutReportAnalysis
     analyses = ScoutReportAnalysis.query.filter_by(dataset_id=dataset.id).all()
@@ -135,5 +107,10 @@ def delete(dataset_id):
     # Delete the dataset record
     db.session.delete(dataset)
     db.session.commit()
+    # Only once the record is gone, delete the file if no other dataset uses it
+    try:
+        release_file(file_path)
+    except Exception as e:
+        current_app.logger.warning(f"Failed to delete file: {e}")
     flash("Dataset deleted successfully.", "success")
     return redirect(url_for("dashboard.index"))
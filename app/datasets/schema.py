@@ -0,0 +1,115 @@
+"""
+Per-dataset schema index
+
+Records each file's column names, dtypes and positions after upload, so
+chart requests can pick default columns, reject unknown ones and load only
+the columns they plot without parsing the whole file first. The dialect
+sniffed from text files is stored alongside, so later parses use the C
+engine with explicit arguments, as is the compact dtype plan chosen by
+app.utils.dtypes for loaded frames.
+"""
+import json
+
+import pandas as pd
+
+from app.extensions import db
+from app.models.dataset_schema import DatasetSchema
+from app.datasets.profiling import profile_version
+from app.utils.sniffer import default_read_options
+
+
+def _is_numeric(dtype_name):
+    """Return True for numeric, non-boolean dtype names such as "int64" """
+    try:
+        dtype = pd.api.types.pandas_dtype(dtype_name)
+    except TypeError:
+        return False
+    return pd.api.types.is_numeric_dtype(dtype) and not (
+        pd.api.types.is_bool_dtype(dtype)
+    )
+
+
+def column_entries(column_types):
+    """
+    Build schema entries from column dtypes
+
+    Args:
+        column_types (dict): Column name -> dtype name, in file order
+
+    Returns:
+        list: {"name", "dtype", "position", "numeric"} dicts
+    """
+    return [
+        {
+            "name": str(name),
+            "dtype": str(dtype),
+            "position": position,
+            "numeric": _is_numeric(str(dtype)),
+        }
+        for position, (name, dtype) in enumerate(column_types.items())
+    ]
+
+
+def get_schema(dataset):
+    """Return the stored schema if it matches the dataset's current file"""
+    schema = DatasetSchema.query.filter_by(dataset_id=dataset.id).first()
+    if schema is not None and schema.file_version == profile_version(dataset.file_path):
+        return schema
+    return None
+
+
+def read_options_for(dataset):
+    """
+    Return the read_csv arguments for a dataset file
+
+    Options stored with the schema are used as they are; otherwise text
+    files are sniffed.
+
+    Returns:
+        dict: read_csv arguments, or None for formats that do not use them
+    """
+    schema = get_schema(dataset)
+    if schema is not None and schema.parse_options:
+        return schema.get_parse_options()
+    return default_read_options(dataset.file_path)
+
+
+def storage_dtypes_for(dataset):
+    """Return the compact dtype plan stored for the dataset's current file"""
+    schema = get_schema(dataset)
+    return schema.get_storage_dtypes() if schema is not None else {}
+
+
+def record_schema(dataset, column_types, parse_options=None, storage_dtypes=None):
+    """
+    Store the column index of a dataset, replacing any older one
+
+    Args:
+        dataset (Dataset): Dataset record
+        column_types (dict): Column name -> dtype name, in file order
+        parse_options (dict): read_csv arguments used to parse the file
+        storage_dtypes (dict): Compact dtypes to apply to loaded frames
+
+    Returns:
+        DatasetSchema: The stored schema
+    """
+    schema = DatasetSchema.query.filter_by(dataset_id=dataset.id).first()
+    if schema is None:
+        schema = DatasetSchema(dataset_id=dataset.id)
+        db.session.add(schema)
+    schema.file_version = profile_version(dataset.file_path)
+    schema.columns = json.dumps(column_entries(column_types))
+    schema.parse_options = json.dumps(parse_options) if parse_options else None
+    schema.storage_dtypes = json.dumps(storage_dtypes) if storage_dtypes else None
+    db.session.commit()
+    return schema
+
+
+def record_frame_schema(dataset, df, parse_options=None, storage_dtypes=None):
+    """Store the column index of a loaded DataFrame"""
+    return record_schema(
+        dataset,
+        {col: dtype for col, dtype in df.dtypes.items()},
+        parse_options,
+        storage_dtypes,
+    )
@@ -0,0 +1,246 @@
+"""
+Out-of-core dataset profiling
+
+Reads a delimited file in fixed-size chunks and folds each chunk into
+mergeable per-column accumulators, so peak memory depends on the chunk size
+rather than the file size. The result has the same shape as
+app.datasets.profiling.profile_dataframe.
+
+Means and variances are combined with the parallel form of Welford's
+algorithm. Quartiles come from a compacting quantile sketch; they are exact
+until a column holds more values than the sketch capacity and approximate
+after that. Categorical columns are summarized by the mergeable sketches in
+app.datasets.sketches; a column that only turns non-numeric in a later
+chunk is summarized from that chunk on.
+"""
+import numpy as np
+import pandas as pd
+
+from app.datasets.sketches import CategoricalSketch
+
+# Formats that pandas can read in chunks; JSON documents and Excel workbooks
+# have to be parsed whole
+STREAMABLE_EXTENSIONS = {"csv", "txt"}
+
+PREVIEW_ROWS = 10
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded memory
+
+    Values are kept in sorted levels; an item on level i stands for 2**i
+    input values. When a level outgrows the capacity, every other item is
+    promoted to the next level. The starting offset is drawn at random for
+    each compaction: a fixed alternation lines up with the order in which
+    levels fill and keeps the lower item of each pair more often. The
+    generator is seeded, so a file always gets the same profile.
+    """
+
+    def __init__(self, capacity=2048, seed=0):
+        self.capacity = capacity
+        self.levels = []
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Add an array of non-null values"""
+        if len(values):
+            self._add(0, np.sort(np.asarray(values, dtype=float)))
+
+    def merge(self, other):
+        """Fold another sketch into this one"""
+        for level, values in enumerate(other.levels):
+            if len(values):
+                self._add(level, values)
+
+    def _add(self, level, values):
+        while True:
+            while len(self.levels) <= level:
+                self.levels.append(np.empty(0))
+            merged = np.sort(np.concatenate([self.levels[level], values]))
+            if len(merged) <= self.capacity:
+                self.levels[level] = merged
+                return
+            # An odd item out stays behind so weights are preserved
+            if len(merged) % 2:
+                self.levels[level], merged = merged[-1:], merged[:-1]
+            else:
+                self.levels[level] = np.empty(0)
+            values = merged[self._rng.integers(2) :: 2]
+            level += 1
+
+    def quantile(self, q):
+        """Return the q-quantile, or NaN if no values were added"""
+        if not any(len(values) for values in self.levels):
+            return np.nan
+        if len(self.levels) == 1:
+            # Nothing compacted yet, so this matches pandas exactly
+            return float(np.quantile(self.levels[0], q))
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [
+                np.full(len(values), 2**level)
+                for level, values in enumerate(self.levels)
+            ]
+        )
+        order = np.argsort(items, kind="stable")
+        items, weights = items[order], weights[order]
+        # An item stands for the ranks up to its cumulative weight, so it is
+        # placed at the middle of them and the ranks between interpolated
+        cumulative = np.cumsum(weights)
+        centres = cumulative - (weights + 1) / 2
+        return float(np.interp(q * (cumulative[-1] - 1), centres, items))
+
+
+class ColumnAccumulator:
+    """Count, nulls, min, max, Welford mean and variance, and quartiles"""
+
+    def __init__(self, sketch_capacity=2048):
+        self.count = 0
+        self.nulls = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = QuantileSketch(sketch_capacity)
+
+    def update(self, series):
+        """Fold a chunk of a numeric column into the accumulator"""
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        present = values[~np.isnan(values)]
+        self.nulls += len(values) - len(present)
+        if not len(present):
+            return
+        other = ColumnAccumulator(self.sketch.capacity)
+        other.count = len(present)
+        other.min, other.max = present.min(), present.max()
+        other.mean = present.mean()
+        other.m2 = float(((present - other.mean) ** 2).sum())
+        other.sketch.update(present)
+        self.merge(other)
+
+    def merge(self, other):
+        """Combine two accumulators (Chan et al. parallel variance)"""
+        if other.count == 0:
+            self.nulls += other.nulls
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta**2 * self.count * other.count / total
+        self.count = total
+        self.nulls += other.nulls
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def describe(self):
+        """Return the statistics in the format of describe_numeric"""
+        var = self.m2 / (self.count - 1) if self.count > 1 else np.nan
+        return {
+            "count": float(self.count),
+            "mean": self.mean if self.count else np.nan,
+            "std": float(np.sqrt(var)),
+            "min": float(self.min),
+            "25%": self.sketch.quantile(0.25),
+            "50%": self.sketch.quantile(0.5),
+            "75%": self.sketch.quantile(0.75),
+            "max": float(self.max),
+            "nulls": self.nulls,
+            "sum": self.mean * self.count,
+            "var": float(var),
+        }
+
+
+def iter_chunks(file_path, chunk_rows, read_options=None):
+    """Yield a delimited file as DataFrames of at most chunk_rows rows"""
+    from app.utils.sniffer import sniff_read_options
+
+    ext = file_path.rsplit(".", 1)[1].lower() if "." in file_path else ""
+    if ext == "csv":
+        reader = pd.read_csv(file_path, chunksize=chunk_rows)
+    elif ext == "txt":
+        options = read_options or sniff_read_options(file_path)
+        reader = pd.read_csv(file_path, chunksize=chunk_rows, **options)
+    else:
+        raise ValueError(f"Cannot stream .{ext} files")
+    with reader:
+        yield from reader
+
+
+def profile_file(file_path, chunk_rows=50000, read_options=None):
+    """
+    Profile a dataset file chunk by chunk
+
+    Args:
+        file_path (str): CSV or delimited text file
+        chunk_rows (int): Rows parsed per chunk
+        read_options (dict): read_csv arguments for TXT files
+
+    Returns:
+        dict: Profile in the same format as profile_dataframe
+    """
+    from app.datasets.profiling import generate_insights
+
+    columns = None
+    dtypes = {}
+    accumulators = {}
+    sketches = {}
+    preview = []
+    row_count = 0
+
+    for chunk in iter_chunks(file_path, chunk_rows, read_options):
+        if columns is None:
+            columns = chunk.columns.tolist()
+            preview = chunk.head(PREVIEW_ROWS).to_dict("records")
+        row_count += len(chunk)
+
+        for col in columns:
+            dtype = chunk[col].dtype
+            # Widen the column type the way a single read of the file would
+            if col not in dtypes:
+                dtypes[col] = dtype
+            elif dtypes[col] != dtype:
+                both_numeric = all(
+                    pd.api.types.is_numeric_dtype(t)
+                    and not pd.api.types.is_bool_dtype(t)
+                    for t in (dtypes[col], dtype)
+                )
+                dtypes[col] = (
+                    np.promote_types(dtypes[col], dtype)
+                    if both_numeric
+                    else np.dtype(object)
+                )
+            if pd.api.types.is_numeric_dtype(dtypes[col]) and not (
+                pd.api.types.is_bool_dtype(dtypes[col])
+            ):
+                accumulators.setdefault(col, ColumnAccumulator()).update(chunk[col])
+            else:
+                sketches.setdefault(col, CategoricalSketch()).update(chunk[col])
+
+    columns = columns or []
+    numeric_columns = [
+        col
+        for col in columns
+        if pd.api.types.is_numeric_dtype(dtypes[col])
+        and not pd.api.types.is_bool_dtype(dtypes[col])
+    ]
+    result = {
+        "column_count": len(columns),
+        "row_count": row_count,
+        "preview": preview,
+        "column_types": {str(col): str(dtypes[col]) for col in columns},
+        "numeric_columns": numeric_columns,
+        "categorical_columns": [col for col in columns if col not in numeric_columns],
+    }
+    result["categorical_summary"] = {
+        str(col): sketches.get(col, CategoricalSketch()).summary()
+        for col in result["categorical_columns"]
+    }
+
+    if numeric_columns:
+        stats = {col: accumulators[col].describe() for col in numeric_columns}
+        result["statistics"] = stats
+        result["insights"] = generate_insights(stats, numeric_columns)
+
+    return result
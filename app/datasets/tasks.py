@@ -0,0 +1,80 @@
+"""
+Background tasks for uploaded datasets
+"""
+from flask import current_app
+
+from app.extensions import db
+
+# File types that are parsed into tables
+TABULAR_EXTENSIONS = {"csv", "txt", "json", "xlsx", "xls"}
+
+
+def ingest_dataset(dataset_id):
+    """
+    Parse an uploaded file once, save its columnar sidecar (one per sheet
+    for workbooks), profile, schema index and, for delimited files, its row
+    offset index
+
+    Files that cannot be parsed as a table, such as prose scout reports, are
+    logged and skipped rather than retried. Files above
+    DATASET_STREAMING_THRESHOLD_BYTES are profiled in chunks and never
+    loaded whole.
+
+    Args:
+        dataset_id (int): ID of the Dataset record
+    """
+    from app.models.dataset import Dataset
+    from app.datasets.profiling import (
+        save_profile,
+        save_streamed_profile,
+        use_streaming,
+    )
+    from app.datasets.schema import record_frame_schema, record_schema
+    from app.utils import load_dataset
+    from app.utils.row_index import INDEXABLE_EXTENSIONS, build_row_index
+    from app.utils.dtypes import apply_dtypes, plan_dtypes, plan_from_profile
+    from app.utils.sidecar import sidecar_meta, write_sidecar
+    from app.utils.sniffer import default_read_options
+
+    dataset = db.session.get(Dataset, dataset_id)
+    if dataset is None:
+        current_app.logger.warning(f"Dataset {dataset_id} no longer exists")
+        return
+
+    # Text files are sniffed once; the dialect is stored with the schema
+    read_options = default_read_options(dataset.file_path)
+    has_header = (read_options or {}).get("header", 0) is not None
+    sep = (read_options or {}).get("sep", ",")
+
+    if use_streaming(dataset.file_path):
+        try:
+            profile = save_streamed_profile(dataset, read_options)
+        except Exception as e:
+            current_app.logger.info(f"Dataset {dataset_id} is not tabular: {e}")
+            return
+        result = profile.to_dict()
+        record_schema(
+            dataset, result["column_types"], read_options, plan_from_profile(result)
+        )
+        build_row_index(dataset.file_path, has_header=has_header, sep=sep)
+        current_app.logger.info(
+            f"Dataset {dataset_id} profiled in chunks: {profile.row_count} rows, "
+            f"{profile.column_count} columns"
+        )
+        return
+
+    df, error = load_dataset(dataset.file_path, read_options=read_options)
+    if error:
+        current_app.logger.info(f"Dataset {dataset_id} is not tabular: {error}")
+        return
+    save_profile(dataset, df)
+    storage_dtypes = plan_dtypes(df)
+    record_frame_schema(dataset, df, read_options, storage_dtypes)
+    if storage_dtypes and sidecar_meta(dataset.file_path) is not None:
+        # Later loads read the compact frame straight from the sidecar
+        write_sidecar(dataset.file_path, apply_dtypes(df, storage_dtypes))
+    if dataset.file_path.rsplit(".", 1)[-1].lower() in INDEXABLE_EXTENSIONS:
+        build_row_index(dataset.file_path, has_header=has_header, sep=sep)
+    current_app.logger.info(
+        f"Dataset {dataset_id} ingested: {len(df)} rows, {len(df.columns)} columns"
+    )
@@ -1,6 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_mail import Mail
+import json
+import logging
+import threading
+from app.jobs import JobQueue
+from app.resilience import CircuitBreaker, TokenBucket
 
 # Create extension instances not bound to a specific application
 db = SQLAlchemy()
@@ -14,8 +19,12 @@ login_manager.login_message_category = "info"
 # Create Mail instance
 mail = Mail()
 
+# Create background job queue instance
+job_queue = JobQueue()
+
 # Gemini API singleton instance
 _gemini_api_instance = None
+_gemini_api_lock = threading.Lock()
 
 @login_manager.user_loader
 def load_user(user_id):
@@ -26,31 +35,268 @@ def get_gemini_api():
     """
     Returns the Gemini API singleton instance.
 
+    The client owns a process-wide connection pool, so every caller shares
+    the same keep-alive connections to the Gemini endpoint.
+
     Returns:
-        object: Gemini API client instance
+        GeminiAPI: Gemini API client instance
     """
     global _gemini_api_instance
+    from flask import current_app
+
+    config = current_app.config
     if _gemini_api_instance is None:
-        from flask import current_app
+        with _gemini_api_lock:
+            if _gemini_api_instance is None:
+                # A limit of 0 or less turns rate limiting off
+                per_minute = config.get("GEMINI_RATE_LIMIT_PER_MINUTE", 60)
+                _gemini_api_instance = GeminiAPI(
+                    api_key=config.get("GEMINI_API_KEY"),
+                    base_url=config.get(
+                        "GEMINI_API_BASE_URL", GeminiAPI.DEFAULT_BASE_URL
+                    ),
+                    model=config.get("GEMINI_MODEL", GeminiAPI.DEFAULT_MODEL),
+                    pool_size=config.get("GEMINI_POOL_SIZE", 10),
+                    connect_timeout=config.get("GEMINI_CONNECT_TIMEOUT", 5),
+                    read_timeout=config.get("GEMINI_READ_TIMEOUT", 60),
+                    http2=config.get("GEMINI_HTTP2", False),
+                    breaker=CircuitBreaker(
+                        failure_threshold=config.get(
+                            "GEMINI_BREAKER_FAILURE_THRESHOLD", 5
+                        ),
+                        recovery_timeout=config.get(
+                            "GEMINI_BREAKER_RECOVERY_SECONDS", 30
+                        ),
+                    ),
+                    rate_limiter=(
+                        TokenBucket(
+                            rate=per_minute / 60,
+                            capacity=config.get("GEMINI_RATE_LIMIT_BURST", 10),
+                        )
+                        if per_minute > 0
+                        else None
+                    ),
+                    rate_limit_wait=config.get("GEMINI_RATE_LIMIT_WAIT_SECONDS", 5),
+                )
 
-        api_key = current_app.config.get("GEMINI_API_KEY", "")
-        # Initialize your Gemini API client here
-        # This is a placeholder implementation
-        _gemini_api_instance = GeminiAPI(api_key)
+    # Keep the key in sync with the configuration, which may change at runtime
+    if _gemini_api_instance.api_key != config.get("GEMINI_API_KEY"):
+        _gemini_api_instance.set_api_key(config.get("GEMINI_API_KEY"))
     return _gemini_api_instance
 
 
+class GeminiAPIError(Exception):
+    """Raised when the Gemini API returns an unusable response"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GeminiUnavailableError(GeminiAPIError):
+    """Raised without calling Gemini while the circuit is open or over quota"""
+
+
 class GeminiAPI:
-    """Simple wrapper for Gemini API interactions"""
+    """Pooled, keep-alive client for the Gemini generateContent API"""
+
+    DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+    DEFAULT_MODEL = "gemini-2.0-flash"
 
-    def __init__(self, api_key=None):
-        """Initialize the Gemini API client with an API key"""
+    def __init__(
+        self,
+        api_key=None,
+        base_url=DEFAULT_BASE_URL,
+        model=DEFAULT_MODEL,
+        pool_size=10,
+        connect_timeout=5,
+        read_timeout=60,
+        http2=False,
+        breaker=None,
+        rate_limiter=None,
+        rate_limit_wait=0.0,
+    ):
+        """Initialize the Gemini API client and its connection pool"""
         self.api_key = api_key
+        self.breaker = breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter
+        self.rate_limit_wait = rate_limit_wait
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.http2 = False
+        self._client = None
+
+        if http2:
+            # HTTP/2 needs the optional httpx package (pip install "httpx[http2]")
+            try:
+                import httpx
+
+                self._client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=pool_size,
+                        max_keepalive_connections=pool_size,
+                    ),
+                    timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                )
+                self.http2 = True
+            except ImportError:
+                logging.warning(
+                    "httpx with HTTP/2 support not available, using HTTP/1.1 keep-alive"
+                )
+
+        if self._client is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            self._client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self._client.mount("https://", adapter)
+            self._client.mount("http://", adapter)
 
     def set_api_key(self, api_key):
         """Set or update the API key"""
         self.api_key = api_key
 
+    def _post(self, url, payload, stream=False):
+        """POST a JSON payload on a pooled connection"""
+        headers = {"Content-Type": "application/json", "x-goog-api-key": self.api_key}
+        if self.http2:
+            request = self._client.build_request(
+                "POST", url, json=payload, headers=headers
+            )
+            return self._client.send(request, stream=stream)
+        return self._client.post(
+            url, json=payload, headers=headers, timeout=self.timeout, stream=stream
+        )
+
+    @staticmethod
+    def _build_payload(prompt, generation_config=None):
+        """Build a generateContent request body"""
+        payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        return payload
+
+    def generate_content(self, prompt, generation_config=None):
+        """
+        Call generateContent and return the text of the first candidate
+
+        Args:
+            prompt (str): Prompt text sent as a single user message
+            generation_config (dict): Optional generationConfig settings
+
+        Returns:
+            str: Generated text
+
+        Raises:
+            GeminiAPIError: If the key is missing or the API call fails
+        """
+        if not self.api_key:
+            raise GeminiAPIError("API key not set")
+
+        url = f"{self.base_url}/models/{self.model}:generateContent"
+        resp = self._guarded_post(url, self._build_payload(prompt, generation_config))
+        return self.extract_text(resp.json())
+
+    def stream_generate_content(self, prompt, generation_config=None):
+        """
+        Call streamGenerateContent and yield text as it is generated
+
+        Args:
+            prompt (str): Prompt text sent as a single user message
+            generation_config (dict): Optional generationConfig settings
+
+        Yields:
+            str: Successive pieces of the generated text
+
+        Raises:
+            GeminiAPIError: If the key is missing or the API call fails
+        """
+        if not self.api_key:
+            raise GeminiAPIError("API key not set")
+
+        url = f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse"
+        resp = self._guarded_post(
+            url, self._build_payload(prompt, generation_config), stream=True
+        )
+        try:
+            for line in resp.iter_lines():
+                if isinstance(line, bytes):
+                    line = line.decode("utf-8")
+                # Server-sent events carry one JSON response per data line
+                if line.startswith("data:"):
+                    text = self.extract_text(json.loads(line[5:].strip()))
+                    if text:
+                        yield text
+        finally:
+            resp.close()
+
+    def _guarded_post(self, url, payload, stream=False):
+        """
+        POST through the circuit breaker and rate limiter
+
+        Timeouts, connection errors and 5xx responses count as failures.
+        A 429 pauses the rate limiter for the Retry-After period instead.
+        """
+        # Fail fast while Gemini is known to be down
+        if self.breaker.is_open():
+            raise GeminiUnavailableError("Gemini circuit breaker is open")
+        if self.rate_limiter is not None and not self.rate_limiter.acquire(
+            timeout=self.rate_limit_wait
+        ):
+            raise GeminiUnavailableError("Gemini rate limit reached", status_code=429)
+        if not self.breaker.allow_request():
+            raise GeminiUnavailableError("Gemini circuit breaker is open")
+
+        try:
+            resp = self._post(url, payload, stream=stream)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        if resp.status_code == 429:
+            self.breaker.record_success()
+            if self.rate_limiter is not None:
+                retry_after = resp.headers.get("Retry-After", "")
+                self.rate_limiter.penalize(
+                    float(retry_after)
+                    if retry_after.isdigit()
+                    else 1.0 / self.rate_limiter.rate
+                )
+        elif resp.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        if resp.status_code != 200:
+            if stream and self.http2:
+                resp.read()
+            raise GeminiAPIError(
+                f"Gemini API call failed: {resp.status_code} - {resp.text}",
+                status_code=resp.status_code,
+            )
+        return resp
+
+    def state(self):
+        """Return circuit breaker and rate limiter state for monitoring"""
+        return {
+            "circuit_breaker": self.breaker.state(),
+            "rate_limiter": self.rate_limiter.state() if self.rate_limiter else None,
+        }
+
+    @staticmethod
+    def extract_text(result):
+        """Return the text of the first candidate in a generateContent response"""
+        candidates = result.get("candidates", [])
+        if candidates:
+            parts = candidates[0].get("content", {}).get("parts", [])
+            if parts:
+                return parts[0].get("text", "")
+        return ""
+
     def analyze_text(self, text):
         """
         Analyze text using Gemini API
@@ -64,6 +310,11 @@ class GeminiAPI:
         if not self.api_key:
             return {"error": "API key not set"}
 
-        # This is a placeholder. In a real implementation,
-        # you would call the actual Gemini API here
-        return {"result": f"Analysis of: {text[:30]}..."}
+        try:
+            return {"result": self.generate_content(text)}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def close(self):
+        """Close all pooled connections"""
+        self._client.close()
@@ -0,0 +1,382 @@
+"""
+Durable background job queue
+
+Jobs are stored in the ``background_jobs`` table so that work survives
+restarts and can be shared by several processes using the same database.
+Worker threads claim a job by atomically taking a time-limited lease on it
+and renew the lease while the job runs. If a worker dies, its lease expires
+and another worker picks the job up.
+"""
+import json
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+
+class JobQueue:
+    """Database-backed job queue with worker threads"""
+
+    def __init__(self, app=None):
+        self._handlers = {}
+        self._failure_handlers = {}
+        self._workers = []
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Condition()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the queue with a Flask application"""
+        app.config.setdefault("JOB_WORKER_THREADS", 4)
+        app.config.setdefault("JOB_QUEUE_EAGER", False)
+        app.config.setdefault("JOB_QUEUE_AUTOSTART", True)
+        app.config.setdefault("JOB_POLL_INTERVAL", 2.0)
+        app.config.setdefault("JOB_LEASE_SECONDS", 300)
+        app.config.setdefault("JOB_MAX_ATTEMPTS", 3)
+        app.config.setdefault("JOB_RETRY_BACKOFF_SECONDS", 10)
+        app.extensions["job_queue"] = self
+
+    def register_handler(self, job_type, handler, on_failure=None):
+        """
+        Register the function that runs a job type
+
+        Args:
+            job_type (str): Job type name stored with each job
+            handler (callable): Called with the job payload as keyword arguments
+            on_failure (callable): Optional, called with the payload and error
+                message once all attempts have been used up
+        """
+        self._handlers[job_type] = handler
+        if on_failure is not None:
+            self._failure_handlers[job_type] = on_failure
+
+    def enqueue(self, job_type, max_attempts=None, **payload):
+        """
+        Persist a job and wake up a worker
+
+        Args:
+            job_type (str): Registered job type
+            max_attempts (int): Optional, overrides JOB_MAX_ATTEMPTS
+            **payload: JSON-serializable job arguments
+
+        Returns:
+            BackgroundJob: The persisted job record
+        """
+        from app.extensions import db
+        from app.models.job import BackgroundJob
+
+        if job_type not in self._handlers:
+            raise ValueError(f"No handler registered for job type: {job_type}")
+
+        job = BackgroundJob(
+            job_type=job_type,
+            payload=json.dumps(payload),
+            max_attempts=max_attempts or current_app.config["JOB_MAX_ATTEMPTS"],
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        # Eager mode runs the job inline, which keeps tests deterministic
+        if current_app.config.get("JOB_QUEUE_EAGER", False):
+            claimed = self.claim(self._worker_id(), job_id=job.id)
+            if claimed is not None:
+                self.run_job(claimed, self._worker_id())
+            return job
+
+        with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    @staticmethod
+    def _worker_id():
+        """Identify the current worker across hosts, processes and threads"""
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+    @staticmethod
+    def _claimable(now):
+        """Filter matching due jobs and jobs whose lease has expired"""
+        from app.extensions import db
+        from app.models.job import BackgroundJob
+
+        return db.or_(
+            db.and_(BackgroundJob.status == "queued", BackgroundJob.next_run_at <= now),
+            db.and_(
+                BackgroundJob.status == "running",
+                BackgroundJob.lease_expires_at < now,
+            ),
+        )
+
+    def claim(self, worker_id, job_id=None):
+        """
+        Atomically lease the next runnable job
+
+        The conditional UPDATE only succeeds for one worker, so jobs are never
+        processed twice even when several processes share the database.
+
+        Args:
+            worker_id (str): Identifier stored as the lease owner
+            job_id (int): Optional, only try to claim this job
+
+        Returns:
+            BackgroundJob or None: The claimed job, if any
+        """
+        from app.extensions import db
+        from app.models.job import BackgroundJob
+
+        now = datetime.utcnow()
+        lease_expires_at = now + timedelta(
+            seconds=current_app.config["JOB_LEASE_SECONDS"]
+        )
+
+        if job_id is not None:
+            candidates = [job_id]
+        else:
+            candidates = (
+                db.session.execute(
+                    db.select(BackgroundJob.id)
+                    .where(self._claimable(now))
+                    .order_by(BackgroundJob.next_run_at)
+                    .limit(5)
+                )
+                .scalars()
+                .all()
+            )
+
+        for candidate_id in candidates:
+            result = db.session.execute(
+                db.update(BackgroundJob)
+                .where(BackgroundJob.id == candidate_id, self._claimable(now))
+                .values(
+                    status="running",
+                    lease_owner=worker_id,
+                    lease_expires_at=lease_expires_at,
+                    attempts=BackgroundJob.attempts + 1,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                return db.session.get(BackgroundJob, candidate_id)
+        return None
+
+    def run_job(self, job, worker_id):
+        """Run a claimed job and record the outcome"""
+        job_id, job_type = job.id, job.job_type
+        attempts, max_attempts = job.attempts, job.max_attempts
+        payload = job.get_payload()
+        handler = self._handlers.get(job_type)
+
+        if handler is None:
+            error = f"No handler registered for job type: {job_type}"
+        elif attempts > max_attempts:
+            # The lease expired on the final attempt, e.g. the worker crashed
+            error = job.last_error or "Job exceeded its maximum number of attempts"
+        else:
+            try:
+                with self._lease_heartbeat(job_id, worker_id):
+                    handler(**payload)
+                self._finish(job_id, worker_id, status="succeeded")
+                return True
+            except Exception as e:
+                current_app.logger.error(
+                    f"Background job {job_id} ({job_type}) failed: {str(e)}"
+                )
+                error = str(e)
+
+        if handler is not None and attempts < max_attempts:
+            backoff = current_app.config["JOB_RETRY_BACKOFF_SECONDS"] * (
+                2 ** (attempts - 1)
+            )
+            self._finish(
+                job_id,
+                worker_id,
+                status="queued",
+                last_error=error,
+                next_run_at=datetime.utcnow() + timedelta(seconds=backoff),
+            )
+            return False
+
+        if self._finish(job_id, worker_id, status="failed", last_error=error):
+            on_failure = self._failure_handlers.get(job_type)
+            if on_failure is not None:
+                on_failure(error=error, **payload)
+        return False
+
+    @contextmanager
+    def _lease_heartbeat(self, job_id, worker_id):
+        """
+        Renew a job's lease in the background while its handler runs
+
+        The lease is extended every third of JOB_LEASE_SECONDS, so a slow
+        handler keeps its job while a crashed worker still loses it.
+        """
+        app = current_app._get_current_object()
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._renew_lease_until,
+            args=(app, job_id, worker_id, stopped),
+            name=f"job-heartbeat-{job_id}",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            heartbeat.join()
+
+    def _renew_lease_until(self, app, job_id, worker_id, stopped):
+        """Extend a lease until stopped or until the lease is lost"""
+        from app.extensions import db
+
+        interval = app.config["JOB_LEASE_SECONDS"] / 3
+        while not stopped.wait(interval):
+            with app.app_context():
+                try:
+                    renewed = self.renew_lease(job_id, worker_id)
+                except Exception as e:
+                    app.logger.error(f"Background job {job_id} lease renewal: {e}")
+                    renewed = True
+                finally:
+                    db.session.remove()
+            if not renewed:
+                app.logger.warning(
+                    f"Background job {job_id} lease was lost while it was running"
+                )
+                return
+
+    @staticmethod
+    def renew_lease(job_id, worker_id):
+        """
+        Push back the expiry of a lease held by a worker
+
+        Returns:
+            bool: True if the worker still held the lease
+        """
+        from app.extensions import db
+        from app.models.job import BackgroundJob
+
+        now = datetime.utcnow()
+        result = db.session.execute(
+            db.update(BackgroundJob)
+            .where(
+                BackgroundJob.id == job_id,
+                BackgroundJob.status == "running",
+                BackgroundJob.lease_owner == worker_id,
+            )
+            .values(
+                lease_expires_at=now
+                + timedelta(seconds=current_app.config["JOB_LEASE_SECONDS"]),
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def _finish(job_id, worker_id, **values):
+        """Update a job only if this worker still holds its lease"""
+        from app.extensions import db
+        from app.models.job import BackgroundJob
+
+        db.session.rollback()
+        result = db.session.execute(
+            db.update(BackgroundJob)
+            .where(BackgroundJob.id == job_id, BackgroundJob.lease_owner == worker_id)
+            .values(
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=datetime.utcnow(),
+                **values,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount != 1:
+            current_app.logger.warning(
+                f"Background job {job_id} lease was lost before it finished"
+            )
+        return result.rowcount == 1
+
+    def run_pending(self, limit=None):
+        """
+        Drain runnable jobs in the calling thread
+
+        Args:
+            limit (int): Optional, maximum number of jobs to run
+
+        Returns:
+            int: Number of jobs run
+        """
+        worker_id = self._worker_id()
+        count = 0
+        while limit is None or count < limit:
+            job = self.claim(worker_id)
+            if job is None:
+                break
+            self.run_job(job, worker_id)
+            count += 1
+        return count
+
+    def start(self, app, threads=None):
+        """
+        Start worker threads that poll the job table
+
+        Does nothing while workers are already running, so creating another
+        app in the same process does not add a second set of threads.
+
+        Returns:
+            bool: True if workers were started
+        """
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        if self._workers:
+            return False
+        threads = app.config["JOB_WORKER_THREADS"] if threads is None else threads
+        self._stop_event.clear()
+        for _ in range(threads):
+            worker = threading.Thread(
+                target=self._work_loop,
+                args=(app,),
+                name=f"job-worker-{len(self._workers) + 1}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+        return True
+
+    def _work_loop(self, app):
+        """Claim and run jobs until the queue is stopped"""
+        from app.extensions import db
+
+        worker_id = self._worker_id()
+        poll_interval = app.config["JOB_POLL_INTERVAL"]
+        while not self._stop_event.is_set():
+            with app.app_context():
+                try:
+                    job = self.claim(worker_id)
+                    if job is not None:
+                        self.run_job(job, worker_id)
+                except Exception as e:
+                    app.logger.error(f"Job worker error: {str(e)}")
+                    job = None
+                finally:
+                    db.session.remove()
+
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(poll_interval)
+
+    def stop(self, timeout=None):
+        """Signal worker threads to stop and wait for them"""
+        self._stop_event.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
@@ -0,0 +1,24 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class StoredBlob(db.Model):
+    """Uploaded file stored once by content hash and shared by datasets"""
+
+    __tablename__ = "stored_blobs"
+    __table_args__ = (db.UniqueConstraint("sha256", "extension"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, index=True)
+    # Kept in the file name, since parsers are chosen by extension
+    extension = db.Column(db.String(10), nullable=False)
+    path = db.Column(db.String(255), nullable=False, unique=True)
+    size = db.Column(db.BigInteger, nullable=False)
+
+    # Number of datasets whose file_path is this blob
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<StoredBlob {self.sha256[:12]}.{self.extension} refs={self.ref_count}>"
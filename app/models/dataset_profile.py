@@ -0,0 +1,83 @@
+from app.extensions import db
+from datetime import datetime
+import json
+
+
+class DatasetProfile(db.Model):
+    """Summary statistics of a dataset, computed once per file version"""
+
+    __tablename__ = "dataset_profiles"
+
+    id = db.Column(db.Integer, primary_key=True)
+    dataset_id = db.Column(
+        db.Integer, db.ForeignKey("datasets.id"), nullable=False, unique=True
+    )
+    dataset = db.relationship(
+        "Dataset",
+        backref=db.backref(
+            "profile", uselist=False, lazy=True, cascade="all, delete-orphan"
+        ),
+    )
+
+    # Version of the file the profile was computed from
+    file_version = db.Column(db.String(64), nullable=False)
+
+    row_count = db.Column(db.Integer, nullable=False)
+    column_count = db.Column(db.Integer, nullable=False)
+
+    # JSON-encoded profile sections
+    column_types = db.Column(db.Text, nullable=False)
+    numeric_columns = db.Column(db.Text, nullable=False)
+    categorical_columns = db.Column(db.Text, nullable=False)
+    statistics = db.Column(db.Text, nullable=True)
+    preview = db.Column(db.Text, nullable=False)
+    insights = db.Column(db.Text, nullable=True)
+    # Distinct count and frequent values of each categorical column
+    categorical_summary = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DatasetProfile dataset={self.dataset_id} rows={self.row_count}>"
+
+    def update_from_profile(self, profile, file_version):
+        """Store a profile dict produced by profile_dataframe"""
+        self.file_version = file_version
+        self.row_count = profile["row_count"]
+        self.column_count = profile["column_count"]
+        self.column_types = json.dumps(profile["column_types"])
+        self.numeric_columns = json.dumps(profile["numeric_columns"])
+        self.categorical_columns = json.dumps(profile["categorical_columns"])
+        self.preview = json.dumps(profile["preview"], default=str)
+        self.statistics = (
+            json.dumps(profile["statistics"], default=str)
+            if "statistics" in profile
+            else None
+        )
+        self.insights = (
+            json.dumps(profile["insights"]) if "insights" in profile else None
+        )
+        self.categorical_summary = (
+            json.dumps(profile["categorical_summary"], default=str)
+            if "categorical_summary" in profile
+            else None
+        )
+        self.created_at = datetime.utcnow()
+
+    def to_dict(self):
+        """Return the profile in the /api/dataset/<id>/analyze response format"""
+        result = {
+            "column_count": self.column_count,
+            "row_count": self.row_count,
+            "preview": json.loads(self.preview),
+            "column_types": json.loads(self.column_types),
+            "numeric_columns": json.loads(self.numeric_columns),
+            "categorical_columns": json.loads(self.categorical_columns),
+        }
+        if self.statistics is not None:
+            result["statistics"] = json.loads(self.statistics)
+        if self.insights is not None:
+            result["insights"] = json.loads(self.insights)
+        if self.categorical_summary is not None:
+            result["categorical_summary"] = json.loads(self.categorical_summary)
+        return result
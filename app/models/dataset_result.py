@@ -0,0 +1,34 @@
+from app.extensions import db
+from datetime import datetime
+import json
+
+
+class DatasetResult(db.Model):
+    """Cached result of an exploration request, kept per file version"""
+
+    __tablename__ = "dataset_results"
+    __table_args__ = (db.UniqueConstraint("dataset_id", "cache_key"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    dataset_id = db.Column(db.Integer, db.ForeignKey("datasets.id"), nullable=False)
+    dataset = db.relationship(
+        "Dataset",
+        backref=db.backref("results", lazy=True, cascade="all, delete-orphan"),
+    )
+
+    # SHA-256 of the request kind and parameters
+    cache_key = db.Column(db.String(64), nullable=False)
+
+    # Version of the file the result was computed from
+    file_version = db.Column(db.String(64), nullable=False)
+
+    # JSON-encoded response body
+    result = db.Column(db.Text, nullable=False)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DatasetResult dataset={self.dataset_id} key={self.cache_key[:12]}>"
+
+    def get_result(self):
+        return json.loads(self.result)
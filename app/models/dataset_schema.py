@@ -0,0 +1,55 @@
+from app.extensions import db
+from datetime import datetime
+import json
+
+
+class DatasetSchema(db.Model):
+    """Column index of a dataset file, recorded once per file version"""
+
+    __tablename__ = "dataset_schemas"
+
+    id = db.Column(db.Integer, primary_key=True)
+    dataset_id = db.Column(
+        db.Integer, db.ForeignKey("datasets.id"), nullable=False, unique=True
+    )
+    dataset = db.relationship(
+        "Dataset",
+        backref=db.backref(
+            "schema", uselist=False, lazy=True, cascade="all, delete-orphan"
+        ),
+    )
+
+    # Version of the file the schema was read from
+    file_version = db.Column(db.String(64), nullable=False)
+
+    # JSON list of {"name", "dtype", "position", "numeric"} in file order
+    columns = db.Column(db.Text, nullable=False)
+
+    # pandas.read_csv arguments detected for delimited text files, in JSON
+    parse_options = db.Column(db.Text, nullable=True)
+
+    # Compact dtypes applied when the dataset is loaded, in JSON
+    storage_dtypes = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DatasetSchema dataset={self.dataset_id}>"
+
+    def get_columns(self):
+        """Return the column entries in file order"""
+        return json.loads(self.columns)
+
+    def column_names(self):
+        return [column["name"] for column in self.get_columns()]
+
+    def numeric_columns(self):
+        return [column["name"] for column in self.get_columns() if column["numeric"]]
+
+    def get_parse_options(self):
+        """Return the stored read_csv arguments, or None"""
+        return json.loads(self.parse_options) if self.parse_options else None
+
+    def get_storage_dtypes(self):
+        """Return the column name -> dtype name plan for loaded frames"""
+        return json.loads(self.storage_dtypes) if self.storage_dtypes else {}
@@ -0,0 +1,37 @@
+from app.extensions import db
+from datetime import datetime
+import json
+
+
+class BackgroundJob(db.Model):
+    """Persistent background job record shared by all worker processes"""
+
+    __tablename__ = "background_jobs"
+    __table_args__ = (db.Index("ix_background_jobs_claim", "status", "next_run_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=True)  # Job arguments in JSON format
+    status = db.Column(
+        db.String(20), nullable=False, default="queued"
+    )  # queued, running, succeeded, failed
+
+    # Retry bookkeeping
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    next_run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+
+    # Lease held by the worker currently running the job
+    lease_owner = db.Column(db.String(100), nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.id} {self.job_type} ({self.status})>"
+
+    def get_payload(self):
+        """Return the job arguments as a dictionary"""
+        return json.loads(self.payload) if self.payload else {}
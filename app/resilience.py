@@ -0,0 +1,205 @@
+"""
+Failure isolation helpers for calls to external services
+
+CircuitBreaker stops calling a service that keeps failing and lets a few
+probe requests through once it may have recovered. TokenBucket keeps the
+request rate under a quota.
+"""
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold=5,
+        recovery_timeout=30.0,
+        half_open_max_calls=1,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            recovery_timeout (float): Seconds to stay open before probing
+            half_open_max_calls (int): Probe requests allowed while half-open
+            clock (callable): Monotonic time source, replaceable in tests
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probes_in_flight = 0
+        self._trips = 0
+        self._rejected = 0
+
+    def _refresh(self):
+        """Move from open to half-open once the recovery timeout has passed"""
+        if (
+            self._state == self.OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+
+    def is_open(self):
+        """Check whether calls are currently being rejected outright"""
+        with self._lock:
+            self._refresh()
+            return self._state == self.OPEN
+
+    def allow_request(self):
+        """
+        Ask permission to call the service
+
+        Returns:
+            bool: True if the call may proceed
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if (
+                self._state == self.HALF_OPEN
+                and self._probes_in_flight < self.half_open_max_calls
+            ):
+                self._probes_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes_in_flight = 0
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit when the threshold is hit"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probes_in_flight = 0
+                self._trips += 1
+
+    def state(self):
+        """Return the breaker state for monitoring"""
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "seconds_until_probe": (
+                    max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+                    if self._state == self.OPEN
+                    else 0.0
+                ),
+                "trips": self._trips,
+                "rejected_calls": self._rejected,
+            }
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum burst size
+            clock (callable): Monotonic time source, replaceable in tests
+            sleep (callable): Sleep function, replaceable in tests
+        """
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        if capacity < 1:
+            raise ValueError("Token bucket capacity must be at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self._throttled = 0
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update"""
+        if now < self._paused_until:
+            self._updated_at = now
+            return
+        start = max(self._updated_at, self._paused_until)
+        self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens without waiting
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise seconds to wait
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            wait = (tokens - self._tokens) / self.rate
+            return max(wait, self._paused_until - now)
+
+    def acquire(self, tokens=1, timeout=0.0):
+        """
+        Take tokens, waiting up to timeout seconds for them
+
+        Returns:
+            bool: True if the tokens were taken
+        """
+        deadline = self._clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            remaining = deadline - self._clock()
+            if wait > remaining:
+                with self._lock:
+                    self._throttled += 1
+                return False
+            self._sleep(wait)
+
+    def penalize(self, seconds):
+        """Drain the bucket and stop refilling, e.g. after an HTTP 429"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._updated_at = now
+
+    def state(self):
+        """Return the limiter state for monitoring"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            return {
+                "tokens": round(self._tokens, 3),
+                "capacity": self.capacity,
+                "rate_per_second": self.rate,
+                "paused_seconds": max(0.0, self._paused_until - now),
+                "throttled_calls": self._throttled,
+            }
@@ -0,0 +1,217 @@
+"""
+Two-tier cache for Gemini scout report analyses
+
+Results are keyed on a hash of the normalized report text, the prompt version
+and the model name. A small in-memory LRU serves hot entries without touching
+the database; the ``analysis_cache`` table shares results between workers.
+Database changes are left in the caller's transaction for it to commit.
+"""
+import copy
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app.extensions import db
+
+
+def normalize_text(text):
+    """Normalize report text so that formatting-only changes share a cache key"""
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_cache_key(text, prompt_version, model):
+    """
+    Build the cache key for an analysis request
+
+    Args:
+        text (str): Report text sent to the model
+        prompt_version (str): Version of the prompt template
+        model (str): Gemini model name
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, normalize_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """In-memory LRU in front of the shared analysis_cache table"""
+
+    def __init__(self):
+        self._memory = OrderedDict()  # key -> (expires_at, result)
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _remember(self, key, expires_at, result):
+        """Add an entry to the memory tier, evicting the least recently used"""
+        capacity = current_app.config.get("SCOUT_CACHE_MEMORY_ENTRIES", 256)
+        with self._lock:
+            self._memory[key] = (expires_at, result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > capacity:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Look up a cached analysis result
+
+        Args:
+            key (str): Cache key from make_cache_key
+
+        Returns:
+            dict or None: A copy of the cached result, if present and fresh
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return copy.deepcopy(entry[1])
+                del self._memory[key]
+
+        from app.scout_analysis.models import AnalysisCacheEntry
+
+        def lookup():
+            row = AnalysisCacheEntry.query.filter_by(cache_key=key).first()
+            if row is None or row.expires_at <= now:
+                if row is not None:
+                    db.session.delete(row)
+                return None
+            row.last_accessed_at = now
+            row.hit_count = (row.hit_count or 0) + 1
+            return row.expires_at, json.loads(row.result)
+
+        found = self._run(lookup, "lookup")
+        if found is None:
+            self._count("misses")
+            return None
+
+        expires_at, result = found
+        self._remember(key, expires_at, result)
+        self._count("db_hits")
+        return copy.deepcopy(result)
+
+    def set(self, key, result, model, prompt_version):
+        """
+        Store an analysis result in both tiers
+
+        Args:
+            key (str): Cache key from make_cache_key
+            result (dict): Analysis result to cache
+            model (str): Gemini model name
+            prompt_version (str): Version of the prompt template
+        """
+        from app.scout_analysis.models import AnalysisCacheEntry
+
+        now = datetime.utcnow()
+        ttl = current_app.config.get("SCOUT_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+        expires_at = now + timedelta(seconds=ttl)
+        self._remember(key, expires_at, copy.deepcopy(result))
+
+        def store():
+            row = AnalysisCacheEntry.query.filter_by(cache_key=key).first()
+            if row is None:
+                row = AnalysisCacheEntry(cache_key=key)
+                db.session.add(row)
+            row.model = model
+            row.prompt_version = prompt_version
+            row.result = json.dumps(result, ensure_ascii=False)
+            row.created_at = now
+            row.expires_at = expires_at
+            row.last_accessed_at = now
+            return True
+
+        if self._run(store, "store"):
+            self._count("stores")
+            removed = self._run(lambda: self._evict(now), "eviction")
+            if removed:
+                self._count("evictions", removed)
+
+    @staticmethod
+    def _run(action, description):
+        """
+        Run a database action of the cache in a savepoint
+
+        Only the savepoint is released; the caller commits the surrounding
+        transaction with its own changes. A failing action only rolls back
+        its savepoint, so changes the caller has pending are kept.
+
+        Returns:
+            The action's return value, or None if it failed
+        """
+        try:
+            with db.session.begin_nested():
+                return action()
+        except Exception as e:
+            current_app.logger.error(f"Analysis cache {description} failed: {str(e)}")
+            return None
+
+    def _evict(self, now):
+        """
+        Drop expired rows and keep the table within SCOUT_CACHE_MAX_ENTRIES
+
+        Returns:
+            int: Number of rows removed
+        """
+        from app.scout_analysis.models import AnalysisCacheEntry
+
+        removed = AnalysisCacheEntry.query.filter(
+            AnalysisCacheEntry.expires_at <= now
+        ).delete(synchronize_session=False)
+
+        max_entries = current_app.config.get("SCOUT_CACHE_MAX_ENTRIES", 10000)
+        excess = AnalysisCacheEntry.query.count() - max_entries
+        if excess > 0:
+            oldest = (
+                db.session.query(AnalysisCacheEntry.id)
+                .order_by(AnalysisCacheEntry.last_accessed_at)
+                .limit(excess)
+                .subquery()
+            )
+            removed += AnalysisCacheEntry.query.filter(
+                AnalysisCacheEntry.id.in_(db.select(oldest.c.id))
+            ).delete(synchronize_session=False)
+        return removed
+
+    def clear_memory(self):
+        """Empty the in-memory tier"""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        """Return hit, miss and eviction counters for monitoring"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["memory_hits"] + stats["db_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+
+# Process-wide cache instance
+analysis_cache = AnalysisCache()
@@ -0,0 +1,173 @@
+"""
+Map-reduce helpers for long scout reports
+
+Long reports are split into chunks that fit a token budget, each chunk is
+analyzed separately, and the partial analyses are merged back into a single
+result with the usual keys.
+"""
+import math
+import re
+from collections import defaultdict
+
+RATING_KEYS = [
+    "offensive_rating",
+    "defensive_rating",
+    "physical_rating",
+    "technical_rating",
+    "potential_rating",
+    "overall_rating",
+]
+LIST_KEYS = ["strengths", "weaknesses", "development_areas"]
+INFO_KEYS = ["player_name", "position", "team"]
+
+# Rough average for English text with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Estimate the number of tokens in a piece of text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _split_oversized(paragraph, max_chars):
+    """Split a paragraph longer than the budget at sentence or hard boundaries"""
+    pieces = []
+    current = ""
+    for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+        while len(sentence) > max_chars:
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_into_chunks(text, max_tokens):
+    """
+    Split report text into chunks of at most max_tokens
+
+    Paragraph boundaries are kept where possible so that each chunk reads as
+    a coherent part of the report.
+
+    Args:
+        text (str): Full report text
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        list: Chunk strings, in document order
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    chunks = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        pieces = (
+            _split_oversized(paragraph, max_chars)
+            if len(paragraph) > max_chars
+            else [paragraph]
+        )
+        for piece in pieces:
+            if current and len(current) + len(piece) + 2 > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _get_field(result, key):
+    """Read a field from either the flat or the nested result format"""
+    value = result.get(key)
+    if value in (None, "", []):
+        if key in INFO_KEYS:
+            nested_key = "name" if key == "player_name" else key
+            value = result.get("player_info", {}).get(nested_key)
+        elif key in RATING_KEYS:
+            value = result.get("ratings", {}).get(key.replace("_rating", ""))
+    return value
+
+
+def merge_analyses(results, weights=None, max_items=8, max_summaries=3):
+    """
+    Merge per-chunk analyses into one result
+
+    Player details are chosen by weighted vote, lists are de-duplicated in
+    order, ratings are weighted averages and the summary keeps the
+    paragraphs from the largest chunks.
+
+    Args:
+        results (list): Analysis dicts, one per chunk, in document order
+        weights (list): Optional weight per result, such as chunk length
+        max_items (int): Maximum entries kept in each list field
+        max_summaries (int): Maximum chunk summaries kept
+
+    Returns:
+        dict: Merged analysis in the single-report result schema
+    """
+    if weights is None:
+        weights = [1] * len(results)
+    merged = {}
+
+    for key in INFO_KEYS:
+        votes = defaultdict(float)
+        spelling = {}
+        for result, weight in zip(results, weights):
+            value = _get_field(result, key)
+            if isinstance(value, str) and value.strip():
+                normalized = value.strip().lower()
+                if normalized in ("unknown", "n/a", "none", "not available"):
+                    continue
+                votes[normalized] += weight
+                spelling.setdefault(normalized, value.strip())
+        merged[key] = spelling[max(votes, key=votes.get)] if votes else None
+
+    for key in LIST_KEYS:
+        seen = set()
+        items = []
+        for result in results:
+            values = _get_field(result, key) or []
+            if isinstance(values, str):
+                values = [values]
+            for item in values:
+                normalized = str(item).strip().lower()
+                if normalized and normalized not in seen:
+                    seen.add(normalized)
+                    items.append(str(item).strip())
+        merged[key] = items[:max_items]
+
+    summaries = [
+        (index, weight, result.get("summary"))
+        for index, (result, weight) in enumerate(zip(results, weights))
+        if isinstance(result.get("summary"), str) and result.get("summary").strip()
+    ]
+    top = sorted(summaries, key=lambda item: item[1], reverse=True)[:max_summaries]
+    merged["summary"] = "\n\n".join(
+        summary.strip() for _, _, summary in sorted(top, key=lambda item: item[0])
+    )
+
+    for key in RATING_KEYS:
+        total = 0.0
+        total_weight = 0.0
+        for result, weight in zip(results, weights):
+            try:
+                value = float(_get_field(result, key))
+            except (TypeError, ValueError):
+                continue
+            total += value * weight
+            total_weight += weight
+        merged[key] = round(total / total_weight, 1) if total_weight else None
+
+    return merged
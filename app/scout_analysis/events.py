@@ -0,0 +1,139 @@
+"""
+In-process publish/subscribe hub for scout analysis progress
+
+Analysis workers publish events (status changes and partial summary text)
+for an analysis ID, and streaming and long-poll endpoints subscribe to them
+instead of polling the database. Each channel keeps
+its events so that a subscriber joining late replays what it missed.
+
+The hub only sees jobs run by the same process, so waiters still re-read
+the database now and then for jobs run elsewhere.
+"""
+import queue
+import threading
+import time
+
+
+class AnalysisEventHub:
+    """Thread-safe per-analysis event channels"""
+
+    # Events after which nothing more is published on a channel
+    FINAL_EVENTS = ("complete", "failed")
+
+    def __init__(self, retention_seconds=300):
+        """
+        Args:
+            retention_seconds (float): How long channels nobody is watching
+                are kept after their last event, for late subscribers
+        """
+        self.retention_seconds = retention_seconds
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        """Drop unwatched channels idle for longer than the retention period"""
+        # Covers jobs that died without a final event as well as finished ones
+        expired = [
+            key
+            for key, channel in self._channels.items()
+            if now - channel["updated_at"] > self.retention_seconds
+            and not channel["subscribers"]
+        ]
+        for key in expired:
+            del self._channels[key]
+
+    def _channel(self, analysis_id):
+        return self._channels.setdefault(
+            analysis_id,
+            {"events": [], "subscribers": set(), "updated_at": time.monotonic()},
+        )
+
+    def publish(self, analysis_id, event, data):
+        """
+        Send an event to every subscriber of an analysis
+
+        Args:
+            analysis_id (int): Analysis the event belongs to
+            event (str): Event name: "started", "delta", "complete" or "failed"
+            data (dict): JSON-serializable event payload
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            channel = self._channel(analysis_id)
+            if event == "started":
+                # Each attempt at a job starts a fresh stream
+                channel["events"] = []
+            channel["events"].append((event, data))
+            channel["updated_at"] = now
+            for subscriber in channel["subscribers"]:
+                subscriber.put((event, data))
+
+    def subscribe(self, analysis_id):
+        """
+        Start receiving events for an analysis
+
+        Returns:
+            queue.Queue: Receives (event, data) tuples, starting with a replay
+                of the events published so far
+        """
+        subscriber = queue.Queue()
+        with self._lock:
+            self._prune(time.monotonic())
+            channel = self._channel(analysis_id)
+            for item in channel["events"]:
+                subscriber.put(item)
+            channel["subscribers"].add(subscriber)
+        return subscriber
+
+    def wait_for_status(self, analysis_id, known_status, timeout):
+        """
+        Block until an analysis moves away from a known processing status
+
+        Args:
+            analysis_id (int): Analysis to watch
+            known_status (str): Status the caller has already seen
+            timeout (float): Maximum number of seconds to wait
+
+        Returns:
+            str: The new status, or None if it did not change in time
+        """
+        deadline = time.monotonic() + timeout
+        subscriber = self.subscribe(analysis_id)
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                try:
+                    _, data = subscriber.get(timeout=remaining)
+                except queue.Empty:
+                    return None
+                status = data.get("processing_status")
+                # Skip past replayed events to the most recent status
+                while not subscriber.empty():
+                    status = subscriber.get_nowait()[1].get("processing_status", status)
+                if status is not None and status != known_status:
+                    return status
+        finally:
+            self.unsubscribe(analysis_id, subscriber)
+
+    def unsubscribe(self, analysis_id, subscriber):
+        """
+        Stop delivering events to a subscriber
+
+        A channel is dropped with its last subscriber unless it holds a final
+        event, which is kept for late subscribers until it is pruned.
+        """
+        with self._lock:
+            channel = self._channels.get(analysis_id)
+            if channel is not None:
+                channel["subscribers"].discard(subscriber)
+                events = channel["events"]
+                finished = bool(events) and events[-1][0] in self.FINAL_EVENTS
+                if not channel["subscribers"] and not finished:
+                    del self._channels[analysis_id]
+
+
+# Process-wide hub instance
+event_hub = AnalysisEventHub()
@@ -2,6 +2,25 @@
 Mock Scout Report Analysis Service
 Used to generate fake data when API calls fail
 """
+from app.scout_analysis.matcher import KeywordMatcher
+
+# Player names recognised in the text, in priority order
+KNOWN_PLAYERS = (
+    ("lebron", "LeBron James"),
+    ("curry", "Stephen Curry"),
+    ("durant", "Kevin Durant"),
+    ("giannis", "Giannis Antetokounmpo"),
+    ("jokic", "Nikola Jokic"),
+    ("doncic", "Luka Doncic"),
+)
+SHOOTING_KEYWORDS = ("shoot", "shooter", "shooting")
+DEFENSE_KEYWORDS = ("defend", "defense", "defensive")
+ATHLETICISM_KEYWORDS = ("athletic", "jump", "speed")
+
+_mock_matcher = KeywordMatcher(
+    [keyword for keyword, _ in KNOWN_PLAYERS]
+    + list(SHOOTING_KEYWORDS + DEFENSE_KEYWORDS + ATHLETICISM_KEYWORDS)
+)
 
 
 class MockAnalysisService:
@@ -10,23 +29,14 @@ class MockAnalysisService:
     @staticmethod
     def analyze_text(text_content):
         """Analyze text and generate mock scout report analysis data"""
-        # Extract some keywords to generate relevant analysis
-        text_lower = text_content.lower()
-        name = "Unknown Player"
+        # Find every keyword in one pass over the text
+        found = _mock_matcher.find(text_content.lower())
 
         # Try to extract player name
-        if "lebron" in text_lower:
-            name = "LeBron James"
-        elif "curry" in text_lower:
-            name = "Stephen Curry"
-        elif "durant" in text_lower:
-            name = "Kevin Durant"
-        elif "giannis" in text_lower:
-            name = "Giannis Antetokounmpo"
-        elif "jokic" in text_lower:
-            name = "Nikola Jokic"
-        elif "doncic" in text_lower:
-            name = "Luka Doncic"
+        name = next(
+            (player for keyword, player in KNOWN_PLAYERS if keyword in found),
+            "Unknown Player",
+        )
 
         # Generate analysis based on extracted keywords
         strengths = [
@@ -43,23 +53,19 @@ class MockAnalysisService:
             "Develop leadership skills",
         ]
 
-        if "shoot" in text_lower or "shooter" in text_lower or "shooting" in text_lower:
+        if found.intersection(SHOOTING_KEYWORDS):
             strengths.append("Great shooting ability")
             offensive_rating = 88
         else:
             offensive_rating = 80
 
-        if (
-            "defend" in text_lower
-            or "defense" in text_lower
-            or "defensive" in text_lower
-        ):
+        if found.intersection(DEFENSE_KEYWORDS):
             strengths.append("Solid defensive skills")
             defensive_rating = 85
         else:
             defensive_rating = 75
 
-        if "athletic" in text_lower or "jump" in text_lower or "speed" in text_lower:
+        if found.intersection(ATHLETICISM_KEYWORDS):
             strengths.append("Exceptional athleticism")
             physical_rating = 90
         else:
@@ -140,3 +140,26 @@ class ScoutReportAnalysis(db.Model):
                 {"raw": str(analysis_result)}, ensure_ascii=False
             )
         self.processing_status = "completed"
+
+
+class AnalysisCacheEntry(db.Model):
+    """Cached Gemini analysis result shared by all workers"""
+
+    __tablename__ = "analysis_cache"
+
+    id = db.Column(db.Integer, primary_key=True)
+    # SHA-256 of the normalized input text, prompt version and model name
+    cache_key = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    model = db.Column(db.String(100), nullable=False)
+    prompt_version = db.Column(db.String(20), nullable=False)
+    result = db.Column(db.Text, nullable=False)  # Analysis result in JSON format
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    last_accessed_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, index=True
+    )
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AnalysisCacheEntry {self.cache_key[:12]} ({self.model})>"
@@ -1,5 +1,42 @@
-import re
 from flask import current_app
+from app.scout_analysis.matcher import KeywordMatcher
+
+# Keywords that suggest a document is a scout report
+SCOUT_KEYWORDS = (
+    "scout report",
+    "player analysis",
+    "player profile",
+    "talent assessment",
+    "player evaluation",
+    "strengths",
+    "weaknesses",
+    "basketball skills",
+    "draft potential",
+    "scouting",
+    "rating",
+    "scout",
+    "player development",
+    "technical assessment",
+    "advantages",
+    "disadvantages",
+)
+
+# Structured report sections; a section is present when a marker from its
+# first group appears, followed later by one from its second group if any
+SECTION_MARKERS = (
+    (("strengths:", "strengths："), ("weaknesses:", "weaknesses：")),
+    (("advantages:", "advantages："), ("disadvantages:", "disadvantages：")),
+    (("player info", "player information"),),
+    (("overall rating", "comprehensive rating"),),
+    (("development", "development direction"),),
+)
+
+_report_matcher = KeywordMatcher(
+    SCOUT_KEYWORDS
+    + tuple(
+        marker for section in SECTION_MARKERS for group in section for marker in group
+    )
+)
 
 
 def extract_text_from_file(filepath):
@@ -56,6 +93,37 @@ def extract_text_from_file(filepath):
         return f"Unsupported file format: {file_ext}"
 
 
+def score_scout_report(text_content):
+    """
+    Count scout report keywords and sections in a single pass over the text
+
+    Returns:
+        tuple: (number of distinct keywords found, number of sections found)
+    """
+    positions = _report_matcher.scan(text_content.lower())
+    keyword_count = sum(1 for keyword in SCOUT_KEYWORDS if keyword in positions)
+
+    section_count = 0
+    for section in SECTION_MARKERS:
+        found = [
+            [
+                positions[marker] + (len(marker),)
+                for marker in group
+                if marker in positions
+            ]
+            for group in section
+        ]
+        if not all(found):
+            continue
+        if len(found) == 2:
+            # The second marker must start after the end of the first one
+            first_end = min(first + length for first, _, length in found[0])
+            if max(last for _, last, _ in found[1]) <= first_end:
+                continue
+        section_count += 1
+    return keyword_count, section_count
+
+
 def is_scout_report(filepath):
     """Determine if a file is likely a scout report based on content analysis"""
     # First check file extension
@@ -73,52 +141,7 @@ def is_scout_report(filepath):
         current_app.logger.warning(f"Could not analyze file content: {text_content}")
         return False
 
-    # Define scout report keywords in both English and Chinese
-    scout_keywords = [
-        "scout report",
-        "player analysis",
-        "player profile",
-        "talent assessment",
-        "player evaluation",
-        "strengths",
-        "weaknesses",
-        "basketball skills",
-        "draft potential",
-        "scouting",
-        "rating",
-        "scout",
-        "player development",
-        "scout report",
-        "player analysis",
-        "player profile",
-        "technical assessment",
-        "advantages",
-        "disadvantages",
-        "basketball skills",
-        "draft potential",
-        "scouting",
-        "rating",
-        "player development",
-    ]
-
-    # Count keyword occurrences
-    keyword_count = sum(
-        1 for keyword in scout_keywords if keyword.lower() in text_content.lower()
-    )
-
-    # Check for structured report sections
-    sections_patterns = [
-        r"strengths[：:].+?weaknesses[：:]",
-        r"advantages[：:].+?disadvantages[：:]",
-        r"player info|player information",
-        r"overall rating|comprehensive rating",
-        r"development|development direction",
-    ]
-
-    section_count = 0
-    for pattern in sections_patterns:
-        if re.search(pattern, text_content.lower(), re.DOTALL):
-            section_count += 1
+    keyword_count, section_count = score_scout_report(text_content)
 
     # Determine if it's a scout report based on keywords and structure
     is_scout = (keyword_count >= 3) or (section_count >= 2)
@@ -1,12 +1,20 @@
-import requests
 import json
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
+from app.extensions import get_gemini_api
+from app.scout_analysis.cache import analysis_cache, make_cache_key
+from app.scout_analysis.mock_service import MockAnalysisService
+from app.scout_analysis.chunking import merge_analyses, split_into_chunks
+from app.scout_analysis.utils import extract_partial_field
 
 
 class ScoutAnalysisService:
     """Scout Report Analysis Service"""
 
+    # Bump when the prompt changes so cached results are not reused
+    PROMPT_VERSION = "v2"
+
     # Class variables for model caching
     _nlp_model = None
     _model_lock = threading.Lock()
@@ -51,9 +59,16 @@ class ScoutAnalysisService:
         return cls._nlp_model
 
     @staticmethod
-    def analyze_report(text_content, use_deep_analysis=False):
-        current_app.logger.warning(f"[DEBUG] services module path: {__file__}")
-        """Analyze scout report text, ensuring strict adherence to Gemini API format"""
+    def analyze_report(text_content, use_deep_analysis=False, on_delta=None):
+        """
+        Analyze scout report text, ensuring strict adherence to Gemini API format
+
+        Args:
+            text_content (str): Report text
+            use_deep_analysis (bool): Whether deep analysis was requested
+            on_delta (callable): Optional callback receiving summary text as it
+                is generated, used to stream single-chunk reports
+        """
         try:
             current_app.logger.info(
                 f"Starting text analysis, length={len(text_content)}"
@@ -64,19 +79,60 @@ class ScoutAnalysisService:
                     "Missing GEMINI_API_KEY configuration, unable to perform text analysis"
                 )
                 return ScoutAnalysisService.generate_mock_analysis(text_content)
-            api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-            current_app.logger.warning(
-                f"[DEBUG] Using config API key: {api_key[:5]}...{api_key[-5:]}"
+
+            # Identical reports are answered from the shared result cache
+            model = current_app.config.get("GEMINI_MODEL", "gemini-2.0-flash")
+            cache_key = make_cache_key(
+                text_content, ScoutAnalysisService.PROMPT_VERSION, model
             )
-            current_app.logger.warning(f"[DEBUG] Using API service: {api_url}")
-            current_app.logger.warning(
-                f"[DEBUG] Using Gemini API key: {api_key[:5]}...{api_key[-5:]}"
+            cached_result = analysis_cache.get(cache_key)
+            if cached_result is not None:
+                current_app.logger.info(f"Analysis cache hit: {cache_key[:12]}")
+                return cached_result
+            current_app.logger.info(f"Analysis cache miss: {cache_key[:12]}")
+
+            # Long reports are split and the chunks analyzed in parallel
+            chunks = split_into_chunks(
+                text_content, current_app.config.get("SCOUT_CHUNK_TOKENS", 2000)
             )
+            if len(chunks) <= 1:
+                if not current_app.config.get("SCOUT_STREAMING_ENABLED", True):
+                    on_delta = None
+                try:
+                    analysis_result, parsed = ScoutAnalysisService._analyze_chunk(
+                        text_content, on_delta=on_delta
+                    )
+                except Exception as e:
+                    current_app.logger.error(f"API request failed: {str(e)}")
+                    return ScoutAnalysisService.generate_mock_analysis(text_content)
+            else:
+                analysis_result, parsed = ScoutAnalysisService._analyze_chunks(chunks)
+                if analysis_result is None:
+                    return ScoutAnalysisService.generate_mock_analysis(text_content)
 
-            headers = {"Content-Type": "application/json"}
+            # Only well-formed model output is worth reusing
+            if parsed:
+                analysis_cache.set(
+                    cache_key,
+                    analysis_result,
+                    model,
+                    ScoutAnalysisService.PROMPT_VERSION,
+                )
+            return analysis_result
 
-            system_instruction = "You are a professional basketball scout. You analyze player information and generate detailed scouting reports."
-            user_prompt = f"""Given the following basketball player information, generate a detailed scouting report.
+        except Exception as e:
+            current_app.logger.error(f"Error during API call process: {str(e)}")
+            return ScoutAnalysisService.generate_mock_analysis(text_content)
+
+    @staticmethod
+    def build_prompt(text_content, part=None, total_parts=None):
+        """Build the scouting report prompt for a report or one part of it"""
+        system_instruction = "You are a professional basketball scout. You analyze player information and generate detailed scouting reports."
+        if part is not None:
+            source = f"Player information (part {part} of {total_parts} of a longer report, analyze this part only):"
+        else:
+            source = "Player information:"
+        user_prompt = f"""Given the following basketball player information, generate a detailed scouting report.
 
 Include:
 1. Player Name (string, key: player_name)
@@ -90,140 +146,105 @@ Include:
 
 Format your response as valid JSON with these exact keys: player_name, position, team, strengths, weaknesses, development_areas, summary, offensive_rating, defensive_rating, physical_rating, technical_rating, potential_rating, overall_rating
 
-Player information:
-{text_content[:1000]}"""
-
-            prompt_with_instruction = f"{system_instruction}\n\n{user_prompt}"
-
-            payload = {
-                "contents": [
-                    {"role": "user", "parts": [{"text": prompt_with_instruction}]}
-                ],
-                "generationConfig": {"temperature": 0.3, "maxOutputTokens": 2000},
-            }
-
-            current_app.logger.warning(f"[DEBUG] Gemini API request URL: {api_url}")
-            current_app.logger.warning(f"[DEBUG] Gemini API request headers: {headers}")
-            current_app.logger.warning(f"[DEBUG] Gemini API request body: {payload}")
-
-            try:
-                resp = requests.post(api_url, json=payload, headers=headers, timeout=60)
-                current_app.logger.warning(
-                    f"[DEBUG] Gemini API response status: {resp.status_code}"
-                )
-                if resp.status_code != 200:
-                    current_app.logger.error(
-                        f"Gemini API call failed: {resp.status_code} - {resp.text}"
-                    )
-                    return ScoutAnalysisService.generate_mock_analysis(text_content)
-                result = resp.json()
-                current_app.logger.warning(f"[DEBUG] API response: {result}")
-
-                content = ""
-                candidates = result.get("candidates", [])
-                if candidates and len(candidates) > 0:
-                    candidate = candidates[0]
-                    if (
-                        "content" in candidate
-                        and "parts" in candidate["content"]
-                        and len(candidate["content"]["parts"]) > 0
-                    ):
-                        content = candidate["content"]["parts"][0].get("text", "")
-
-                current_app.logger.warning(f"[DEBUG] Analysis content: {content}")
-
-                try:
-                    content = content.replace("```json", "").replace("```", "").strip()
-                    analysis_result = json.loads(content)
-                    current_app.logger.warning(
-                        f"[DEBUG] Parsed JSON: {analysis_result}"
-                    )
-                except Exception as e:
-                    current_app.logger.error(f"JSON parsing failed: {str(e)}")
-                    analysis_result = {"summary": content}
+{source}
+{text_content}"""
 
-                return analysis_result
+        return f"{system_instruction}\n\n{user_prompt}"
 
-            except Exception as e:
-                current_app.logger.error(f"API request failed: {str(e)}")
-                return ScoutAnalysisService.generate_mock_analysis(text_content)
+    @staticmethod
+    def parse_model_output(content):
+        """
+        Parse the JSON report returned by the model
 
+        Returns:
+            tuple: (analysis dict, whether the output was valid JSON)
+        """
+        try:
+            content = content.replace("```json", "").replace("```", "").strip()
+            return json.loads(content), True
         except Exception as e:
-            current_app.logger.error(f"Error during API call process: {str(e)}")
-            return ScoutAnalysisService.generate_mock_analysis(text_content)
+            current_app.logger.error(f"JSON parsing failed: {str(e)}")
+            return {"summary": content}, False
 
     @staticmethod
-    def generate_mock_analysis(text_content):
-        """Generate mock scout report analysis data"""
-        text_lower = text_content.lower()
-        name = "Unknown Player"
-
-        if "lebron" in text_lower:
-            name = "LeBron James"
-        elif "curry" in text_lower:
-            name = "Stephen Curry"
-        elif "durant" in text_lower:
-            name = "Kevin Durant"
-        elif "giannis" in text_lower:
-            name = "Giannis Antetokounmpo"
-        elif "jokic" in text_lower:
-            name = "Nikola Jokic"
-        elif "doncic" in text_lower:
-            name = "Luka Doncic"
-
-        strengths = [
-            "Excellent court vision",
-            "High basketball IQ",
-            "Strong offensive skills",
-        ]
-        weaknesses = [
-            "Needs improvement on defense",
-            "Inconsistent three-point shooting",
-        ]
-        development_areas = [
-            "Focus on defensive positioning",
-            "Develop leadership skills",
-        ]
-
-        if "shoot" in text_lower or "shooter" in text_lower or "shooting" in text_lower:
-            strengths.append("Great shooting ability")
-            offensive_rating = 88
+    def _analyze_chunk(text_content, part=None, total_parts=None, on_delta=None):
+        """Send one prompt to Gemini and parse the response"""
+        prompt = ScoutAnalysisService.build_prompt(text_content, part, total_parts)
+        generation_config = {"temperature": 0.3, "maxOutputTokens": 2000}
+
+        # Shared pooled client, reusing keep-alive connections
+        if on_delta is None:
+            content = get_gemini_api().generate_content(prompt, generation_config)
         else:
-            offensive_rating = 80
+            content = ScoutAnalysisService._stream_chunk(
+                prompt, generation_config, on_delta
+            )
+        current_app.logger.debug(f"Analysis content length: {len(content)}")
+        return ScoutAnalysisService.parse_model_output(content)
 
-        if (
-            "defend" in text_lower
-            or "defense" in text_lower
-            or "defensive" in text_lower
+    @staticmethod
+    def _stream_chunk(prompt, generation_config, on_delta):
+        """
+        Stream a response from Gemini, relaying the summary as it is written
+
+        Returns:
+            str: The complete model output
+        """
+        buffer = ""
+        sent = 0
+        for piece in get_gemini_api().stream_generate_content(
+            prompt, generation_config
         ):
-            strengths.append("Solid defensive skills")
-            defensive_rating = 85
-        else:
-            defensive_rating = 75
+            buffer += piece
+            summary, _ = extract_partial_field(buffer, "summary")
+            if summary is not None and len(summary) > sent:
+                on_delta(summary[sent:])
+                sent = len(summary)
+        return buffer
 
-        if "athletic" in text_lower or "jump" in text_lower or "speed" in text_lower:
-            strengths.append("Exceptional athleticism")
-            physical_rating = 90
-        else:
-            physical_rating = 78
+    @staticmethod
+    def _analyze_chunks(chunks):
+        """
+        Analyze chunks concurrently and merge the partial results
+
+        Returns:
+            tuple: (merged analysis or None if every chunk failed,
+                whether every chunk returned valid JSON)
+        """
+        app = current_app._get_current_object()
+        total = len(chunks)
+
+        def analyze(indexed_chunk):
+            index, chunk = indexed_chunk
+            with app.app_context():
+                try:
+                    return ScoutAnalysisService._analyze_chunk(chunk, index + 1, total)
+                except Exception as e:
+                    app.logger.error(f"Chunk {index + 1}/{total} failed: {str(e)}")
+                    return None, False
 
-        summary = (
-            f"Based on the provided text, {name} appears to be a talented basketball player with significant potential. "
-            "The player shows strong offensive capabilities and court awareness. "
-            "Further development in defensive positioning and consistency would elevate their game to the next level."
+        concurrency = min(app.config.get("SCOUT_CHUNK_CONCURRENCY", 8), total)
+        current_app.logger.info(
+            f"Analyzing {total} chunks with concurrency {concurrency}"
         )
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="scout-chunk"
+        ) as executor:
+            outcomes = list(executor.map(analyze, enumerate(chunks)))
+
+        results = []
+        weights = []
+        for chunk, (result, _) in zip(chunks, outcomes):
+            if isinstance(result, dict):
+                results.append(result)
+                weights.append(len(chunk))
+        if not results:
+            return None, False
+
+        merged = merge_analyses(results, weights)
+        return merged, all(parsed for _, parsed in outcomes)
 
-        return {
-            "processing_status": "completed",
-            "player_info": {"name": name, "position": "Forward", "team": "All-Stars"},
-            "strengths": strengths,
-            "weaknesses": weaknesses,
-            "development_areas": development_areas,
-            "summary": summary,
-            "offensive_rating": offensive_rating,
-            "defensive_rating": defensive_rating,
-            "physical_rating": physical_rating,
-            "technical_rating": 82,
-            "potential_rating": 87,
-            "overall_rating": 83,
-        }
+    @staticmethod
+    def generate_mock_analysis(text_content):
+        """Generate mock scout report analysis data"""
+        return MockAnalysisService.analyze_text(text_content)
@@ -0,0 +1,83 @@
+"""
+Background tasks for scout report analysis
+"""
+import json
+
+from flask import current_app
+
+from app.extensions import db
+from app.scout_analysis.events import event_hub
+
+
+def run_scout_analysis(analysis_id, file_path):
+    """
+    Extract text from an uploaded file and analyze it
+
+    Moves the analysis record through processing to completed or failed.
+    Unexpected errors are raised so that the job queue can retry the job.
+
+    Args:
+        analysis_id (int): ID of the ScoutReportAnalysis record
+        file_path (str): Path of the uploaded file
+    """
+    from app.scout_analysis.models import ScoutReportAnalysis
+    from app.scout_analysis.processors import extract_text_from_file
+    from app.scout_analysis.services import ScoutAnalysisService
+
+    analysis = db.session.get(ScoutReportAnalysis, analysis_id)
+    if analysis is None:
+        current_app.logger.warning(f"Scout analysis {analysis_id} no longer exists")
+        return
+
+    # A previous attempt may have finished just before its worker died
+    if analysis.processing_status in ("completed", "failed"):
+        return
+
+    analysis.processing_status = "processing"
+    db.session.commit()
+    event_hub.publish(analysis_id, "started", {"processing_status": "processing"})
+
+    text_content = extract_text_from_file(file_path)
+    if (
+        text_content
+        and not text_content.startswith("ERROR")
+        and len(text_content.strip()) > 0
+    ):
+        analysis_result = ScoutAnalysisService.analyze_report(
+            text_content,
+            use_deep_analysis=current_app.config.get(
+                "ENABLE_SCOUT_DEEP_ANALYSIS", False
+            ),
+            on_delta=lambda text: event_hub.publish(
+                analysis_id, "delta", {"text": text}
+            ),
+        )
+        analysis.update_from_analysis_result(analysis_result)
+    else:
+        analysis.processing_status = "failed"
+        analysis.analysis_result = json.dumps(
+            {"error": "Unable to extract valid text content, unable to analyze."}
+        )
+    db.session.commit()
+
+    # Streaming clients fetch the persisted result once they see this event
+    event_hub.publish(
+        analysis_id,
+        "complete" if analysis.processing_status == "completed" else "failed",
+        {"processing_status": analysis.processing_status},
+    )
+
+
+def mark_scout_analysis_failed(analysis_id, file_path, error):
+    """Record a scout analysis as failed once its job has run out of attempts"""
+    from app.scout_analysis.models import ScoutReportAnalysis
+
+    analysis = db.session.get(ScoutReportAnalysis, analysis_id)
+    if analysis is None:
+        return
+
+    current_app.logger.error(f"Scout report analysis error: {error}")
+    analysis.processing_status = "failed"
+    analysis.analysis_result = json.dumps({"error": f"Analysis error: {error}"})
+    db.session.commit()
+    event_hub.publish(analysis_id, "failed", {"processing_status": "failed"})
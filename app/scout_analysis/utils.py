@@ -0,0 +1,62 @@
+"""
+Helpers for working with partial Gemini output
+"""
+import json
+import re
+
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+def extract_partial_field(buffer, key):
+    """
+    Read a string field from JSON that is still being generated
+
+    Args:
+        buffer (str): JSON text received so far, possibly cut off mid-value
+        key (str): Name of a top-level string field
+
+    Returns:
+        tuple: (decoded value so far or None if the field has not started,
+            whether the closing quote has been received)
+    """
+    match = re.search(r'"%s"\s*:\s*"' % re.escape(json.dumps(key)[1:-1]), buffer)
+    if match is None:
+        return None, False
+
+    chars = []
+    index = match.end()
+    while index < len(buffer):
+        char = buffer[index]
+        if char == '"':
+            return "".join(chars), True
+        if char != "\\":
+            chars.append(char)
+            index += 1
+            continue
+
+        # Stop before an escape sequence that has not fully arrived
+        if index + 1 >= len(buffer):
+            break
+        code = buffer[index + 1]
+        if code == "u":
+            digits = buffer[index + 2 : index + 6]
+            if len(digits) < 4:
+                break
+            try:
+                chars.append(chr(int(digits, 16)))
+            except ValueError:
+                pass
+            index += 6
+        else:
+            chars.append(_ESCAPES.get(code, code))
+            index += 2
+    return "".join(chars), False
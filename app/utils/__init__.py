@@ -1,11 +1,12 @@
 # Initialize app/utils package
 # This file makes the app/utils directory a Python package that can be imported
 
+import logging
 import os
 import uuid
 import pandas as pd
 import re
-from flask import request, abort, flash
+from flask import request, abort, flash, current_app, has_app_context
 from flask_wtf.csrf import validate_csrf
 
 
@@ -55,22 +56,89 @@ def validate_csrf_token():
     return True
 
 
-def load_dataset(file_path):
-    """Load dataset based on file extension"""
+def string_columns(df):
+    """
+    Give a DataFrame string column labels
+
+    Schemas and request parameters name columns by their text, so frames
+    with integer labels (headerless files, JSON arrays of arrays) are
+    relabelled in place to match.
+    """
+    if not all(isinstance(col, str) for col in df.columns):
+        df.columns = [str(col) for col in df.columns]
+    return df
+
+
+def parse_dataset(file_path, columns=None, read_options=None, sheet=None):
+    """
+    Parse a dataset file based on its extension
+
+    Args:
+        file_path (str): Path of the uploaded file
+        columns (list): Only parse these columns; None parses all of them
+        read_options (dict): read_csv arguments for TXT files; sniffed from
+            the file when not given
+        sheet (str): Workbook sheet to parse; the first sheet when not given
+    """
+    from app.utils.sniffer import sniff_read_options
 
     ext = file_path.rsplit(".", 1)[1].lower() if "." in file_path else ""
     try:
         if ext == "csv":
-            df = pd.read_csv(file_path)
-        elif ext == "xlsx":
-            df = pd.read_excel(file_path)
+            df = pd.read_csv(file_path, usecols=columns)
+        elif ext in ("xlsx", "xls"):
+            df = pd.read_excel(
+                file_path, sheet_name=sheet if sheet is not None else 0, usecols=columns
+            )
         elif ext == "json":
-            df = pd.read_json(file_path)
+            df = string_columns(pd.read_json(file_path))
+            if columns is not None:
+                df = df[columns]
         elif ext == "txt":
-            # Try to detect delimiter
-            df = pd.read_csv(file_path, sep=None, engine="python")
+            # Parse with the C engine using the detected dialect
+            options = read_options or sniff_read_options(file_path)
+            try:
+                df = pd.read_csv(file_path, usecols=columns, **options)
+            except ValueError:
+                # Fall back to pandas' own (pure-Python) delimiter detection
+                df = pd.read_csv(file_path, sep=None, engine="python", usecols=columns)
         else:
             return None, "Unsupported file format"
-        return df, None
+        return string_columns(df), None
     except Exception as e:
         return None, f"Error loading dataset: {str(e)}"
+
+
+def load_dataset(file_path, columns=None, read_options=None, sheet=None):
+    """
+    Load dataset, reading its columnar sidecar when one is up to date
+
+    The first load of a file parses it and saves a sidecar, so later loads
+    skip parsing until the file changes. When columns are given only those
+    are read, and no sidecar is written. Workbooks are converted once into
+    one sidecar per sheet, and only the requested sheet is loaded.
+    """
+    from app.utils.sidecar import read_sidecar, write_sidecar
+    from app.utils.workbook import EXCEL_EXTENSIONS, load_sheet
+
+    use_sidecar = not has_app_context() or current_app.config.get(
+        "DATASET_SIDECAR_ENABLED", True
+    )
+    ext = file_path.rsplit(".", 1)[1].lower() if "." in file_path else ""
+    if ext in EXCEL_EXTENSIONS:
+        if use_sidecar:
+            return load_sheet(file_path, sheet, columns)
+        return parse_dataset(file_path, columns, sheet=sheet)
+
+    if use_sidecar:
+        df = read_sidecar(file_path, columns)
+        if df is not None:
+            return df, None
+
+    df, error = parse_dataset(file_path, columns, read_options)
+    if error is None and use_sidecar and columns is None:
+        try:
+            write_sidecar(file_path, df)
+        except OSError as e:
+            logging.warning(f"Could not save dataset sidecar: {e}")
+    return df, error
@@ -0,0 +1,200 @@
+"""
+Server-side group-by aggregation for chart data
+
+Bar and pie charts need one value per category, not one per row. Requests
+name the group-by columns, the aggregations and optional filters and
+ordering; the result is computed with vectorized pandas on the loaded
+frame, so only the aggregated rows are sent to the browser.
+
+Request syntax:
+
+- aggregation: ``column:function`` (sum, mean, count, median, min, max), or
+  ``count`` alone for the number of rows in each group
+- filter: ``column:operator:value`` (eq, ne, gt, gte, lt, lte, in,
+  contains); ``in`` takes values separated by ``|``
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+AGGREGATE_FUNCTIONS = ("sum", "mean", "count", "median", "min", "max")
+NUMERIC_FUNCTIONS = {"sum", "mean", "median"}
+FILTER_OPERATORS = ("eq", "ne", "gt", "gte", "lt", "lte", "in", "contains")
+ROW_COUNT = "count"
+
+_FILTER_PATTERN = re.compile(r"^(.+?):(%s):(.*)$" % "|".join(FILTER_OPERATORS))
+
+
+def parse_aggregations(specs):
+    """
+    Parse aggregation parameters
+
+    Args:
+        specs (list): Strings such as "points:sum" or "count"
+
+    Returns:
+        list: Dicts with "column" (None for the row count), "function" and
+            the output column "name"
+    """
+    aggregations = []
+    for spec in specs or [ROW_COUNT]:
+        if spec == ROW_COUNT:
+            aggregations.append(
+                {"column": None, "function": ROW_COUNT, "name": ROW_COUNT}
+            )
+            continue
+        column, _, function = spec.rpartition(":")
+        if not column or function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(
+                f"Invalid aggregation: {spec}. Use column:function with one of "
+                + ", ".join(AGGREGATE_FUNCTIONS)
+            )
+        aggregations.append(
+            {"column": column, "function": function, "name": f"{column}_{function}"}
+        )
+    names = [aggregation["name"] for aggregation in aggregations]
+    if len(set(names)) != len(names):
+        raise ValueError("Each aggregation may only be requested once")
+    return aggregations
+
+
+def parse_filters(specs):
+    """
+    Parse filter parameters
+
+    Returns:
+        list: (column, operator, value) tuples
+    """
+    filters = []
+    for spec in specs:
+        match = _FILTER_PATTERN.match(spec)
+        if match is None:
+            raise ValueError(
+                f"Invalid filter: {spec}. Use column:operator:value with one of "
+                + ", ".join(FILTER_OPERATORS)
+            )
+        filters.append(match.groups())
+    return filters
+
+
+def _coerce(series, value):
+    """Convert a filter value from the query string to the column's type"""
+    if pd.api.types.is_bool_dtype(series):
+        if value.lower() not in ("true", "false"):
+            raise ValueError(f"Filter on {series.name} needs true or false")
+        return value.lower() == "true"
+    if pd.api.types.is_numeric_dtype(series):
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"Filter on {series.name} needs a number, got {value}")
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return pd.Timestamp(value)
+    return value
+
+
+def filter_mask(df, filters):
+    """
+    Return a boolean array selecting the rows that match every filter
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, operator, raw in filters:
+        series = df[column]
+        if operator == "contains":
+            matches = series.astype(str).str.contains(raw, regex=False)
+        elif operator == "in":
+            values = [_coerce(series, value) for value in raw.split("|")]
+            matches = series.isin(values)
+        else:
+            value = _coerce(series, raw)
+            if operator in ("eq", "ne") and series.dtype == object:
+                # Mixed object columns are compared by their text
+                series = series.astype(str)
+            matches = {
+                "eq": series.__eq__,
+                "ne": series.__ne__,
+                "gt": series.__gt__,
+                "gte": series.__ge__,
+                "lt": series.__lt__,
+                "lte": series.__le__,
+            }[operator](value)
+        mask &= matches.fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+def aggregate_frame(
+    df, group_by, aggregations, filters=None, sort=None, ascending=False, limit=None
+):
+    """
+    Filter, group and aggregate a DataFrame
+
+    Args:
+        df (DataFrame): Frame holding at least the referenced columns
+        group_by (list): Columns to group by; none gives a single row
+        aggregations (list): Output of parse_aggregations
+        filters (list): Output of parse_filters
+        sort (str): Output column to order by; the first aggregation when
+            not given
+        ascending (bool): Sort order
+        limit (int): Number of groups to return after sorting
+
+    Returns:
+        dict: "columns", "rows", "total_rows" (after filtering) and
+            "total_groups"
+    """
+    for aggregation in aggregations:
+        column = aggregation["column"]
+        if aggregation["function"] in NUMERIC_FUNCTIONS and not (
+            pd.api.types.is_numeric_dtype(df[column])
+            and not pd.api.types.is_bool_dtype(df[column])
+        ):
+            raise ValueError(
+                f"{aggregation['function']} needs a numeric column: {column}"
+            )
+
+    if filters:
+        df = df[filter_mask(df, filters)]
+
+    named = {
+        aggregation["name"]: (
+            (aggregation["column"], aggregation["function"])
+            if aggregation["column"] is not None
+            else (df.columns[0], "size")
+        )
+        for aggregation in aggregations
+    }
+    if group_by:
+        result = (
+            df.groupby(group_by, sort=False, observed=True, dropna=False)
+            .agg(**named)
+            .reset_index()
+        )
+    else:
+        result = pd.DataFrame(
+            {
+                name: [len(df) if function == "size" else df[column].agg(function)]
+                for name, (column, function) in named.items()
+            }
+        )
+
+    output_columns = list(group_by) + [
+        aggregation["name"] for aggregation in aggregations
+    ]
+    sort = sort or aggregations[0]["name"]
+    if sort not in output_columns:
+        raise ValueError(
+            f"Cannot sort by {sort}; use one of " + ", ".join(output_columns)
+        )
+
+    total_groups = len(result)
+    result = result.sort_values(sort, ascending=ascending, kind="stable")
+    if limit is not None:
+        result = result.head(limit)
+
+    return {
+        "columns": output_columns,
+        "rows": result.astype(object).where(result.notna(), None).to_dict("records"),
+        "total_rows": len(df),
+        "total_groups": total_groups,
+    }
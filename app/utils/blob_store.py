@@ -0,0 +1,165 @@
+"""
+Content-addressed store for uploaded files
+
+Uploads are hashed with SHA-256 while they are written to disk and stored
+once per content under a sharded path, ``<upload folder>/ab/cd/<hash>.<ext>``.
+Datasets point at the shared file through their file_path, and a
+stored_blobs row counts the references, so a file and the sidecars and
+indexes derived from it are removed only when the last dataset using it is
+deleted.
+"""
+import hashlib
+import os
+import tempfile
+
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.blob import StoredBlob
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def blob_path(upload_folder, digest, extension):
+    """Return the sharded path of a blob"""
+    return os.path.join(upload_folder, digest[:2], digest[2:4], f"{digest}.{extension}")
+
+
+def _stream_to_temp(stream, upload_folder):
+    """Copy a file stream to a temporary file, hashing it on the way"""
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=upload_folder, suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest(), size
+
+
+def _add_reference(blob_id):
+    """
+    Count one more dataset using a blob
+
+    Returns:
+        bool: False if the blob was deleted since it was looked up
+    """
+    # A single UPDATE so concurrent uploads cannot lose an increment
+    result = db.session.execute(
+        db.update(StoredBlob)
+        .where(StoredBlob.id == blob_id)
+        .values(ref_count=StoredBlob.ref_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def store_upload(file, upload_folder, extension):
+    """
+    Save an uploaded file into the store, or reference an identical one
+
+    The upload is kept in its temporary file until a blob row references it,
+    so a blob released by a concurrent delete can be stored again.
+
+    Args:
+        file (FileStorage): Uploaded file
+        upload_folder (str): Root directory of the store
+        extension (str): File extension, without the dot
+
+    Returns:
+        tuple: (StoredBlob, True if an identical file was already stored)
+    """
+    extension = extension.lower()
+    os.makedirs(upload_folder, exist_ok=True)
+    tmp_path, digest, size = _stream_to_temp(file.stream, upload_folder)
+    path = blob_path(upload_folder, digest, extension)
+
+    try:
+        while True:
+            blob = StoredBlob.query.filter_by(
+                sha256=digest, extension=extension
+            ).first()
+            if blob is None:
+                blob = StoredBlob(
+                    sha256=digest,
+                    extension=extension,
+                    path=path,
+                    size=size,
+                    ref_count=1,
+                )
+                db.session.add(blob)
+                try:
+                    db.session.commit()
+                except IntegrityError:
+                    # Another request stored the same content first
+                    db.session.rollback()
+                    continue
+                existed = False
+            elif _add_reference(blob.id):
+                db.session.refresh(blob)
+                existed = True
+            else:
+                # The last dataset using it was deleted after the lookup
+                continue
+
+            # A new blob, or a lost file; the upload has the same content
+            if not os.path.exists(blob.path):
+                os.makedirs(os.path.dirname(blob.path), exist_ok=True)
+                os.replace(tmp_path, blob.path)
+            return blob, existed
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _remove_file(file_path):
+    """Delete a dataset file and everything derived from it"""
+    from app.utils.row_index import remove_row_index
+    from app.utils.sidecar import remove_sidecar
+
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    remove_sidecar(file_path)
+    remove_row_index(file_path)
+
+
+def release_file(file_path):
+    """
+    Drop one dataset's reference to a file
+
+    The blob row is deleted by a conditional DELETE in the same transaction
+    as the decrement, so a reference added by a concurrent upload keeps both
+    the row and the file. Files uploaded before the store existed have no
+    blob record and are removed directly.
+
+    Returns:
+        bool: True if the file was deleted
+    """
+    blob_id = db.session.execute(
+        db.select(StoredBlob.id).where(StoredBlob.path == file_path)
+    ).scalar()
+    if blob_id is None:
+        _remove_file(file_path)
+        return True
+
+    db.session.execute(
+        db.update(StoredBlob)
+        .where(StoredBlob.id == blob_id)
+        .values(ref_count=StoredBlob.ref_count - 1)
+    )
+    result = db.session.execute(
+        db.delete(StoredBlob)
+        .where(StoredBlob.id == blob_id, StoredBlob.ref_count <= 0)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if result.rowcount != 1:
+        return False
+    _remove_file(file_path)
+    return True
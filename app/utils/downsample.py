@@ -0,0 +1,229 @@
+"""
+Chart-aware downsampling for visualization payloads
+
+Large datasets are reduced to at most ``max_points`` points before they are
+sent to the browser, using a method suited to each chart type:
+
+- line: Largest-Triangle-Three-Buckets (LTTB), which keeps the visual shape
+  of the series
+- scatter: grid binning, keeping one point per occupied cell
+- bar/pie: group-by aggregation of the y values per category, keeping the
+  top categories and summing the rest into an "Other" bucket
+
+Each function returns positional row indices or aggregated arrays, computed
+with NumPy rather than Python loops over rows.
+"""
+import numpy as np
+import pandas as pd
+
+OTHER_LABEL = "Other"
+
+
+def _numeric_values(series):
+    """
+    Return a float array for a column, or None if it is not numeric
+
+    Datetime columns are converted to nanosecond timestamps.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return None
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    return None
+
+
+def _json_values(series):
+    """List a column's values, with missing values (NaN, NaT, pd.NA) as None"""
+    if not series.hasnans:
+        return series.tolist()
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def _axis_values(series):
+    """Numeric positions for an axis; categories are replaced by their codes"""
+    values = _numeric_values(series)
+    if values is None:
+        codes, _ = pd.factorize(series, sort=False)
+        values = codes.astype(float)
+        values[codes < 0] = np.nan
+    return values
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Select points with the Largest-Triangle-Three-Buckets algorithm
+
+    Args:
+        x (ndarray): Numeric x values
+        y (ndarray): Numeric y values
+        threshold (int): Number of points to keep
+
+    Returns:
+        ndarray: Sorted positional indices of the kept points
+    """
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1])[:threshold]
+
+    # The first and last points are always kept; the rest is split into
+    # threshold - 2 buckets of roughly equal size
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Average of each bucket, used as the third triangle vertex for the
+    # bucket before it; the last bucket is followed by the last point
+    sums_x = np.add.reduceat(x[1 : n - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1 : n - 1], starts - 1)
+    sizes = ends - starts
+    avg_x = np.append(sums_x / sizes, x[n - 1])[1:]
+    avg_y = np.append(sums_y / sizes, y[n - 1])[1:]
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = starts[i], ends[i]
+        bx, by = x[start:end], y[start:end]
+        # Twice the triangle area; the constant factor does not change argmax
+        areas = np.abs(
+            (x[a] - avg_x[i]) * (by - y[a]) - (x[a] - bx) * (avg_y[i] - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def grid_indices(x, y, max_points):
+    """
+    Keep the first point in each occupied cell of a square grid
+
+    Args:
+        x (ndarray): Numeric x values
+        y (ndarray): Numeric y values
+        max_points (int): Upper bound on the number of points kept
+
+    Returns:
+        tuple: (sorted positional indices, number of rows in each kept cell)
+    """
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    size = max(int(np.sqrt(max_points)), 1)
+
+    def cells(values):
+        low, high = values.min(), values.max()
+        span = high - low if high > low else 1.0
+        return np.minimum(((values - low) / span * size).astype(np.int64), size - 1)
+
+    if len(valid) == 0:
+        return valid, np.array([], dtype=np.int64)
+    cell = cells(x[valid]) * size + cells(y[valid])
+    _, first, counts = np.unique(cell, return_index=True, return_counts=True)
+    order = np.argsort(first)
+    return valid[first[order]], counts[order]
+
+
+def top_categories(labels, values, max_points):
+    """
+    Aggregate values per category and keep the largest categories
+
+    Numeric values are summed per category; otherwise rows are counted.
+    Categories beyond the top ``max_points - 1`` are merged into "Other".
+
+    Args:
+        labels (Series): Category column
+        values (Series): Value column, or None to count rows
+        max_points (int): Upper bound on the number of categories returned
+
+    Returns:
+        tuple: (list of labels, list of aggregated values)
+    """
+    codes, uniques = pd.factorize(labels, sort=False)
+    present = codes >= 0
+    codes = codes[present]
+
+    weights = _numeric_values(values) if values is not None else None
+    if weights is not None:
+        weights = np.nan_to_num(weights[present], nan=0.0)
+    totals = np.bincount(codes, weights=weights, minlength=len(uniques))
+
+    keep = max(max_points - 1, 1) if len(uniques) > max_points else len(uniques)
+    order = np.argsort(-totals, kind="stable")
+    top, rest = order[:keep], order[keep:]
+
+    result_labels = uniques.take(top).tolist()
+    result_values = totals[top].tolist()
+    if len(rest):
+        result_labels.append(OTHER_LABEL)
+        result_values.append(float(totals[rest].sum()))
+    if weights is None:
+        result_values = [int(value) for value in result_values]
+    return result_labels, result_values
+
+
+def downsample_chart(df, chart_type, x_column, y_column, max_points):
+    """
+    Build visualization data for a chart, reduced to at most max_points points
+
+    Datasets that already fit are returned unchanged, row for row.
+
+    Args:
+        df (DataFrame): Dataset to plot
+        chart_type (str): "bar", "line", "scatter" or "pie"
+        x_column (str): Column for the x axis or pie labels
+        y_column (str): Column for the y axis or pie values
+        max_points (int): Upper bound on the number of points returned
+
+    Returns:
+        dict: Chart data plus a "downsampling" summary
+    """
+    total = len(df)
+    x_series = df[x_column] if x_column else None
+    y_series = df[y_column] if y_column else None
+    method = None
+    counts = None
+
+    if total <= max_points:
+        x_values = _json_values(x_series) if x_series is not None else []
+        y_values = _json_values(y_series) if y_series is not None else []
+    elif chart_type in ("bar", "pie") and x_series is not None:
+        method = "top_n"
+        x_values, y_values = top_categories(x_series, y_series, max_points)
+    else:
+        y_numeric = _numeric_values(y_series) if y_series is not None else None
+        if chart_type == "scatter" and x_series is not None and y_series is not None:
+            method = "grid"
+            indices, counts = grid_indices(
+                _axis_values(x_series), _axis_values(y_series), max_points
+            )
+        elif y_numeric is not None and not np.all(np.isnan(y_numeric)):
+            method = "lttb"
+            x_numeric = _numeric_values(x_series) if x_series is not None else None
+            if x_numeric is None or np.isnan(x_numeric).any():
+                x_numeric = np.arange(total, dtype=float)
+            # Missing values would poison the bucket averages
+            y_filled = pd.Series(y_numeric).ffill().bfill().to_numpy()
+            indices = lttb_indices(x_numeric, y_filled, max_points)
+        else:
+            method = "stride"
+            indices = np.linspace(0, total - 1, max_points).astype(np.int64)
+        x_values = _json_values(x_series.iloc[indices]) if x_series is not None else []
+        y_values = _json_values(y_series.iloc[indices]) if y_series is not None else []
+
+    if chart_type == "pie":
+        result = {"labels": x_values, "values": y_values}
+    else:
+        result = {"x": x_values, "y": y_values, "type": chart_type}
+    if counts is not None:
+        result["counts"] = counts.tolist()
+
+    returned = len(x_values) if x_series is not None else len(y_values)
+    result["downsampling"] = {
+        "method": method,
+        "original_points": total,
+        "points": returned,
+        "reduced": method is not None,
+    }
+    return result
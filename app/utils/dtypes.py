@@ -0,0 +1,133 @@
+"""
+Compact in-memory dtypes for loaded datasets
+
+pandas parses integers as int64, decimals as float64 and text as Python
+string objects. Box score exports repeat the same team, position and player
+names on every row, and their counts fit in a byte or two. At ingest a
+dtype plan is chosen once per file and stored with the dataset schema:
+
+- integers are downcast to the smallest signed type holding their range
+- floats stay float64: float32 holds about seven significant digits, so
+  sums and means over many rows would drift even when each value is exact
+- text columns with few distinct values become ``category``; other text
+  columns become Arrow-backed strings when pyarrow is installed
+
+Loads apply the stored plan directly instead of inspecting the data again.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+# Text columns with at most this share of distinct values become categories
+CATEGORY_MAX_RATIO = 0.5
+
+try:
+    import pyarrow  # noqa: F401
+
+    ARROW_STRING = "string[pyarrow]"
+except ImportError:  # pragma: no cover - depends on installed packages
+    ARROW_STRING = None
+
+
+def _smallest_integer(low, high):
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype).name
+    return None
+
+
+def _is_plain_integer(dtype):
+    return (
+        pd.api.types.is_integer_dtype(dtype)
+        and not pd.api.types.is_extension_array_dtype(dtype)
+        and np.dtype(dtype).itemsize > 1
+    )
+
+
+def plan_dtypes(df):
+    """
+    Choose a compact dtype for each column of a loaded DataFrame
+
+    Returns:
+        dict: Column name -> dtype name, only for columns that change
+    """
+    plan = {}
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+        if _is_plain_integer(dtype):
+            if len(series):
+                target = _smallest_integer(series.min(), series.max())
+                if target and target != dtype.name:
+                    plan[str(col)] = target
+        elif dtype == object:
+            if pd.api.types.infer_dtype(series, skipna=True) != "string":
+                continue
+            present = series.count()
+            if present and series.nunique() <= present * CATEGORY_MAX_RATIO:
+                plan[str(col)] = "category"
+            elif ARROW_STRING:
+                plan[str(col)] = ARROW_STRING
+    return plan
+
+
+def plan_from_profile(profile):
+    """
+    Choose compact dtypes from a stored profile, for files never loaded whole
+
+    Integer ranges come from the column statistics and text cardinality from
+    the categorical summary. Floats are left as float64, as in plan_dtypes.
+
+    Args:
+        profile (dict): Profile in the format of profile_dataframe
+
+    Returns:
+        dict: Column name -> dtype name, only for columns that change
+    """
+    plan = {}
+    statistics = profile.get("statistics", {})
+    summaries = profile.get("categorical_summary", {})
+    for col, dtype in profile["column_types"].items():
+        if dtype == "int64" and col in statistics and statistics[col]["count"]:
+            target = _smallest_integer(statistics[col]["min"], statistics[col]["max"])
+            if target:
+                plan[col] = target
+        elif dtype == "object" and col in summaries:
+            summary = summaries[col]
+            if summary["count"] and (
+                summary["distinct"] <= summary["count"] * CATEGORY_MAX_RATIO
+            ):
+                plan[col] = "category"
+    return plan
+
+
+def apply_dtypes(df, plan):
+    """
+    Convert columns to the planned dtypes
+
+    Columns that are missing, already converted or cannot be converted are
+    left as they are. The input DataFrame is not modified, since it may be
+    shared through the frame cache.
+
+    Returns:
+        DataFrame: The converted DataFrame, or df itself if nothing changed
+    """
+    if not plan:
+        return df
+    converted = {}
+    for col in df.columns:
+        target = plan.get(str(col))
+        if target is None or str(df[col].dtype) == target:
+            continue
+        try:
+            converted[col] = df[col].astype(target)
+        except (TypeError, ValueError, ImportError) as e:
+            logging.info(f"Keeping column {col} as {df[col].dtype}: {e}")
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for col, series in converted.items():
+        df[col] = series
+    return df
@@ -0,0 +1,189 @@
+"""
+In-process cache of loaded dataset DataFrames
+
+Chart changes on the visualization page call the analysis and
+visualization endpoints repeatedly for the same dataset. Loaded DataFrames
+are kept per process, keyed by dataset ID and file version, within a byte
+budget measured with ``memory_usage(deep=True)``; the least recently used
+entries are evicted first.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+
+
+def file_version(file_path):
+    """Return a cheap version stamp for a file, or None if it is missing"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class FrameCache:
+    """Byte-budgeted LRU cache of DataFrames"""
+
+    def __init__(self, max_bytes=None):
+        """
+        Args:
+            max_bytes (int): Byte budget; read from DATAFRAME_CACHE_MAX_BYTES
+                when not given
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (dataset_id, version) -> (df, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _budget(self):
+        if self.max_bytes is not None:
+            return self.max_bytes
+        return current_app.config.get("DATAFRAME_CACHE_MAX_BYTES", 256 * 1024**2)
+
+    def _drop(self, key):
+        _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, dataset_id, version):
+        """
+        Return the cached DataFrame for a dataset version
+
+        The DataFrame is shared between requests and must not be modified.
+        """
+        key = (dataset_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def set(self, dataset_id, version, df):
+        """Cache a DataFrame, evicting least recently used entries to fit"""
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        budget = self._budget()
+        if size > budget:
+            return
+        with self._lock:
+            # Older versions of the same dataset can never be hit again
+            for key in [key for key in self._entries if key[0] == dataset_id]:
+                self._drop(key)
+            self._entries[(dataset_id, version)] = (df, size)
+            self._bytes += size
+            self._stats["stores"] += 1
+            while self._bytes > budget:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, dataset_id):
+        """Forget every cached version of a dataset"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == dataset_id]:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return hit, miss and eviction counters for monitoring"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        stats["max_bytes"] = self._budget()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# Process-wide cache instance
+frame_cache = FrameCache()
+
+
+def load_dataset_frame(dataset):
+    """
+    Load a dataset's DataFrame through the in-process cache
+
+    Frames are converted to the compact dtypes stored with the dataset
+    schema before they are cached.
+
+    Args:
+        dataset (Dataset): Dataset record
+
+    Returns:
+        tuple: (DataFrame or None, error message or None)
+    """
+    from app.datasets.schema import read_options_for, storage_dtypes_for
+    from app.utils import load_dataset
+    from app.utils.dtypes import apply_dtypes
+
+    version = file_version(dataset.file_path)
+    if version is not None:
+        df = frame_cache.get(dataset.id, version)
+        if df is not None:
+            return df, None
+
+    df, error = load_dataset(dataset.file_path, read_options=read_options_for(dataset))
+    if error is None:
+        df = apply_dtypes(df, storage_dtypes_for(dataset))
+        if version is not None:
+            frame_cache.set(dataset.id, version, df)
+    return df, error
+
+
+def _select(df, columns):
+    """Return (df[columns], None), or an error naming a missing column"""
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        return None, f"Column not found: {missing[0]}"
+    return df[columns], None
+
+
+def load_dataset_columns(dataset, columns):
+    """
+    Load only some columns of a dataset
+
+    A cached full DataFrame is used when there is one. Otherwise only the
+    requested columns are read, from a Feather sidecar or by parsing with
+    usecols, when that avoids loading the whole file: with a Feather sidecar,
+    or when the file is too large to load whole. Else the full DataFrame is
+    loaded and cached as load_dataset_frame does.
+
+    Args:
+        dataset (Dataset): Dataset record
+        columns (list): Column names to load
+
+    Returns:
+        tuple: (DataFrame or None, error message or None)
+    """
+    from app.datasets.profiling import use_streaming
+    from app.datasets.schema import read_options_for, storage_dtypes_for
+    from app.utils import load_dataset
+    from app.utils.dtypes import apply_dtypes
+    from app.utils.sidecar import sidecar_meta
+
+    columns = list(dict.fromkeys(columns))
+    version = file_version(dataset.file_path)
+    if version is not None:
+        df = frame_cache.get(dataset.id, version)
+        if df is not None:
+            return _select(df, columns)
+
+    meta = sidecar_meta(dataset.file_path)
+    if (meta and meta["format"] == "feather") or use_streaming(dataset.file_path):
+        df, error = load_dataset(dataset.file_path, columns, read_options_for(dataset))
+        if error:
+            return None, error
+        return apply_dtypes(df, storage_dtypes_for(dataset)), None
+
+    df, error = load_dataset_frame(dataset)
+    if error:
+        return None, error
+    return _select(df, columns)
@@ -0,0 +1,236 @@
+"""
+Sparse row offset index for delimited dataset files
+
+Records the byte offset of every ``stride``-th data row of a CSV or TXT
+file, so any window of rows can be read with one seek and a short read
+instead of parsing the file from the start. The index is saved next to the
+file as ``<file>.index.json`` and rebuilt when the file changes.
+
+Row boundaries are newlines outside double-quoted fields, so quoted values
+containing line breaks are handled. Blank lines are not counted as rows,
+matching pandas.
+"""
+import glob
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.utils.sidecar import _write_json
+from app.utils.sniffer import default_read_options
+
+# Bump when the index layout changes so old indexes are rebuilt
+ROW_INDEX_VERSION = 3
+
+ROW_INDEX_STRIDE = 1024
+INDEXABLE_EXTENSIONS = {"csv", "txt"}
+
+_BLOCK_SIZE = 16 * 1024**2
+_NEWLINE = ord("\n")
+_QUOTE = ord('"')
+_WHITESPACE = b" \t\r"
+
+
+def _index_path(file_path):
+    return f"{file_path}.index.json"
+
+
+def _blank_bytes(sep):
+    """
+    Bytes that pandas ignores on an otherwise empty line
+
+    These are spaces, tabs and carriage returns, except the delimiter.
+    """
+    if len(sep) != 1:
+        return _WHITESPACE
+    return _WHITESPACE.replace(sep.encode("latin-1"), b"")
+
+
+def _record_ends(file_path, blank=_WHITESPACE):
+    """
+    Yield (end, is_blank) for each record of the file
+
+    end is the byte offset just past the record-ending newline, or the file
+    size for a last record without one. A record is blank when it holds only
+    bytes in blank. The file is scanned in blocks with NumPy; quote parity
+    carried across blocks decides whether a newline ends a record.
+    """
+    ignored = np.frombuffer(blank + b"\n", dtype=np.uint8)
+    quotes_before = 0
+    position = 0
+    record_start = 0
+    # Offset just past the last byte that is not blank or a newline
+    content_end = 0
+    with open(file_path, "rb") as f:
+        while True:
+            block = f.read(_BLOCK_SIZE)
+            if not block:
+                break
+            data = np.frombuffer(block, dtype=np.uint8)
+            newlines = np.flatnonzero(data == _NEWLINE)
+            quotes = np.flatnonzero(data == _QUOTE)
+            if len(quotes):
+                parity = (quotes_before + np.searchsorted(quotes, newlines)) % 2
+                newlines = newlines[parity == 0]
+                quotes_before += len(quotes)
+            content = np.flatnonzero(~np.isin(data, ignored))
+            ends = newlines + position + 1
+            if len(content):
+                before = np.searchsorted(content, newlines)
+                last = content[np.maximum(before - 1, 0)] + position + 1
+                last = np.where(before > 0, last, content_end)
+                content_end = int(content[-1]) + position + 1
+            else:
+                last = np.full(len(newlines), content_end)
+            starts = np.r_[record_start, ends[:-1]]
+            yield from zip(ends.tolist(), (last <= starts).tolist())
+            if len(ends):
+                record_start = int(ends[-1])
+            position += len(block)
+    if record_start < position:
+        yield position, content_end <= record_start
+
+
+def _row_starts(file_path, has_header, blank=_WHITESPACE):
+    """Yield the byte offset at which each non-blank data row starts"""
+    start = 0
+    for end, is_blank in _record_ends(file_path, blank):
+        if not is_blank:
+            if has_header:
+                has_header = False
+            else:
+                yield start
+        start = end
+
+
+def build_row_index(file_path, stride=ROW_INDEX_STRIDE, has_header=True, sep=","):
+    """
+    Scan a delimited file and save its sparse row index
+
+    Blank lines are skipped, as pandas skips them, so row i is the i-th
+    non-blank record after the header. The header, and any blank lines
+    around it, end where the first data row starts.
+
+    Returns:
+        dict: The saved index
+    """
+    stat = os.stat(file_path)
+    header_end = None if has_header else 0
+    offsets = []
+    row_count = 0
+    for start in _row_starts(file_path, has_header, _blank_bytes(sep)):
+        if header_end is None:
+            header_end = start
+        if row_count % stride == 0:
+            offsets.append(start)
+        row_count += 1
+
+    index = {
+        "version": ROW_INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "stride": stride,
+        "has_header": has_header,
+        "sep": sep,
+        "header_end": header_end if header_end is not None else stat.st_size,
+        "row_count": row_count,
+        "offsets": offsets,
+    }
+    _write_json(_index_path(file_path), index)
+    return index
+
+
+def load_row_index(file_path, has_header=True, sep=","):
+    """
+    Return the row index of a file, rebuilding it if it is missing or stale
+    """
+    try:
+        with open(_index_path(file_path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = None
+    stat = os.stat(file_path)
+    if (
+        index is None
+        or index.get("version") != ROW_INDEX_VERSION
+        or index["size"] != stat.st_size
+        or index["mtime_ns"] != stat.st_mtime_ns
+        or index.get("has_header") != has_header
+        or index.get("sep") != sep
+    ):
+        index = build_row_index(file_path, has_header=has_header, sep=sep)
+    return index
+
+
+def _read_records(f, skip, count, blank=_WHITESPACE):
+    """
+    Read count records after skipping skip records, honouring quotes
+
+    Blank records are passed over without being counted.
+    """
+    records = []
+    in_quotes = False
+    current = []
+    while len(records) < skip + count:
+        line = f.readline()
+        if not line:
+            break
+        current.append(line)
+        if line.count(b'"') % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            record = b"".join(current)
+            if record.strip(blank + b"\n"):
+                records.append(record)
+            current = []
+    if current and b"".join(current).strip(blank + b"\n"):
+        records.append(b"".join(current))
+    return records[skip : skip + count]
+
+
+def read_rows(file_path, offset, limit, read_options=None):
+    """
+    Read a window of rows from a delimited file using its row index
+
+    Args:
+        file_path (str): CSV or TXT dataset file
+        offset (int): Index of the first data row to return
+        limit (int): Maximum number of rows to return
+        read_options (dict): read_csv arguments; TXT files are sniffed when
+            not given
+
+    Returns:
+        tuple: (DataFrame of the rows, total number of data rows)
+    """
+    if read_options is None:
+        read_options = default_read_options(file_path) or {}
+    has_header = read_options.get("header", 0) is not None
+    sep = read_options.get("sep", ",")
+    index = load_row_index(file_path, has_header, sep)
+    stride = index["stride"]
+    block = offset // stride
+    with open(file_path, "rb") as f:
+        header = f.read(index["header_end"])
+        if offset >= index["row_count"] or limit <= 0:
+            body = b""
+        else:
+            f.seek(index["offsets"][block])
+            records = _read_records(
+                f, offset - block * stride, limit, _blank_bytes(sep)
+            )
+            body = b"".join(records)
+    if body and not body.endswith(b"\n"):
+        body += b"\n"
+    df = pd.read_csv(io.BytesIO(header + body), **read_options)
+    return df, index["row_count"]
+
+
+def remove_row_index(file_path):
+    """Delete the row index of a file, and any unfinished writes of it"""
+    for path in glob.glob(f"{glob.escape(_index_path(file_path))}*"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
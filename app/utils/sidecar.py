@@ -0,0 +1,204 @@
+"""
+Columnar sidecar files for parsed datasets
+
+Each uploaded file is parsed once and the resulting DataFrame saved next to
+it, with its dtypes, so later loads skip CSV/Excel/JSON parsing. Sidecars
+use the Arrow IPC (Feather) format, read with memory mapping; pyarrow is a
+declared dependency, and pickle is only a fallback for environments without
+it. A small JSON file records the source file's size, modification time and
+hash; the sidecar is rebuilt when the source changes. Workbooks get one sidecar per sheet.
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import pandas as pd
+
+# Bump when the sidecar layout changes so old sidecars are rebuilt
+SIDECAR_VERSION = 1
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - depends on installed packages
+    feather = None
+
+
+def _prefix(file_path, part=None):
+    # Workbooks keep one sidecar per sheet, named by part
+    return f"{file_path}.{part}" if part else file_path
+
+
+def _meta_path(file_path, part=None):
+    return f"{_prefix(file_path, part)}.cache.json"
+
+
+def _data_path(file_path, fmt, part=None):
+    return f"{_prefix(file_path, part)}.cache.{fmt}"
+
+
+def file_hash(file_path, block_size=1 << 20):
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_meta(file_path, part=None):
+    try:
+        with open(_meta_path(file_path, part), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _temp_path(path):
+    """Create a uniquely named file next to path, so writers never share one"""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    os.close(fd)
+    return tmp_path
+
+
+def _write_json(path, data):
+    """Write JSON atomically so readers never see a partial file"""
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def sidecar_meta(file_path, part=None):
+    """
+    Return the sidecar metadata if the sidecar matches the source file
+
+    The size and modification time are checked first. When only the
+    modification time differs, the file is hashed to tell a touched file
+    from a changed one.
+
+    Returns:
+        dict: Sidecar metadata, or None if there is no usable sidecar
+    """
+    meta = _read_meta(file_path, part)
+    if not meta or meta.get("version") != SIDECAR_VERSION:
+        return None
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    if not os.path.exists(_data_path(file_path, meta["format"], part)):
+        return None
+    if stat.st_size != meta["size"]:
+        return None
+    if stat.st_mtime_ns != meta["mtime_ns"]:
+        if file_hash(file_path) != meta["sha256"]:
+            return None
+        # Same content, so remember the new timestamp and skip hashing next time
+        meta["mtime_ns"] = stat.st_mtime_ns
+        try:
+            _write_json(_meta_path(file_path, part), meta)
+        except OSError as e:
+            # The sidecar is still valid; the file is just hashed again next time
+            logging.info(f"Could not update sidecar metadata for {file_path}: {e}")
+    return meta
+
+
+def read_sidecar(file_path, columns=None, part=None):
+    """
+    Load the DataFrame saved for a source file
+
+    Args:
+        file_path (str): Source file path
+        columns (list): Columns to load; Feather sidecars read only these
+        part (str): Name of the sidecar for one sheet of a workbook
+
+    Returns:
+        DataFrame: The parsed dataset, or None if the sidecar is missing or stale
+    """
+    from app.utils import string_columns
+
+    meta = sidecar_meta(file_path, part)
+    if meta is None:
+        return None
+    path = _data_path(file_path, meta["format"], part)
+    try:
+        if meta["format"] == "feather":
+            if feather is None:
+                return None
+            return feather.read_feather(path, columns=columns, memory_map=True)
+        # Sidecars written before labels were normalized may hold integers
+        df = string_columns(pd.read_pickle(path))
+        return df[columns] if columns is not None else df
+    except Exception as e:
+        logging.warning(f"Could not read dataset sidecar {path}: {e}")
+        return None
+
+
+def write_sidecar(file_path, df, part=None, sha256=None):
+    """
+    Save a parsed DataFrame next to its source file
+
+    Args:
+        file_path (str): Source file path
+        df (DataFrame): Parsed dataset
+        part (str): Name of the sidecar for one sheet of a workbook
+        sha256 (str): Hash of the source file, if already computed
+
+    Returns:
+        dict: Metadata of the written sidecar, or None if it could not be saved
+    """
+    stat = os.stat(file_path)
+    meta = {
+        "version": SIDECAR_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256 or file_hash(file_path),
+        "rows": len(df),
+        "dtypes": {str(column): str(dtype) for column, dtype in df.dtypes.items()},
+    }
+
+    # Feather needs string column names and a default index; anything it
+    # cannot store is pickled instead
+    frame = df.reset_index(drop=True)
+    formats = ["pickle"]
+    if feather is not None and all(isinstance(c, str) for c in frame.columns):
+        formats.insert(0, "feather")
+
+    for fmt in formats:
+        path = _data_path(file_path, fmt, part)
+        tmp_path = None
+        try:
+            tmp_path = _temp_path(path)
+            if fmt == "feather":
+                feather.write_feather(frame, tmp_path)
+            else:
+                frame.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.info(f"Could not write {fmt} sidecar for {file_path}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            continue
+        meta["format"] = fmt
+        _write_json(_meta_path(file_path, part), meta)
+        return meta
+    return None
+
+
+def remove_sidecar(file_path):
+    """Delete every sidecar file belonging to a source file"""
+    for path in glob.glob(f"{glob.escape(file_path)}.*cache.*"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,146 @@
+"""
+Dialect sniffing for delimited text datasets
+
+pandas can detect a delimiter itself (``sep=None``), but only with its
+pure-Python parser. Instead the encoding, delimiter, quote character and
+header row are detected once from a bounded sample at the start of the file,
+and the file is then parsed with the C engine using explicit arguments.
+Files without a header row get the names ``column_0``, ``column_1``, ...
+
+Only ASCII-compatible encodings are detected, since the row index scans the
+raw bytes for newlines and quotes.
+"""
+import csv
+
+# Bytes read from the start of a file to detect its dialect
+SNIFF_SAMPLE_BYTES = 64 * 1024
+# Lines of the sample used to score delimiter candidates
+SNIFF_SAMPLE_LINES = 50
+
+DELIMITERS = (",", "\t", ";", "|")
+ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
+
+def _decode(sample):
+    """Return (text, encoding) for the first encoding that decodes the sample"""
+    if sample.startswith(b"\xef\xbb\xbf"):
+        return sample[3:].decode("utf-8", errors="replace"), "utf-8-sig"
+    for encoding in ENCODINGS:
+        try:
+            return sample.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    return sample.decode("latin-1"), "latin-1"  # pragma: no cover
+
+
+def _split_fields(line, delimiter, quotechar):
+    return next(csv.reader([line], delimiter=delimiter, quotechar=quotechar), [])
+
+
+def _guess_delimiter(lines):
+    """
+    Pick the delimiter that splits the sample lines most consistently
+
+    Each candidate is scored by the share of lines whose field count equals
+    the most common count, weighted towards candidates producing more fields.
+    """
+    best, best_score = ",", (0.0, 0)
+    for delimiter in DELIMITERS:
+        counts = [len(_split_fields(line, delimiter, '"')) for line in lines]
+        most_common = max(set(counts), key=counts.count)
+        if most_common < 2:
+            continue
+        score = (counts.count(most_common) / len(counts), most_common)
+        if score > best_score:
+            best, best_score = delimiter, score
+    return best
+
+
+def _is_number(value):
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _has_header(lines, delimiter, quotechar):
+    """
+    A file has a header unless its first line looks like the data below it
+
+    The first line is treated as data only when every field is numeric, or
+    when each column that is numeric in the following lines is also numeric
+    in the first line.
+    """
+    first = _split_fields(lines[0], delimiter, quotechar)
+    if first and all(_is_number(value) for value in first):
+        return False
+    rows = [_split_fields(line, delimiter, quotechar) for line in lines[1:]]
+    rows = [row for row in rows if len(row) == len(first)]
+    if not rows:
+        return True
+    numeric_columns = [
+        i
+        for i in range(len(first))
+        if all(_is_number(row[i]) for row in rows if row[i] != "")
+        and any(row[i] != "" for row in rows)
+    ]
+    if not numeric_columns:
+        return True
+    return not all(_is_number(first[i]) for i in numeric_columns)
+
+
+def sniff_read_options(file_path, sample_bytes=SNIFF_SAMPLE_BYTES):
+    """
+    Detect the dialect of a delimited text file from a bounded sample
+
+    Args:
+        file_path (str): Path of the text file
+        sample_bytes (int): Bytes read from the start of the file
+
+    Returns:
+        dict: pandas.read_csv arguments (sep, header, encoding, quotechar,
+            engine, and names for files without a header) that are JSON
+            serializable
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_bytes)
+    # Drop a partial last line, which may also cut a multi-byte character
+    if len(sample) == sample_bytes and b"\n" in sample:
+        sample = sample[: sample.rindex(b"\n")]
+    text, encoding = _decode(sample)
+    lines = [line for line in text.splitlines() if line.strip()]
+    lines = lines[:SNIFF_SAMPLE_LINES]
+
+    options = {"sep": ",", "header": 0, "encoding": encoding, "engine": "c"}
+    if not lines:
+        return options
+
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines), delimiters="".join(DELIMITERS))
+        delimiter, quotechar = dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        delimiter, quotechar = _guess_delimiter(lines), '"'
+
+    options["sep"] = delimiter
+    options["quotechar"] = quotechar
+    if not _has_header(lines, delimiter, quotechar):
+        # Named like pandas would label them, but as strings, so the columns
+        # can be requested by name like those of any other file
+        width = max(len(_split_fields(line, delimiter, quotechar)) for line in lines)
+        options["header"] = None
+        options["names"] = [f"column_{i}" for i in range(width)]
+    return options
+
+
+def default_read_options(file_path):
+    """
+    Return read_csv arguments for a file, sniffing text files
+
+    Returns:
+        dict: read_csv arguments, or None for formats other than TXT
+    """
+    ext = file_path.rsplit(".", 1)[1].lower() if "." in file_path else ""
+    if ext == "txt":
+        return sniff_read_options(file_path)
+    return None
@@ -1,4 +1,5 @@
 from flask import current_app
+from app.extensions import get_gemini_api
 
 
 def analyze_sentiment(text):
@@ -11,9 +12,7 @@ def analyze_sentiment(text):
     Returns:
         dict: Dictionary containing sentiment analysis results
     """
-    gemini = current_app.config.get("GEMINI_INSTANCE")
-    if not gemini:
-        return {"error": "Gemini API instance not initialized"}
+    gemini = get_gemini_api()
 
     try:
         result = gemini.analyze_text(text)
@@ -36,9 +35,7 @@ def extract_keywords(text):
     Returns:
         dict: Dictionary containing keyword extraction results
     """
-    gemini = current_app.config.get("GEMINI_INSTANCE")
-    if not gemini:
-        return {"error": "Gemini API instance not initialized"}
+    gemini = get_gemini_api()
 
     try:
         result = gemini.analyze_text(text)
@@ -62,9 +59,7 @@ def summarize_text(text, max_words=50):
     Returns:
         dict: Dictionary containing text summarization results
     """
-    gemini = current_app.config.get("GEMINI_INSTANCE")
-    if not gemini:
-        return {"error": "Gemini API instance not initialized"}
+    gemini = get_gemini_api()
 
     try:
         # Include max_words parameter in the request
@@ -90,9 +85,7 @@ def classify_text(text, categories=None):
     Returns:
         dict: Dictionary containing text classification results
     """
-    gemini = current_app.config.get("GEMINI_INSTANCE")
-    if not gemini:
-        return {"error": "Gemini API instance not initialized"}
+    gemini = get_gemini_api()
 
     try:
         # If categories are provided, include them in the prompt
@@ -0,0 +1,123 @@
+"""
+One-time conversion of Excel workbooks into per-sheet sidecars
+
+read_excel is among the slowest pandas parsers, so each workbook is parsed
+once, after upload, and every sheet is saved as its own columnar sidecar.
+A sheet catalog (``<file>.sheets.cache.json``) lists the sheet names, row
+counts and columns. Later reads load only the requested sheet from its
+sidecar and never call the Excel parser again until the file changes.
+"""
+import json
+import logging
+import os
+
+import pandas as pd
+
+from app.utils.sidecar import _write_json, file_hash, read_sidecar, write_sidecar
+
+EXCEL_EXTENSIONS = {"xlsx", "xls"}
+
+# Bump when the catalog layout changes so workbooks are converted again
+CATALOG_VERSION = 1
+
+
+def _catalog_path(file_path):
+    return f"{file_path}.sheets.cache.json"
+
+
+def _sheet_part(index):
+    return f"sheet{index}"
+
+
+def convert_workbook(file_path):
+    """
+    Parse every sheet of a workbook once and save per-sheet sidecars
+
+    Returns:
+        dict: The sheet catalog
+    """
+    stat = os.stat(file_path)
+    sha256 = file_hash(file_path)
+    sheets = pd.read_excel(file_path, sheet_name=None)
+
+    catalog = {
+        "version": CATALOG_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sheets": [],
+    }
+    for index, (name, df) in enumerate(sheets.items()):
+        if write_sidecar(file_path, df, _sheet_part(index), sha256) is None:
+            raise OSError(f"Could not save sheet {name!r} of {file_path}")
+        catalog["sheets"].append(
+            {
+                "name": str(name),
+                "index": index,
+                "rows": len(df),
+                "columns": [str(col) for col in df.columns],
+            }
+        )
+
+    _write_json(_catalog_path(file_path), catalog)
+    return catalog
+
+
+def read_catalog(file_path):
+    """
+    Return the sheet catalog if it matches the workbook
+
+    Returns:
+        dict: Sheet catalog, or None if the workbook has not been converted
+    """
+    try:
+        with open(_catalog_path(file_path), "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+        stat = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+    if (
+        catalog.get("version") != CATALOG_VERSION
+        or catalog["size"] != stat.st_size
+        or catalog["mtime_ns"] != stat.st_mtime_ns
+    ):
+        return None
+    return catalog
+
+
+def sheet_catalog(file_path):
+    """Return the sheet catalog, converting the workbook if needed"""
+    return read_catalog(file_path) or convert_workbook(file_path)
+
+
+def load_sheet(file_path, sheet=None, columns=None):
+    """
+    Load one sheet of a workbook from its sidecar
+
+    Args:
+        file_path (str): Path of the workbook
+        sheet (str): Sheet name; the first sheet when not given
+        columns (list): Columns to load; None loads all of them
+
+    Returns:
+        tuple: (DataFrame or None, error message or None)
+    """
+    try:
+        catalog = sheet_catalog(file_path)
+        entries = catalog["sheets"]
+        if sheet is not None:
+            entries = [entry for entry in entries if entry["name"] == sheet]
+        if not entries:
+            return None, f"Sheet not found: {sheet}"
+        part = _sheet_part(entries[0]["index"])
+
+        df = read_sidecar(file_path, columns, part)
+        if df is None:
+            # A sidecar went missing or is unreadable, so convert again
+            logging.info(f"Converting workbook {file_path} again")
+            convert_workbook(file_path)
+            df = read_sidecar(file_path, columns, part)
+        if df is None:
+            return None, "Error loading dataset: sheet could not be read"
+        return df, None
+    except Exception as e:
+        return None, f"Error loading dataset: {str(e)}"
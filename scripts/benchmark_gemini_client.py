@@ -0,0 +1,76 @@
+"""
+Benchmark the pooled Gemini client against one-off requests.post calls.
+
+Starts a local stand-in for the generateContent endpoint and measures the
+per-call latency of both approaches. The server sleeps once per new
+connection to model the TCP + TLS handshake paid without keep-alive.
+
+Usage:
+    python scripts/benchmark_gemini_client.py --calls 200 --handshake-ms 30
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+# Add the parent directory to the sys.path
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, parent_dir)
+
+from app.extensions import GeminiAPI  # noqa: E402
+from scripts.fake_gemini_server import FakeGeminiServer  # noqa: E402
+
+
+def time_calls(call, count):
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def summarize(name, latencies):
+    """Print latency statistics for one client"""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<22} mean {statistics.mean(ordered):7.2f} ms  "
+        f"p50 {statistics.median(ordered):7.2f} ms  p95 {p95:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(handshake_ms=args.handshake_ms).start()
+    base_url = server.base_url
+
+    client = GeminiAPI(api_key="benchmark", base_url=base_url)
+    url = f"{base_url}/models/{client.model}:generateContent"
+    payload = {"contents": [{"role": "user", "parts": [{"text": "benchmark"}]}]}
+
+    unpooled = time_calls(
+        lambda: requests.post(url, json=payload, timeout=(5, 60)).json(), args.calls
+    )
+    pooled = time_calls(lambda: client.generate_content("benchmark"), args.calls)
+
+    print(f"{args.calls} calls, simulated handshake {args.handshake_ms:.0f} ms")
+    summarize("requests.post", unpooled)
+    summarize("pooled GeminiAPI", pooled)
+    saved = statistics.mean(unpooled) - statistics.mean(pooled)
+    print(f"Latency saved per call: {saved:.2f} ms")
+
+    client.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
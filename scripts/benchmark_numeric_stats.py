@@ -0,0 +1,92 @@
+"""
+Benchmark the fused numeric statistics kernel against DataFrame.describe().
+
+Builds wide and tall synthetic box score frames and times the previous
+profile statistics (describe() over all numeric columns, then max, min,
+mean and median again for the first three) against
+app.datasets.numeric_stats.describe_numeric, checking that both agree.
+
+Usage:
+    python scripts/benchmark_numeric_stats.py --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the sys.path
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, parent_dir)
+
+from app.datasets.numeric_stats import describe_numeric  # noqa: E402
+
+SHAPES = {
+    "tall": (2_000_000, 8),
+    "wide": (20_000, 500),
+}
+
+
+def make_frame(rows, columns, seed=0):
+    """Mix of integer counts and float rates, with some missing values"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        if i % 2:
+            data[f"stat{i}"] = rng.poisson(8, rows)
+        else:
+            values = rng.normal(24, 8, rows)
+            values[rng.random(rows) < 0.05] = np.nan
+            data[f"stat{i}"] = values
+    return pd.DataFrame(data)
+
+
+def previous_statistics(df, columns):
+    """describe() followed by the separate insight reductions"""
+    stats = df[columns].describe().to_dict()
+    for col in columns[:3]:
+        df[col].max(), df[col].min(), df[col].mean(), df[col].median()
+    return stats
+
+
+def best_time(run, repeat):
+    """Return the fastest of repeat runs in seconds, and the last result"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, (rows, columns) in SHAPES.items():
+        df = make_frame(rows, columns)
+        numeric = df.columns.tolist()
+        old_s, expected = best_time(
+            lambda: previous_statistics(df, numeric), args.repeat
+        )
+        new_s, actual = best_time(lambda: describe_numeric(df, numeric), args.repeat)
+
+        error = max(
+            abs(expected[col][stat] - actual[col][stat])
+            / max(abs(expected[col][stat]), 1.0)
+            for col in numeric
+            for stat in expected[col]
+        )
+        print(f"{name}: {rows} rows x {columns} columns")
+        print(f"  {'describe() + insights':<24} {old_s:7.3f} s")
+        print(
+            f"  {'fused kernel':<24} {new_s:7.3f} s  ({old_s / new_s:.1f}x faster, "
+            f"max relative difference {error:.1e})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark parsing of TXT datasets with sniffed options against sep=None.
+
+Writes a tab-delimited player stat export and times pandas' Python-engine
+delimiter detection against the C engine called with the options detected
+by app.utils.sniffer, checking that both produce the same DataFrame.
+
+Usage:
+    python scripts/benchmark_txt_parsing.py --rows 500000 --repeat 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the sys.path
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, parent_dir)
+
+from app.utils.sniffer import sniff_read_options  # noqa: E402
+
+TEAMS = ["Perth Wildcats", "Sydney Kings", "Melbourne United", "Cairns Taipans"]
+POSITIONS = ["PG", "SG", "SF", "PF", "C"]
+
+
+def write_stat_export(path, rows, seed=0):
+    """Write a tab-delimited box score export with rows player-games"""
+    rng = np.random.default_rng(seed)
+    pd.DataFrame(
+        {
+            "player": [f"Player {i % 5000}" for i in range(rows)],
+            "team": rng.choice(TEAMS, rows),
+            "position": rng.choice(POSITIONS, rows),
+            "minutes": rng.normal(24, 8, rows).clip(0, 48).round(1),
+            "points": rng.poisson(11, rows),
+            "rebounds": rng.poisson(5, rows),
+            "assists": rng.poisson(3, rows),
+            "fg_pct": rng.random(rows).round(3),
+        }
+    ).to_csv(path, sep="\t", index=False)
+
+
+def best_time(parse, repeat):
+    """Return the fastest of repeat runs in seconds, and the last result"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        df = parse()
+        timings.append(time.perf_counter() - started)
+    return min(timings), df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "stats.txt")
+        write_stat_export(path, args.rows)
+        size_mb = os.path.getsize(path) / 1024**2
+        print(f"{args.rows} rows, {size_mb:.1f} MiB tab-delimited")
+
+        started = time.perf_counter()
+        options = sniff_read_options(path)
+        sniff_ms = (time.perf_counter() - started) * 1000
+        print(f"Sniffed {options} in {sniff_ms:.1f} ms")
+
+        python_s, python_df = best_time(
+            lambda: pd.read_csv(path, sep=None, engine="python"), args.repeat
+        )
+        c_s, c_df = best_time(lambda: pd.read_csv(path, **options), args.repeat)
+
+    print(f"{'sep=None, python engine':<26} {python_s:7.2f} s")
+    print(f"{'sniffed, C engine':<26} {c_s:7.2f} s  ({python_s / c_s:.1f}x faster)")
+    pd.testing.assert_frame_equal(python_df, c_df)
+    print("Both parsers produced identical DataFrames")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ import os
 # Add the parent directory to the sys.path
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, parent_dir)
+# Only loading is checked, so no job workers are needed
+os.environ.setdefault("JOB_QUEUE_AUTOSTART", "false")
 
 from app import create_app  # noqa: E402
 
@@ -0,0 +1,249 @@
+"""
+Local stand-in for the Gemini generateContent API.
+
+Answers generateContent and streamGenerateContent requests with a scout
+report in the same response shape as Gemini, after a configurable delay.
+A share of requests can be failed with 500 or 429 responses to exercise
+retries, the circuit breaker and the rate limiter.
+
+Point the app at it by setting GEMINI_API_BASE_URL to the printed URL.
+
+Usage:
+    python scripts/fake_gemini_server.py --port 8765 --latency-ms 800 \
+        --jitter-ms 300 --error-rate 0.02 --rate-limit-rate 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCOUT_REPORT = {
+    "player_name": "Jane Doe",
+    "position": "Guard",
+    "team": "Perth Wildcats",
+    "strengths": ["Court vision", "Pick-and-roll passing", "Transition speed"],
+    "weaknesses": ["Finishing through contact", "Off-ball defense"],
+    "development_areas": ["Catch-and-shoot threes", "Lower body strength"],
+    "summary": (
+        "Jane Doe is a quick, pass-first guard who controls tempo and creates "
+        "good looks for teammates out of the pick-and-roll.\n\n"
+        "She needs to add strength to finish through contact and stay engaged "
+        "off the ball on defense."
+    ),
+    "offensive_rating": 82,
+    "defensive_rating": 71,
+    "physical_rating": 76,
+    "technical_rating": 80,
+    "potential_rating": 86,
+    "overall_rating": 79,
+}
+
+
+def _response(text):
+    """Wrap generated text in a generateContent response body"""
+    return {
+        "candidates": [
+            {
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "finishReason": "STOP",
+            }
+        ]
+    }
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """Answers generateContent and streamGenerateContent POST requests"""
+
+    protocol_version = "HTTP/1.1"  # Allow keep-alive connections
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        server.count("requests")
+
+        if ":generateContent" not in self.path and (
+            ":streamGenerateContent" not in self.path
+        ):
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+            return
+
+        time.sleep(server.sample_latency())
+
+        roll = random.random()
+        if roll < server.error_rate:
+            server.count("errors")
+            self._send_json(500, {"error": {"code": 500, "message": "Internal"}})
+            return
+        if roll < server.error_rate + server.rate_limit_rate:
+            server.count("rate_limited")
+            self._send_json(
+                429,
+                {"error": {"code": 429, "message": "Resource exhausted"}},
+                {"Retry-After": str(server.retry_after)},
+            )
+            return
+
+        output = json.dumps(server.report)
+        if ":streamGenerateContent" in self.path:
+            self._send_stream(output)
+        else:
+            self._send_json(200, _response(output))
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, output):
+        """Send the output as server-sent events, a few words per event"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        size = self.server.stream_chunk_chars
+        for start in range(0, len(output), size):
+            event = json.dumps(_response(output[start : start + size]))
+            self.wfile.write(f"data: {event}\r\n\r\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.server.stream_interval)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    """Threaded HTTP server with configurable latency and failure rates"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        latency_ms=0.0,
+        jitter_ms=0.0,
+        distribution="normal",
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        retry_after=1,
+        handshake_ms=0.0,
+        stream_chunk_chars=24,
+        stream_interval_ms=20.0,
+        report=None,
+    ):
+        """
+        Args:
+            address (tuple): Host and port to listen on, port 0 picks a free one
+            latency_ms (float): Typical response delay
+            jitter_ms (float): Spread of the delay, standard deviation for the
+                normal distribution and half-width for uniform
+            distribution (str): "fixed", "uniform", "normal" or "lognormal"
+            error_rate (float): Share of requests answered with a 500
+            rate_limit_rate (float): Share of requests answered with a 429
+            retry_after (int): Retry-After seconds sent with 429 responses
+            handshake_ms (float): Delay added once per new connection
+            stream_chunk_chars (int): Characters per streamed event
+            stream_interval_ms (float): Delay between streamed events
+            report (dict): Scout report returned as the model output
+        """
+        super().__init__(address, FakeGeminiHandler)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.handshake_delay = handshake_ms / 1000
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_interval = stream_interval_ms / 1000
+        self.report = report or SCOUT_REPORT
+        self.counters = {"requests": 0, "errors": 0, "rate_limited": 0}
+        self._counter_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Value for GEMINI_API_BASE_URL"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+    def count(self, name):
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    def sample_latency(self):
+        """Draw one response delay in seconds"""
+        if self.distribution == "uniform":
+            delay = random.uniform(
+                self.latency - self.jitter, self.latency + self.jitter
+            )
+        elif self.distribution == "normal":
+            delay = random.gauss(self.latency, self.jitter)
+        elif self.distribution == "lognormal" and self.latency > 0:
+            # Long right tail with the given median, like real model latency
+            sigma = self.jitter / self.latency if self.jitter else 0.5
+            delay = self.latency * random.lognormvariate(0, sigma)
+        else:
+            delay = self.latency
+        return max(delay, 0.0)
+
+    def process_request_thread(self, request, client_address):
+        time.sleep(self.handshake_delay)
+        super().process_request_thread(request, client_address)
+
+    def start(self):
+        """Serve in a daemon thread and return the server"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=200.0)
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "uniform", "normal", "lognormal"],
+        default="lognormal",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(
+        (args.host, args.port),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+    )
+    print(f"Fake Gemini API listening, set GEMINI_API_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {server.counters}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+End-to-end load test of the upload -> analysis -> visualize path.
+
+Runs the real app in-process against the local fake Gemini server, with a
+temporary database and upload folder, and drives it with concurrent users.
+Each user uploads a scout report, waits for its analysis on the status
+long-poll endpoint, fetches the analysis and opens the visualization page.
+Throughput and p50/p95/p99 latency are reported per step, so worker and
+pool sizes can be chosen without calling the real API.
+
+Usage:
+    python scripts/load_test.py --users 16 --duration 60 --workers 4 \
+        --latency-ms 800 --jitter-ms 300 --error-rate 0.01
+"""
+import argparse
+import logging
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import requests
+from werkzeug.serving import make_server
+
+# Add the parent directory to the sys.path
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, parent_dir)
+
+from app import create_app  # noqa: E402
+from app.config import DevelopmentConfig, config_by_name  # noqa: E402
+from app.extensions import db, job_queue  # noqa: E402
+from scripts.fake_gemini_server import FakeGeminiServer  # noqa: E402
+
+PASSWORD = "load-test-password"
+
+REPORT_TEXT = """Scout report {marker}
+
+Jane Doe is a quick, pass-first guard with excellent court vision. She runs
+the pick-and-roll well, pushes the ball in transition and makes good
+decisions under pressure. Her jump shot is inconsistent off the catch and
+she struggles to finish through contact at the rim.
+
+Defensively she is active on the ball but loses track of cutters when
+playing off the ball. Adding lower body strength should help her absorb
+contact and hold position in the post.
+"""
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return float("nan")
+    index = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class Recorder:
+    """Thread-safe store of per-step latencies and errors"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, step, seconds, ok=True):
+        with self._lock:
+            if ok:
+                self.latencies[step].append(seconds * 1000)
+            else:
+                self.errors[step] += 1
+
+    def report(self, elapsed):
+        """Print one line of statistics per step"""
+        print(
+            f"{'step':<20}{'ok':>7}{'err':>6}{'req/s':>9}"
+            f"{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)"
+        )
+        for step in sorted(set(self.latencies) | set(self.errors)):
+            ordered = sorted(self.latencies[step])
+            mean = statistics.mean(ordered) if ordered else float("nan")
+            print(
+                f"{step:<20}{len(ordered):>7}{self.errors[step]:>6}"
+                f"{len(ordered) / elapsed:>9.2f}{mean:>10.1f}"
+                f"{percentile(ordered, 0.50):>10.1f}"
+                f"{percentile(ordered, 0.95):>10.1f}"
+                f"{percentile(ordered, 0.99):>10.1f}"
+            )
+
+
+def build_app(args, workdir, gemini_base_url):
+    """Create the app with a throwaway database pointed at the fake API"""
+
+    class LoadTestConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = args.database_url or (
+            "sqlite:///" + os.path.join(workdir, "load_test.db")
+        )
+        UPLOAD_FOLDER = os.path.join(workdir, "uploads")
+        WTF_CSRF_ENABLED = False
+        GEMINI_API_KEY = "load-test"
+        GEMINI_API_BASE_URL = gemini_base_url
+        GEMINI_RATE_LIMIT_PER_MINUTE = args.rate_limit_per_minute
+        GEMINI_RATE_LIMIT_BURST = max(args.users, 10)
+        JOB_WORKER_THREADS = args.workers
+        JOB_POLL_INTERVAL = 0.5
+
+    config_by_name["load_test"] = LoadTestConfig
+    app = create_app("load_test")
+    app.logger.setLevel(logging.ERROR)
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    return app
+
+
+def create_users(app, count):
+    """Create verified users directly, skipping email verification"""
+    from app.models.user import User
+
+    names = []
+    with app.app_context():
+        for index in range(count):
+            name = f"loadtest{index}"
+            user = User.query.filter_by(username=name).first()
+            if user is None:
+                user = User(
+                    username=name, email=f"{name}@example.com", is_verified=True
+                )
+                user.set_password(PASSWORD)
+                db.session.add(user)
+            names.append(name)
+        db.session.commit()
+    return names
+
+
+def find_dataset_id(app, title):
+    """Look up the dataset created by an upload"""
+    from app.models.dataset import Dataset
+
+    with app.app_context():
+        dataset = Dataset.query.filter_by(title=title).first()
+        return dataset.id if dataset else None
+
+
+def timed(recorder, step, call, ok_statuses=(200,)):
+    """Run one request, record its latency and return the response"""
+    started = time.perf_counter()
+    try:
+        response = call()
+    except requests.RequestException:
+        recorder.add(step, time.perf_counter() - started, ok=False)
+        return None
+    ok = response.status_code in ok_statuses
+    recorder.add(step, time.perf_counter() - started, ok=ok)
+    return response if ok else None
+
+
+def run_user(app, base_url, username, deadline, recorder, flows):
+    """Repeat the upload -> analysis -> visualize flow until the deadline"""
+    session = requests.Session()
+    session.post(
+        f"{base_url}/auth/login", data={"username": username, "password": PASSWORD}
+    )
+
+    while time.monotonic() < deadline:
+        title = f"{username}-{uuid.uuid4().hex[:12]}"
+        # Unique content per upload so the analysis cache is not hit
+        report = REPORT_TEXT.format(marker=title).encode("utf-8")
+        flow_started = time.perf_counter()
+
+        response = timed(
+            recorder,
+            "upload",
+            lambda: session.post(
+                f"{base_url}/datasets/upload",
+                data={"title": title},
+                files={"file": (f"{title}.txt", report, "text/plain")},
+                allow_redirects=False,
+            ),
+            ok_statuses=(302,),
+        )
+        dataset_id = find_dataset_id(app, title) if response is not None else None
+        if dataset_id is None:
+            continue
+
+        status = "pending"
+        while status in ("pending", "processing") and time.monotonic() < deadline + 60:
+            response = timed(
+                recorder,
+                "status_long_poll",
+                lambda: session.get(
+                    f"{base_url}/api/scout-analysis/{dataset_id}/status",
+                    params={"status": status, "wait": 25},
+                ),
+            )
+            if response is None:
+                break
+            status = response.json()["processing_status"]
+        recorder.add(
+            "upload_to_analysis",
+            time.perf_counter() - flow_started,
+            ok=status == "completed",
+        )
+
+        timed(
+            recorder,
+            "analysis_fetch",
+            lambda: session.get(f"{base_url}/api/scout-analysis/{dataset_id}"),
+        )
+        timed(
+            recorder,
+            "visualize",
+            lambda: session.get(f"{base_url}/visualize/{dataset_id}"),
+        )
+        recorder.add("full_flow", time.perf_counter() - flow_started)
+        flows.append(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=8, help="Concurrent users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--workers", type=int, default=4, help="Job worker threads")
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=200.0)
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "uniform", "normal", "lognormal"],
+        default="lognormal",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-per-minute", type=int, default=6000)
+    parser.add_argument(
+        "--database-url", help="Database to use instead of a temporary SQLite file"
+    )
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="load_test_")
+    gemini = FakeGeminiServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    ).start()
+
+    try:
+        app = build_app(args, workdir, gemini.base_url)
+        usernames = create_users(app, args.users)
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+        print(
+            f"{args.users} users for {args.duration:.0f}s, {args.workers} job "
+            f"workers, Gemini latency {args.latency_ms:.0f} ms "
+            f"({args.distribution}, jitter {args.jitter_ms:.0f} ms)"
+        )
+        recorder = Recorder()
+        flows = []
+        started = time.monotonic()
+        deadline = started + args.duration
+        threads = [
+            threading.Thread(
+                target=run_user,
+                args=(app, base_url, name, deadline, recorder, flows),
+                daemon=True,
+            )
+            for name in usernames
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        print(f"\nCompleted flows: {len(flows)} ({len(flows) / elapsed:.2f}/s)")
+        recorder.report(elapsed)
+        print(f"\nFake Gemini: {gemini.counters}")
+        with app.app_context():
+            from app.extensions import get_gemini_api
+
+            print(f"Gemini client: {get_gemini_api().state()}")
+
+        server.shutdown()
+        job_queue.stop(5)
+    finally:
+        gemini.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -134,6 +134,79 @@ function fetchScoutAnalysis(datasetId) {
         });
 }
 
+/**
+ * Follow analysis progress over Server-Sent Events, showing the summary as it is generated
+ */
+function streamScoutAnalysis(datasetId) {
+    // Fall back to long-polling in browsers without EventSource
+    if (!window.EventSource) {
+        waitForStatusChange(datasetId, 'pending');
+        return;
+    }
+
+    const source = new EventSource(`/api/scout-analysis/${datasetId}/stream`);
+    const liveSummary = document.getElementById('scout-live-summary');
+    const liveText = liveSummary ? liveSummary.querySelector('p') : null;
+    let finished = false;
+
+    source.addEventListener('started', () => {
+        // A retried job streams the summary again from the beginning
+        if (liveText) liveText.textContent = '';
+    });
+
+    source.addEventListener('delta', event => {
+        if (!liveText) return;
+        liveSummary.classList.remove('d-none');
+        liveText.textContent += JSON.parse(event.data).text;
+    });
+
+    const finish = event => {
+        finished = true;
+        source.close();
+        renderScoutAnalysis(JSON.parse(event.data));
+    };
+    source.addEventListener('complete', finish);
+    source.addEventListener('failed', finish);
+
+    source.addEventListener('timeout', () => {
+        finished = true;
+        source.close();
+        fetchScoutAnalysis(datasetId);
+    });
+
+    source.onerror = () => {
+        // Stop automatic reconnects and long-poll for the result instead
+        if (finished) return;
+        finished = true;
+        source.close();
+        waitForStatusChange(datasetId, 'processing');
+    };
+}
+
+/**
+ * Long-poll the status endpoint, which answers as soon as the analysis status changes
+ */
+function waitForStatusChange(datasetId, knownStatus) {
+    fetch(`/api/scout-analysis/${datasetId}/status?status=${knownStatus}&wait=25`)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('Failed to load scout report analysis status');
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data.processing_status === 'pending' || data.processing_status === 'processing') {
+                waitForStatusChange(datasetId, data.processing_status);
+            } else {
+                fetchScoutAnalysis(datasetId);
+            }
+        })
+        .catch(error => {
+            console.error('Error waiting for scout analysis:', error);
+            setTimeout(() => fetchScoutAnalysis(datasetId), 5000);
+        });
+}
+
 /**
  * Render the scout report analysis data
  */
@@ -146,9 +219,14 @@ function renderScoutAnalysis(data) {
             <div class="alert alert-info">
                 <i class="fas fa-spinner fa-spin"></i> The scout report is currently being analyzed. Please check back in a moment.
             </div>
+            <div class="card bg-dark text-white border-secondary d-none" id="scout-live-summary">
+                <div class="card-body">
+                    <h6 class="text-muted mb-2">Summary (generating...)</h6>
+                    <p class="mb-0" style="white-space: pre-wrap;"></p>
+                </div>
+            </div>
         `;
-        // Refresh after 5 seconds if still processing
-        setTimeout(() => fetchScoutAnalysis(data.dataset_id), 5000);
+        streamScoutAnalysis(data.dataset_id);
         return;
     }
 
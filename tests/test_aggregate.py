@@ -0,0 +1,173 @@
+import io
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from app import create_app
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.user import User
+from app.utils.aggregate import aggregate_frame, parse_aggregations, parse_filters
+from app.utils.frame_cache import FrameCache, load_dataset_columns
+
+CSV = (
+    b"team,player,points,period\n"
+    b"A,Ann,10,1\nA,Ann,4,2\nB,Bob,7,1\nB,Ben,,2\nC,Cy,20,1\nA,Al,6,1\n"
+)
+
+
+class TestAggregateFrame(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.read_csv(io.BytesIO(CSV))
+
+    def test_sum_per_group_sorted_descending(self):
+        result = aggregate_frame(
+            self.df, ["team"], parse_aggregations(["points:sum", "count"])
+        )
+        self.assertEqual(result["columns"], ["team", "points_sum", "count"])
+        self.assertEqual(
+            result["rows"],
+            [
+                {"team": "A", "points_sum": 20.0, "count": 3},
+                {"team": "C", "points_sum": 20.0, "count": 1},
+                {"team": "B", "points_sum": 7.0, "count": 2},
+            ],
+        )
+        self.assertEqual((result["total_rows"], result["total_groups"]), (6, 3))
+
+    def test_functions_match_pandas(self):
+        specs = [f"points:{name}" for name in ("mean", "median", "min", "max", "count")]
+        result = aggregate_frame(
+            self.df, ["team"], parse_aggregations(specs), sort="team", ascending=True
+        )
+        expected = self.df.groupby("team")["points"]
+        for row in result["rows"]:
+            group = expected.get_group(row["team"])
+            self.assertAlmostEqual(row["points_mean"], group.mean())
+            self.assertAlmostEqual(row["points_median"], group.median())
+            self.assertEqual(row["points_min"], group.min())
+            self.assertEqual(row["points_max"], group.max())
+            self.assertEqual(row["points_count"], group.count())
+
+    def test_filters_and_top_n(self):
+        filters = parse_filters(["period:eq:1", "team:in:A|B"])
+        result = aggregate_frame(
+            self.df, ["player"], parse_aggregations(["points:sum"]), filters, limit=2
+        )
+        self.assertEqual(result["total_rows"], 3)
+        self.assertEqual(result["total_groups"], 3)
+        self.assertEqual([row["player"] for row in result["rows"]], ["Ann", "Bob"])
+
+    def test_without_group_by_returns_one_row(self):
+        filters = parse_filters(["points:gte:7"])
+        result = aggregate_frame(
+            self.df, [], parse_aggregations(["points:mean", "count"]), filters
+        )
+        self.assertEqual(result["rows"], [{"points_mean": 37 / 3, "count": 3}])
+
+    def test_invalid_requests(self):
+        with self.assertRaises(ValueError):
+            parse_aggregations(["points:mode"])
+        with self.assertRaises(ValueError):
+            parse_filters(["points~5"])
+        with self.assertRaises(ValueError):
+            aggregate_frame(self.df, ["period"], parse_aggregations(["team:sum"]))
+        with self.assertRaises(ValueError):
+            aggregate_frame(
+                self.df, ["team"], parse_aggregations(["count"]), sort="points"
+            )
+
+    def test_large_frame_is_reduced_to_groups(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {
+                "team": rng.integers(0, 30, 500_000).astype(str),
+                "points": rng.integers(0, 4, 500_000),
+            }
+        )
+        result = aggregate_frame(df, ["team"], parse_aggregations(["points:sum"]))
+        self.assertEqual(len(result["rows"]), 30)
+        self.assertEqual(
+            sum(row["points_sum"] for row in result["rows"]), df["points"].sum()
+        )
+
+
+class TestAggregateEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="grouper", email="group@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        cache_patch = patch("app.utils.frame_cache.frame_cache", FrameCache(10**7))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "grouper", "password": "password"}
+        )
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Plays", "file": (io.BytesIO(CSV), "plays.csv")},
+            content_type="multipart/form-data",
+        )
+        self.dataset = Dataset.query.one()
+        self.url = f"/api/dataset/{self.dataset.id}/aggregate"
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_aggregate_loads_only_referenced_columns(self):
+        with patch(
+            "app.api.routes.load_dataset_columns", wraps=load_dataset_columns
+        ) as load:
+            response = self.client.get(
+                self.url
+                + "?group_by=team&agg=points:sum&filter=period:eq:1&sort=team&order=asc"
+            )
+        self.assertEqual(load.call_args.args[1], ["team", "points", "period"])
+        data = response.get_json()
+        self.assertEqual(
+            data["rows"],
+            [
+                {"team": "A", "points_sum": 16.0},
+                {"team": "B", "points_sum": 7.0},
+                {"team": "C", "points_sum": 20.0},
+            ],
+        )
+        self.assertEqual(data["group_by"], ["team"])
+        self.assertEqual(data["aggregations"][0]["name"], "points_sum")
+
+    def test_defaults_to_row_count_and_caps_limit(self):
+        self.app.config["AGGREGATE_MAX_GROUPS"] = 2
+        data = self.client.get(self.url + "?group_by=player&limit=100").get_json()
+        self.assertEqual(data["columns"], ["player", "count"])
+        self.assertEqual(len(data["rows"]), 2)
+        self.assertEqual(data["rows"][0], {"player": "Ann", "count": 2})
+        self.assertEqual(data["total_groups"], 5)
+
+    def test_errors(self):
+        response = self.client.get(self.url + "?group_by=coach")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Column not found: coach")
+        response = self.client.get(self.url + "?group_by=team&agg=player:mean")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
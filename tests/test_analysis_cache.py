@@ -0,0 +1,128 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app import create_app
+from app.extensions import GeminiAPI, db
+from app.models.user import User
+from app.scout_analysis.cache import AnalysisCache, make_cache_key
+from app.scout_analysis.models import AnalysisCacheEntry
+from app.scout_analysis.services import ScoutAnalysisService
+
+ANALYSIS = {"player_name": "Cached Player", "overall_rating": 77}
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.app.config.update(GEMINI_API_KEY="test-key")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.cache = AnalysisCache()
+        cache_patch = patch("app.scout_analysis.services.analysis_cache", self.cache)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        api_patch = patch.object(
+            GeminiAPI, "generate_content", return_value=json.dumps(ANALYSIS)
+        )
+        self.generate_content = api_patch.start()
+        self.addCleanup(api_patch.stop)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_repeat_report_skips_api(self):
+        """A re-uploaded report is served from the memory tier"""
+        first = ScoutAnalysisService.analyze_report("Scout report:  Cached Player")
+        second = ScoutAnalysisService.analyze_report("Scout report: Cached Player\n")
+
+        self.assertEqual(first, ANALYSIS)
+        self.assertEqual(second, ANALYSIS)
+        self.assertEqual(self.generate_content.call_count, 1)
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["memory_hits"], 1)
+
+    def test_database_tier_is_shared(self):
+        """Entries survive an empty memory tier, as seen by another worker"""
+        ScoutAnalysisService.analyze_report("Scout report: Cached Player")
+        self.cache.clear_memory()
+
+        result = ScoutAnalysisService.analyze_report("Scout report: Cached Player")
+        self.assertEqual(result, ANALYSIS)
+        self.assertEqual(self.generate_content.call_count, 1)
+        self.assertEqual(self.cache.stats()["db_hits"], 1)
+
+    def test_key_depends_on_prompt_version_and_model(self):
+        """Changing the prompt or model invalidates cached results"""
+        key = make_cache_key("report", "v1", "gemini-2.0-flash")
+        self.assertNotEqual(key, make_cache_key("report", "v2", "gemini-2.0-flash"))
+        self.assertNotEqual(key, make_cache_key("report", "v1", "gemini-2.5-pro"))
+        self.assertEqual(key, make_cache_key("  report ", "v1", "gemini-2.0-flash"))
+
+    def test_expired_entries_are_misses(self):
+        """Entries past their TTL are removed and re-fetched"""
+        ScoutAnalysisService.analyze_report("Scout report: Cached Player")
+        self.cache.clear_memory()
+        entry = AnalysisCacheEntry.query.one()
+        entry.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+        ScoutAnalysisService.analyze_report("Scout report: Cached Player")
+        self.assertEqual(self.generate_content.call_count, 2)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_table_is_size_bounded(self):
+        """The least recently used rows are evicted beyond the size limit"""
+        self.app.config["SCOUT_CACHE_MAX_ENTRIES"] = 2
+        for index in range(4):
+            ScoutAnalysisService.analyze_report(f"Scout report number {index}")
+
+        self.assertEqual(AnalysisCacheEntry.query.count(), 2)
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_failed_store_keeps_callers_pending_changes(self):
+        """A cache write error only undoes the cache write"""
+        user = User(username="pending", email="pending@example.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.flush()
+
+        with patch(
+            "app.scout_analysis.cache.json.dumps", side_effect=TypeError("bad value")
+        ):
+            self.cache.set("key", ANALYSIS, "model", "v1")
+        db.session.commit()
+
+        self.assertIsNotNone(User.query.filter_by(username="pending").first())
+        self.assertEqual(AnalysisCacheEntry.query.count(), 0)
+        self.assertEqual(self.cache.stats()["stores"], 0)
+
+    def test_store_leaves_callers_transaction_open(self):
+        """A cache write does not commit changes the caller may still undo"""
+        user = User(username="undone", email="undone@example.com")
+        user.set_password("password")
+        db.session.add(user)
+
+        self.cache.set("key", ANALYSIS, "model", "v1")
+        self.assertEqual(AnalysisCacheEntry.query.count(), 1)
+        db.session.rollback()
+
+        self.assertIsNone(User.query.filter_by(username="undone").first())
+        self.assertEqual(AnalysisCacheEntry.query.count(), 0)
+
+    def test_metrics_endpoint_reports_cache(self):
+        """Cache counters are exposed for monitoring"""
+        response = self.app.test_client().get("/api/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("scout_analysis_cache", response.get_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
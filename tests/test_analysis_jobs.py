@@ -0,0 +1,208 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app import create_app
+from app.config import config_by_name
+from app.extensions import db, job_queue
+from app.models.dataset import Dataset
+from app.models.job import BackgroundJob
+from app.models.user import User
+from app.scout_analysis.models import ScoutReportAnalysis
+from app.scout_analysis.services import ScoutAnalysisService
+
+
+class TestBackgroundAnalysis(unittest.TestCase):
+    def setUp(self):
+        """Set up an app with a logged-in user and a temporary upload folder"""
+        self.upload_dir = tempfile.mkdtemp()
+        # A file database lets worker threads use their own connections
+        database_uri = f"sqlite:///{os.path.join(self.upload_dir, 'jobs.db')}"
+        with patch.object(
+            config_by_name["testing"], "SQLALCHEMY_DATABASE_URI", database_uri
+        ):
+            self.app = create_app("testing")
+        self.app.config.update(
+            WTF_CSRF_ENABLED=False,
+            UPLOAD_FOLDER=self.upload_dir,
+            GEMINI_API_KEY=None,
+        )
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="jobuser", email="jobs@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "jobuser", "password": "password"}
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def upload(self, content=b"Scout report: LeBron James is an athletic shooter."):
+        return self.client.post(
+            "/datasets/upload",
+            data={"title": "Report", "file": (io.BytesIO(content), "report.txt")},
+            content_type="multipart/form-data",
+        )
+
+    def latest_analysis(self):
+        db.session.expire_all()
+        dataset = Dataset.query.order_by(Dataset.id.desc()).first()
+        return ScoutReportAnalysis.query.filter_by(dataset_id=dataset.id).first()
+
+    def test_eager_upload_completes_analysis(self):
+        """Eager mode runs the job before the upload request returns"""
+        response = self.upload()
+        self.assertEqual(response.status_code, 302)
+
+        analysis = self.latest_analysis()
+        self.assertEqual(analysis.processing_status, "completed")
+        self.assertEqual(analysis.player_name, "LeBron James")
+
+    def test_empty_file_marks_analysis_failed(self):
+        """Files without extractable text end up failed"""
+        self.upload(content=b"   ")
+        analysis = self.latest_analysis()
+        self.assertEqual(analysis.processing_status, "failed")
+
+    def test_upload_returns_before_analysis_finishes(self):
+        """With worker threads the upload does not wait for Gemini"""
+        self.app.config["JOB_QUEUE_EAGER"] = False
+        job_queue.start(self.app, threads=1)
+        self.addCleanup(job_queue.stop, 5)
+        release = threading.Event()
+        original = ScoutAnalysisService.generate_mock_analysis
+
+        def slow_analysis(text_content, **kwargs):
+            release.wait(5)
+            return original(text_content)
+
+        with patch.object(
+            ScoutAnalysisService, "analyze_report", side_effect=slow_analysis
+        ):
+            started = time.monotonic()
+            response = self.upload()
+            self.assertEqual(response.status_code, 302)
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertIn(
+                self.latest_analysis().processing_status, ("pending", "processing")
+            )
+
+            release.set()
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                if self.latest_analysis().processing_status == "completed":
+                    break
+                time.sleep(0.05)
+
+        self.assertEqual(self.latest_analysis().processing_status, "completed")
+
+    def create_job(self):
+        """Upload a report without running its job"""
+        self.app.config["JOB_QUEUE_EAGER"] = False
+        self.upload()
+        self.app.config["JOB_QUEUE_EAGER"] = True
+        # Only the analysis job is under test here
+        BackgroundJob.query.filter(BackgroundJob.job_type != "scout_analysis").delete()
+        db.session.commit()
+        return BackgroundJob.query.filter_by(job_type="scout_analysis").one()
+
+    def test_upload_persists_job(self):
+        """Uploads leave a durable job record behind"""
+        job = self.create_job()
+        self.assertEqual(job.status, "queued")
+        self.assertEqual(job.get_payload()["analysis_id"], self.latest_analysis().id)
+
+    def test_job_is_claimed_only_once(self):
+        """A second worker cannot claim a job leased by the first"""
+        job = self.create_job()
+        claimed = job_queue.claim("worker-a")
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNone(job_queue.claim("worker-b"))
+
+    def test_expired_lease_is_reclaimed(self):
+        """Jobs held by a dead worker are picked up after the lease expires"""
+        job = self.create_job()
+        job_queue.claim("dead-worker")
+        job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+        self.assertEqual(job_queue.run_pending(), 1)
+        db.session.expire_all()
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(self.latest_analysis().processing_status, "completed")
+
+    def test_lease_is_renewed_while_job_runs(self):
+        """A job that outlives its first lease is not handed to another worker"""
+        self.app.config["JOB_LEASE_SECONDS"] = 0.3
+        taken = []
+
+        def slow_job():
+            time.sleep(0.7)
+            taken.append(job_queue.claim("worker-b"))
+
+        job_queue.register_handler("slow", slow_job)
+        self.addCleanup(job_queue._handlers.pop, "slow")
+        job = job_queue.enqueue("slow")
+
+        db.session.expire_all()
+        self.assertEqual(taken, [None])
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(job.attempts, 1)
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        """Errors are retried with backoff and finally fail the analysis"""
+        self.app.config["JOB_MAX_ATTEMPTS"] = 2
+        job = self.create_job()
+        with patch.object(
+            ScoutAnalysisService, "analyze_report", side_effect=RuntimeError("boom")
+        ):
+            self.assertEqual(job_queue.run_pending(), 1)
+            db.session.expire_all()
+            self.assertEqual(job.status, "queued")
+            self.assertEqual(job.last_error, "boom")
+            self.assertGreater(job.next_run_at, datetime.utcnow())
+
+            job.next_run_at = datetime.utcnow()
+            db.session.commit()
+            self.assertEqual(job_queue.run_pending(), 1)
+
+        db.session.expire_all()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(self.latest_analysis().processing_status, "failed")
+
+    def test_workers_are_started_once_and_only_when_enabled(self):
+        """Creating more apps in one process does not add worker threads"""
+        self.assertTrue(job_queue.start(self.app, threads=1))
+        self.addCleanup(job_queue.stop, 5)
+        self.assertFalse(job_queue.start(self.app, threads=1))
+        self.assertEqual(len(job_queue._workers), 1)
+
+        job_queue.stop(5)
+        testing = config_by_name["testing"]
+        with patch.object(testing, "JOB_QUEUE_EAGER", False), patch.object(
+            testing, "JOB_QUEUE_AUTOSTART", False
+        ), patch.object(job_queue, "start") as start:
+            create_app("testing")
+        start.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
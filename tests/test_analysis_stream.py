@@ -0,0 +1,300 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app import create_app
+from app.config import config_by_name
+from app.extensions import GeminiAPI, db
+from app.models.dataset import Dataset
+from app.models.user import User
+from app.scout_analysis.cache import AnalysisCache
+from app.scout_analysis.events import AnalysisEventHub
+from app.scout_analysis.models import ScoutReportAnalysis
+from app.scout_analysis.services import ScoutAnalysisService
+from app.scout_analysis.tasks import run_scout_analysis
+from app.scout_analysis.utils import extract_partial_field
+
+REPORT = {
+    "player_name": "Jane Doe",
+    "position": "Guard",
+    "strengths": ["Speed", "Passing", "Vision"],
+    "summary": 'Jane is a "floor general".\nElite passer.',
+    "overall_rating": 84,
+}
+
+
+def fake_stream(client, prompt, generation_config=None):
+    """Yield the report JSON in small pieces, like streamGenerateContent"""
+    time.sleep(0.3)
+    output = json.dumps(REPORT)
+    for start in range(0, len(output), 7):
+        yield output[start : start + 7]
+
+
+class TestExtractPartialField(unittest.TestCase):
+    def test_field_not_started(self):
+        self.assertEqual(
+            extract_partial_field('{"player_name": "Ja', "summary"), (None, False)
+        )
+
+    def test_partial_value_stops_before_incomplete_escape(self):
+        self.assertEqual(
+            extract_partial_field('{"summary": "Line one\\nLine \\', "summary"),
+            ("Line one\nLine ", False),
+        )
+
+    def test_complete_value(self):
+        buffer = json.dumps({"summary": 'Say "hi" é', "team": "X"})
+        self.assertEqual(extract_partial_field(buffer, "summary"), ('Say "hi" é', True))
+
+
+class TestAnalysisEventHub(unittest.TestCase):
+    def test_late_subscriber_replays_events(self):
+        hub = AnalysisEventHub()
+        hub.publish(1, "started", {})
+        hub.publish(1, "delta", {"text": "Hello"})
+        subscriber = hub.subscribe(1)
+        hub.publish(1, "complete", {})
+
+        events = [subscriber.get_nowait()[0] for _ in range(3)]
+        self.assertEqual(events, ["started", "delta", "complete"])
+
+    def test_retry_starts_a_fresh_stream(self):
+        hub = AnalysisEventHub()
+        hub.publish(1, "started", {})
+        hub.publish(1, "delta", {"text": "First attempt"})
+        hub.publish(1, "started", {})
+        subscriber = hub.subscribe(1)
+        self.assertEqual(subscriber.qsize(), 1)
+
+    def test_wait_for_status_returns_latest_change(self):
+        hub = AnalysisEventHub()
+        hub.publish(1, "started", {"processing_status": "processing"})
+        hub.publish(1, "complete", {"processing_status": "completed"})
+        self.assertEqual(hub.wait_for_status(1, "pending", 1), "completed")
+        self.assertIsNone(hub.wait_for_status(2, "pending", 0.05))
+
+    def test_channel_is_dropped_when_last_waiter_leaves(self):
+        hub = AnalysisEventHub()
+        hub.publish(1, "started", {"processing_status": "processing"})
+        hub.wait_for_status(1, "processing", 0.01)
+        hub.wait_for_status(2, "pending", 0.01)
+        self.assertEqual(hub._channels, {})
+
+    def test_finished_channel_is_kept_for_late_subscribers(self):
+        hub = AnalysisEventHub()
+        subscriber = hub.subscribe(1)
+        hub.publish(1, "complete", {"processing_status": "completed"})
+        hub.unsubscribe(1, subscriber)
+        self.assertIn(1, hub._channels)
+
+    def test_idle_channels_are_pruned(self):
+        hub = AnalysisEventHub(retention_seconds=0)
+        # A job that died without a final event
+        hub.publish(1, "delta", {"text": "Hello"})
+        time.sleep(0.01)
+        hub.publish(2, "started", {})
+        self.assertNotIn(1, hub._channels)
+
+
+class TestStreamingAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        # A file database lets the analysis thread use its own connection
+        database_uri = f"sqlite:///{os.path.join(self.upload_dir, 'stream.db')}"
+        with patch.object(
+            config_by_name["testing"], "SQLALCHEMY_DATABASE_URI", database_uri
+        ):
+            self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, GEMINI_API_KEY="test-key")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        cache_patch = patch(
+            "app.scout_analysis.services.analysis_cache", AnalysisCache()
+        )
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+        # A fresh hub keeps events from earlier tests out of replays
+        self.hub = AnalysisEventHub()
+        for target in (
+            "app.scout_analysis.events.event_hub",
+            "app.scout_analysis.tasks.event_hub",
+        ):
+            hub_patch = patch(target, self.hub)
+            hub_patch.start()
+            self.addCleanup(hub_patch.stop)
+        stream_patch = patch.object(GeminiAPI, "stream_generate_content", autospec=True)
+        stream_patch.start().side_effect = fake_stream
+        self.addCleanup(stream_patch.stop)
+
+        user = User(username="streamer", email="stream@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        self.report_path = os.path.join(self.upload_dir, "report.txt")
+        with open(self.report_path, "w") as f:
+            f.write("Jane Doe is a guard with elite court vision.")
+        dataset = Dataset(title="Report", file_path=self.report_path, user_id=user.id)
+        db.session.add(dataset)
+        db.session.commit()
+        analysis = ScoutReportAnalysis(dataset_id=dataset.id)
+        db.session.add(analysis)
+        db.session.commit()
+        self.dataset_id = dataset.id
+        self.analysis_id = analysis.id
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "streamer", "password": "password"}
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def parse_events(self, body):
+        events = []
+        for block in body.strip().split("\n\n"):
+            lines = dict(
+                line.split(": ", 1) for line in block.split("\n") if ": " in line
+            )
+            if "event" in lines:
+                events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    def test_analyze_report_relays_summary_deltas(self):
+        deltas = []
+        result = ScoutAnalysisService.analyze_report("Report", on_delta=deltas.append)
+
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual("".join(deltas), REPORT["summary"])
+        self.assertEqual(result["player_name"], "Jane Doe")
+
+    def test_stream_endpoint_sends_deltas_then_persisted_result(self):
+        def run():
+            with self.app.app_context():
+                run_scout_analysis(self.analysis_id, self.report_path)
+
+        worker = threading.Thread(target=run)
+        worker.start()
+        response = self.client.get(f"/api/scout-analysis/{self.dataset_id}/stream")
+        body = response.get_data(as_text=True)
+        worker.join()
+
+        self.assertEqual(response.mimetype, "text/event-stream")
+        events = self.parse_events(body)
+        names = [name for name, _ in events]
+        self.assertIn("delta", names)
+        self.assertEqual(names[-1], "complete")
+        self.assertEqual(
+            "".join(data["text"] for name, data in events if name == "delta"),
+            REPORT["summary"],
+        )
+        self.assertEqual(events[-1][1]["player_name"], "Jane Doe")
+        self.assertEqual(events[-1][1]["processing_status"], "completed")
+
+    def test_stream_of_finished_analysis_returns_result_at_once(self):
+        run_scout_analysis(self.analysis_id, self.report_path)
+        response = self.client.get(f"/api/scout-analysis/{self.dataset_id}/stream")
+        events = self.parse_events(response.get_data(as_text=True))
+
+        self.assertEqual([name for name, _ in events], ["complete"])
+
+    def test_open_stream_holds_no_database_connection(self):
+        self.app.config.update(
+            SCOUT_STREAM_KEEPALIVE_SECONDS=0.05, SCOUT_STREAM_TIMEOUT_SECONDS=2
+        )
+        db.session.remove()
+        response = self.client.get(
+            f"/api/scout-analysis/{self.dataset_id}/stream", buffered=False
+        )
+        chunks = iter(response.response)
+        self.assertEqual(next(chunks), b": keepalive\n\n")
+        self.assertEqual(db.engine.pool.checkedout(), 0)
+
+        self.hub.publish(self.analysis_id, "delta", {"text": "Hi"})
+        self.assertIn(b"event: delta", next(c for c in chunks if b"delta" in c))
+        self.assertEqual(db.engine.pool.checkedout(), 0)
+        response.close()
+
+    def test_status_long_poll_answers_when_worker_signals(self):
+        def signal():
+            time.sleep(0.2)
+            self.hub.publish(
+                self.analysis_id, "started", {"processing_status": "processing"}
+            )
+
+        threading.Thread(target=signal).start()
+        started = time.monotonic()
+        response = self.client.get(
+            f"/api/scout-analysis/{self.dataset_id}/status?status=pending&wait=5"
+        )
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(response.json["processing_status"], "processing")
+        self.assertTrue(response.json["changed"])
+
+    def test_status_long_poll_times_out_unchanged(self):
+        response = self.client.get(
+            f"/api/scout-analysis/{self.dataset_id}/status?status=pending&wait=0.1"
+        )
+        self.assertEqual(response.json["processing_status"], "pending")
+        self.assertFalse(response.json["changed"])
+
+    def finish_elsewhere(self, delay):
+        """Mark the analysis failed without signalling the hub"""
+
+        def finish():
+            time.sleep(delay)
+            with self.app.app_context():
+                analysis = db.session.get(ScoutReportAnalysis, self.analysis_id)
+                analysis.processing_status = "failed"
+                db.session.commit()
+
+        thread = threading.Thread(target=finish)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_status_long_poll_sees_job_run_by_another_process(self):
+        self.app.config.update(SCOUT_STATUS_RECHECK_SECONDS=0.1)
+        self.finish_elsewhere(0.2)
+        started = time.monotonic()
+        response = self.client.get(
+            f"/api/scout-analysis/{self.dataset_id}/status?status=pending&wait=5"
+        )
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(response.json["processing_status"], "failed")
+
+    def test_stream_sees_job_run_by_another_process(self):
+        self.app.config.update(
+            SCOUT_STATUS_RECHECK_SECONDS=0.1, SCOUT_STREAM_TIMEOUT_SECONDS=5
+        )
+        self.finish_elsewhere(0.2)
+        started = time.monotonic()
+        response = self.client.get(f"/api/scout-analysis/{self.dataset_id}/stream")
+        events = self.parse_events(response.get_data(as_text=True))
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual([name for name, _ in events], ["failed"])
+
+    def test_status_returns_at_once_when_client_is_behind(self):
+        response = self.client.get(
+            f"/api/scout-analysis/{self.dataset_id}/status?status=processing&wait=5"
+        )
+        self.assertEqual(response.json["processing_status"], "pending")
+        self.assertTrue(response.json["changed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
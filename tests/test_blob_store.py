@@ -0,0 +1,192 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app import create_app
+from app.extensions import db
+from app.models.blob import StoredBlob
+from app.models.dataset import Dataset
+from app.models.dataset_profile import DatasetProfile
+from app.models.user import User
+from app.scout_analysis.models import ScoutReportAnalysis
+from app.utils import blob_store
+from app.utils.blob_store import blob_path, release_file
+from app.utils.frame_cache import FrameCache
+from app.utils.sidecar import sidecar_meta
+
+CSV = b"points,rebounds,team\n10,5,A\n20,7,B\n45,9,A\n"
+
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="deduper", email="dedup@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        cache_patch = patch("app.utils.frame_cache.frame_cache", FrameCache(10**7))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "deduper", "password": "password"}
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def upload(self, content=CSV, name="stats.csv"):
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Stats", "file": (io.BytesIO(content), name)},
+            content_type="multipart/form-data",
+        )
+        return Dataset.query.order_by(Dataset.id.desc()).first()
+
+    def delete(self, dataset):
+        with patch("app.utils.validate_csrf"):
+            self.client.post(
+                f"/datasets/delete/{dataset.id}", data={"csrf_token": "token"}
+            )
+
+    def test_upload_is_stored_by_content_hash(self):
+        dataset = self.upload()
+        digest = hashlib.sha256(CSV).hexdigest()
+        self.assertEqual(dataset.file_path, blob_path(self.upload_dir, digest, "csv"))
+        self.assertTrue(
+            dataset.file_path.startswith(
+                os.path.join(self.upload_dir, digest[:2], digest[2:4])
+            )
+        )
+        with open(dataset.file_path, "rb") as f:
+            self.assertEqual(f.read(), CSV)
+        blob = StoredBlob.query.one()
+        self.assertEqual((blob.ref_count, blob.size), (1, len(CSV)))
+
+    def test_duplicate_upload_shares_file_and_reuses_profile(self):
+        first = self.upload()
+        with patch("app.datasets.routes.job_queue.enqueue") as enqueue:
+            second = self.upload()
+        enqueue.assert_not_called()
+
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(first.file_path, second.file_path)
+        self.assertEqual(StoredBlob.query.one().ref_count, 2)
+        profile = DatasetProfile.query.filter_by(dataset_id=second.id).one()
+        self.assertEqual(profile.row_count, 3)
+        self.assertEqual(second.schema.column_names(), ["points", "rebounds", "team"])
+
+    def test_duplicate_upload_reuses_completed_analysis(self):
+        first = self.upload(b"Strong rebounder with quick feet.", "report.txt")
+        analysis = ScoutReportAnalysis.query.filter_by(dataset_id=first.id).one()
+        analysis.processing_status = "completed"
+        analysis.player_name = "Sam"
+        analysis.overall_rating = 8.5
+        db.session.commit()
+
+        with patch("app.datasets.routes.job_queue.enqueue") as enqueue:
+            second = self.upload(b"Strong rebounder with quick feet.", "copy.txt")
+        self.assertNotIn(
+            "scout_analysis", [call.args[0] for call in enqueue.call_args_list]
+        )
+        copy = ScoutReportAnalysis.query.filter_by(dataset_id=second.id).one()
+        self.assertEqual(copy.processing_status, "completed")
+        self.assertEqual((copy.player_name, copy.overall_rating), ("Sam", 8.5))
+
+    def test_file_is_removed_with_its_last_reference(self):
+        first = self.upload()
+        second = self.upload()
+        path = first.file_path
+        self.assertIsNotNone(sidecar_meta(path))
+
+        self.delete(first)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(StoredBlob.query.one().ref_count, 1)
+
+        self.delete(second)
+        self.assertFalse(os.path.exists(path))
+        self.assertIsNone(sidecar_meta(path))
+        self.assertFalse(os.path.exists(f"{path}.index.json"))
+        self.assertEqual(StoredBlob.query.count(), 0)
+
+    def test_reference_added_during_release_keeps_file(self):
+        dataset = self.upload()
+        path = dataset.file_path
+        execute = db.session.execute
+
+        def concurrent_upload(statement, *args, **kwargs):
+            if statement.is_dml and statement.is_delete:
+                # Another upload of the same content lands after the decrement
+                execute(
+                    db.update(StoredBlob).values(ref_count=StoredBlob.ref_count + 1)
+                )
+            return execute(statement, *args, **kwargs)
+
+        with patch.object(db.session, "execute", side_effect=concurrent_upload):
+            self.assertFalse(release_file(path))
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(StoredBlob.query.one().ref_count, 1)
+
+    def test_blob_released_during_upload_is_stored_again(self):
+        path = self.upload().file_path
+        add_reference = blob_store._add_reference
+
+        def release_first(blob_id):
+            # The last dataset using the file is deleted after the lookup
+            self.assertTrue(release_file(path))
+            return add_reference(blob_id)
+
+        with patch.object(blob_store, "_add_reference", side_effect=release_first):
+            dataset = self.upload()
+
+        self.assertEqual(dataset.file_path, path)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), CSV)
+        self.assertEqual(StoredBlob.query.one().ref_count, 1)
+        self.assertEqual(
+            [name for name in os.listdir(self.upload_dir) if name.endswith(".upload")],
+            [],
+        )
+
+    def test_file_is_kept_when_dataset_delete_fails(self):
+        dataset = self.upload()
+        with patch(
+            "app.datasets.routes.db.session.commit", side_effect=RuntimeError("locked")
+        ):
+            with self.assertRaises(RuntimeError):
+                self.delete(dataset)
+        db.session.rollback()
+        self.assertTrue(os.path.exists(dataset.file_path))
+        self.assertEqual(StoredBlob.query.one().ref_count, 1)
+
+    def test_legacy_uploads_are_deleted_directly(self):
+        path = os.path.join(self.upload_dir, "old_upload.csv")
+        with open(path, "wb") as f:
+            f.write(CSV)
+        user = User.query.one()
+        dataset = Dataset(user_id=user.id, title="Old", file_path=path)
+        db.session.add(dataset)
+        db.session.commit()
+
+        self.delete(dataset)
+        self.assertFalse(os.path.exists(path))
+        self.assertIsNone(db.session.get(Dataset, dataset.id))
+
+
+if __name__ == "__main__":
+    unittest.main()
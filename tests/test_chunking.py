@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app import create_app
+from app.extensions import GeminiAPI, db
+from app.scout_analysis.cache import AnalysisCache
+from app.scout_analysis.chunking import (
+    estimate_tokens,
+    merge_analyses,
+    split_into_chunks,
+)
+from app.scout_analysis.services import ScoutAnalysisService
+
+
+class TestSplitIntoChunks(unittest.TestCase):
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(split_into_chunks("Short report.", 100), ["Short report."])
+
+    def test_chunks_respect_budget_and_keep_all_text(self):
+        paragraphs = [f"Paragraph {i}. " + "Good footwork. " * 40 for i in range(30)]
+        text = "\n\n".join(paragraphs)
+        chunks = split_into_chunks(text, 500)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(estimate_tokens(chunk) <= 500 for chunk in chunks))
+        self.assertEqual(
+            "".join(chunks).replace("\n", "").replace(" ", ""),
+            text.replace("\n", "").replace(" ", ""),
+        )
+
+    def test_oversized_paragraph_is_split(self):
+        chunks = split_into_chunks("x" * 5000, 100)
+        self.assertTrue(all(len(chunk) <= 400 for chunk in chunks))
+        self.assertEqual("".join(chunks), "x" * 5000)
+
+
+class TestMergeAnalyses(unittest.TestCase):
+    def test_merge_votes_dedupes_and_averages(self):
+        results = [
+            {
+                "player_name": "Jane Doe",
+                "position": "Guard",
+                "strengths": ["Passing", "Speed"],
+                "weaknesses": ["Size"],
+                "summary": "Part one.",
+                "overall_rating": 80,
+            },
+            {
+                "player_info": {"name": "jane doe", "position": "Unknown"},
+                "strengths": ["speed", "Defense"],
+                "summary": "Part two.",
+                "ratings": {"overall": 90},
+            },
+        ]
+        merged = merge_analyses(results, weights=[1, 3])
+
+        self.assertEqual(merged["player_name"], "Jane Doe")
+        self.assertEqual(merged["position"], "Guard")
+        self.assertEqual(merged["strengths"], ["Passing", "Speed", "Defense"])
+        self.assertEqual(merged["overall_rating"], 87.5)
+        self.assertEqual(merged["summary"], "Part one.\n\nPart two.")
+        self.assertIsNone(merged["defensive_rating"])
+
+
+class TestLongReportAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.app.config.update(
+            GEMINI_API_KEY="test-key", SCOUT_CHUNK_TOKENS=200, SCOUT_CHUNK_CONCURRENCY=8
+        )
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache_patch = patch(
+            "app.scout_analysis.services.analysis_cache", AnalysisCache()
+        )
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_chunks_are_analyzed_in_parallel(self):
+        """Wall-clock time stays close to a single call"""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0, "calls": 0}
+
+        def fake_generate(client, prompt, generation_config=None):
+            with lock:
+                state["active"] += 1
+                state["calls"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.2)
+            with lock:
+                state["active"] -= 1
+            return json.dumps(
+                {
+                    "player_name": "Jane Doe",
+                    "strengths": ["Speed"],
+                    "overall_rating": 80,
+                }
+            )
+
+        text = "\n\n".join(
+            f"Section {i}. " + "Quick first step. " * 40 for i in range(8)
+        )
+        with patch.object(GeminiAPI, "generate_content", autospec=True) as generate:
+            generate.side_effect = fake_generate
+            started = time.monotonic()
+            result = ScoutAnalysisService.analyze_report(text)
+            elapsed = time.monotonic() - started
+
+        self.assertGreater(state["calls"], 4)
+        self.assertGreater(state["peak"], 1)
+        self.assertLess(elapsed, 0.2 * state["calls"] / 2)
+        self.assertEqual(result["player_name"], "Jane Doe")
+        self.assertEqual(result["overall_rating"], 80)
+        self.assertEqual(result["strengths"], ["Speed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
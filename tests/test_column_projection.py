@@ -0,0 +1,121 @@
+import io
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app import create_app
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.dataset_schema import DatasetSchema
+from app.models.user import User
+from app.utils import parse_dataset
+from app.utils.frame_cache import FrameCache, load_dataset_columns
+
+HEADER = ",".join(["name"] + [f"stat{i}" for i in range(50)])
+ROWS = [",".join([f"p{r}"] + [str(r * i) for i in range(50)]) for r in range(20)]
+CSV = ("\n".join([HEADER] + ROWS) + "\n").encode("utf-8")
+
+
+class TestColumnProjection(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="wide", email="wide@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        cache_patch = patch("app.utils.frame_cache.frame_cache", FrameCache(10**7))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "wide", "password": "password"}
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def upload(self):
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Wide", "file": (io.BytesIO(CSV), "wide.csv")},
+            content_type="multipart/form-data",
+        )
+        return Dataset.query.order_by(Dataset.id.desc()).first()
+
+    def visualize(self, dataset, **params):
+        return self.client.get(
+            f"/api/dataset/{dataset.id}/visualize", query_string=params
+        )
+
+    def test_schema_is_recorded_at_upload(self):
+        dataset = self.upload()
+        schema = DatasetSchema.query.filter_by(dataset_id=dataset.id).one()
+        columns = schema.get_columns()
+        self.assertEqual(len(columns), 51)
+        self.assertEqual(
+            columns[3],
+            {"name": "stat2", "dtype": "int64", "position": 3, "numeric": True},
+        )
+        self.assertFalse(columns[0]["numeric"])
+
+    def test_large_files_parse_only_plotted_columns(self):
+        self.app.config["DATASET_STREAMING_THRESHOLD_BYTES"] = 1
+        dataset = self.upload()
+        with patch("app.utils.parse_dataset", wraps=parse_dataset) as parse:
+            response = self.visualize(
+                dataset, chart_type="line", x_column="name", y_column="stat7"
+            )
+        parse.assert_called_once_with(dataset.file_path, ["name", "stat7"], None)
+        data = response.get_json()
+        self.assertEqual(data["x"][:2], ["p0", "p1"])
+        self.assertEqual(data["y"][:3], [0, 7, 14])
+
+    def test_default_columns_come_from_schema(self):
+        dataset = self.upload()
+        data = self.visualize(dataset).get_json()
+        self.assertEqual(data["x"][0], "p0")
+        self.assertEqual(data["y"][1], 0)  # stat0 is the first numeric column
+
+    def test_unknown_column_is_rejected(self):
+        dataset = self.upload()
+        response = self.visualize(dataset, x_column="name", y_column="missing")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Column not found: missing")
+
+    def test_integer_labelled_frames_use_string_names(self):
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Pairs", "file": (io.BytesIO(b"[[1,2],[3,4]]"), "p.json")},
+            content_type="multipart/form-data",
+        )
+        dataset = Dataset.query.order_by(Dataset.id.desc()).first()
+        self.assertEqual(dataset.schema.column_names(), ["0", "1"])
+
+        response = self.visualize(dataset, x_column="0", y_column="1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["y"], [2, 4])
+        response = self.client.get(f"/api/dataset/{dataset.id}/correlations")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["columns"], ["0", "1"])
+
+    def test_missing_label_is_an_error_not_a_key_error(self):
+        dataset = self.upload()
+        df, error = load_dataset_columns(dataset, ["name", "gone"])
+        self.assertIsNone(df)
+        self.assertEqual(error, "Column not found: gone")
+
+
+if __name__ == "__main__":
+    unittest.main()
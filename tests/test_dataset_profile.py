@@ -0,0 +1,108 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app import create_app
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.dataset_profile import DatasetProfile
+from app.models.user import User
+from app.utils.frame_cache import FrameCache
+from app.utils.sidecar import sidecar_meta
+
+CSV = b"points,rebounds,team\n10,5,A\n20,7,B\n45,9,A\n"
+
+
+class TestDatasetProfile(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="profiler", email="profile@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        cache_patch = patch("app.utils.frame_cache.frame_cache", FrameCache(10**7))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "profiler", "password": "password"}
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def upload(self):
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Stats", "file": (io.BytesIO(CSV), "stats.csv")},
+            content_type="multipart/form-data",
+        )
+        return Dataset.query.order_by(Dataset.id.desc()).first()
+
+    def test_profile_is_stored_at_upload(self):
+        dataset = self.upload()
+        profile = DatasetProfile.query.filter_by(dataset_id=dataset.id).one()
+        self.assertEqual(profile.row_count, 3)
+        self.assertEqual(profile.to_dict()["numeric_columns"], ["points", "rebounds"])
+        self.assertEqual(
+            profile.to_dict()["categorical_summary"]["team"]["distinct"], 2
+        )
+
+    def test_analyze_serves_stored_profile_without_loading(self):
+        dataset = self.upload()
+        with patch("app.api.routes.load_dataset_frame") as load:
+            response = self.client.get(f"/api/dataset/{dataset.id}/analyze")
+        load.assert_not_called()
+        data = response.get_json()
+        self.assertEqual(data["row_count"], 3)
+        self.assertEqual(data["categorical_columns"], ["team"])
+        self.assertEqual(data["statistics"]["points"]["max"], 45)
+        self.assertIn(
+            "Column points has a positively skewed distribution (mean > median).",
+            data["insights"],
+        )
+
+    def test_changed_file_is_profiled_again(self):
+        dataset = self.upload()
+        with open(dataset.file_path, "ab") as f:
+            f.write(b"30,2,B\n")
+        response = self.client.get(f"/api/dataset/{dataset.id}/analyze")
+        self.assertEqual(response.get_json()["row_count"], 4)
+        self.assertEqual(DatasetProfile.query.count(), 1)
+        self.assertEqual(DatasetProfile.query.one().row_count, 4)
+
+    def test_large_uploads_are_profiled_in_chunks(self):
+        self.app.config["DATASET_STREAMING_THRESHOLD_BYTES"] = 1
+        with patch("app.utils.load_dataset") as load:
+            dataset = self.upload()
+        load.assert_not_called()
+        self.assertIsNone(sidecar_meta(dataset.file_path))
+        profile = DatasetProfile.query.filter_by(dataset_id=dataset.id).one()
+        self.assertEqual(profile.to_dict()["statistics"]["points"]["50%"], 20)
+
+    def test_profile_is_deleted_with_dataset(self):
+        dataset = self.upload()
+        with patch("app.utils.validate_csrf"):
+            self.client.post(
+                f"/datasets/delete/{dataset.id}", data={"csrf_token": "token"}
+            )
+        self.assertFalse(os.path.exists(dataset.file_path))
+        self.assertEqual(DatasetProfile.query.count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
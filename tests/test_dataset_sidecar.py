@@ -0,0 +1,119 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from app import create_app
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.user import User
+from app.utils import load_dataset
+from app.utils.sidecar import feather, read_sidecar, sidecar_meta
+
+CSV = b"player,points,team\nJane,21.5,Perth\nAmy,17.0,Sydney\nKim,9.5,Perth\n"
+
+
+class TestDatasetSidecar(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.upload_dir = tempfile.mkdtemp()
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.file_path = os.path.join(self.upload_dir, "stats.csv")
+        with open(self.file_path, "wb") as f:
+            f.write(CSV)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_second_load_skips_parsing(self):
+        df, error = load_dataset(self.file_path)
+        self.assertIsNone(error)
+        self.assertEqual(sidecar_meta(self.file_path)["rows"], 3)
+
+        with patch("app.utils.pd.read_csv") as read_csv:
+            cached, error = load_dataset(self.file_path)
+        read_csv.assert_not_called()
+        pd.testing.assert_frame_equal(cached, df)
+        self.assertEqual(str(cached["points"].dtype), "float64")
+
+    def test_changed_file_rebuilds_sidecar(self):
+        load_dataset(self.file_path)
+        with open(self.file_path, "ab") as f:
+            f.write(b"Lee,30.0,Perth\n")
+
+        self.assertIsNone(read_sidecar(self.file_path))
+        df, _ = load_dataset(self.file_path)
+        self.assertEqual(len(df), 4)
+        self.assertEqual(sidecar_meta(self.file_path)["rows"], 4)
+
+    def test_touched_file_keeps_sidecar(self):
+        """Only the hash decides once the modification time has moved"""
+        load_dataset(self.file_path)
+        later = time.time() + 10
+        os.utime(self.file_path, (later, later))
+        self.assertIsNotNone(read_sidecar(self.file_path))
+
+    def test_metadata_refresh_failure_keeps_sidecar(self):
+        load_dataset(self.file_path)
+        later = time.time() + 10
+        os.utime(self.file_path, (later, later))
+        with patch("app.utils.sidecar._write_json", side_effect=OSError("read-only")):
+            self.assertIsNotNone(sidecar_meta(self.file_path))
+
+    def test_writes_leave_no_temporary_files(self):
+        load_dataset(self.file_path)
+        later = time.time() + 10
+        os.utime(self.file_path, (later, later))
+        sidecar_meta(self.file_path)
+        leftovers = [name for name in os.listdir(self.upload_dir) if "tmp" in name]
+        self.assertEqual(leftovers, [])
+
+    @unittest.skipIf(feather is None, "pyarrow is not installed")
+    def test_feather_sidecar_reads_only_requested_columns(self):
+        df, _ = load_dataset(self.file_path)
+        self.assertEqual(sidecar_meta(self.file_path)["format"], "feather")
+        subset = read_sidecar(self.file_path, columns=["points"])
+        self.assertEqual(list(subset.columns), ["points"])
+        pd.testing.assert_series_equal(subset["points"], df["points"])
+
+    def test_disabled_sidecar_is_not_written(self):
+        self.app.config["DATASET_SIDECAR_ENABLED"] = False
+        load_dataset(self.file_path)
+        self.assertIsNone(sidecar_meta(self.file_path))
+
+    def test_upload_ingests_and_delete_removes_sidecar(self):
+        user = User(username="sidecar", email="sidecar@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        client = self.app.test_client()
+        client.post("/auth/login", data={"username": "sidecar", "password": "password"})
+
+        client.post(
+            "/datasets/upload",
+            data={"title": "Stats", "file": (io.BytesIO(CSV), "stats.csv")},
+            content_type="multipart/form-data",
+        )
+        dataset = Dataset.query.filter_by(title="Stats").first()
+        self.assertIsNotNone(sidecar_meta(dataset.file_path))
+
+        with patch("app.utils.validate_csrf"):
+            client.post(f"/datasets/delete/{dataset.id}", data={"csrf_token": "token"})
+        self.assertFalse(
+            [name for name in os.listdir(self.upload_dir) if "stats_" in name]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
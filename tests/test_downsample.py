@@ -0,0 +1,100 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.utils.downsample import (
+    OTHER_LABEL,
+    downsample_chart,
+    grid_indices,
+    lttb_indices,
+)
+from app.utils.dtypes import ARROW_STRING
+
+
+class TestDownsample(unittest.TestCase):
+    def test_small_datasets_are_returned_unchanged(self):
+        df = pd.DataFrame({"x": [1, 2, 3], "y": [4, 5, 6]})
+        result = downsample_chart(df, "line", "x", "y", 10)
+        self.assertEqual(result["x"], [1, 2, 3])
+        self.assertEqual(result["y"], [4, 5, 6])
+        self.assertFalse(result["downsampling"]["reduced"])
+
+    def test_missing_values_become_none(self):
+        df = pd.DataFrame(
+            {
+                "x": pd.array(["a", None, "c"], dtype="string"),
+                "y": pd.array([1, 2, None], dtype="Int64"),
+            }
+        )
+        result = downsample_chart(df, "line", "x", "y", 10)
+        self.assertEqual(result["x"], ["a", None, "c"])
+        self.assertEqual(result["y"], [1, 2, None])
+
+    @unittest.skipIf(ARROW_STRING is None, "pyarrow is not installed")
+    def test_arrow_strings_with_missing_values_serialize(self):
+        df = pd.DataFrame({"name": pd.array(["a", None] * 20, dtype=ARROW_STRING)})
+        for max_points in (100, 10):
+            result = downsample_chart(df, "line", "name", None, max_points)
+            self.assertIn(None, result["x"])
+            json.dumps(result)
+
+    def test_lttb_keeps_endpoints_and_peaks(self):
+        x = np.arange(10000, dtype=float)
+        y = np.sin(x / 500)
+        y[4321] = 50.0
+        indices = lttb_indices(x, y, 200)
+        self.assertEqual(len(indices), 200)
+        self.assertEqual((indices[0], indices[-1]), (0, 9999))
+        self.assertIn(4321, indices)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_line_chart_is_bounded(self):
+        df = pd.DataFrame({"t": range(100000), "v": np.random.rand(100000)})
+        result = downsample_chart(df, "line", "t", "v", 500)
+        self.assertEqual(len(result["x"]), 500)
+        self.assertEqual(len(result["y"]), 500)
+        self.assertEqual(
+            result["downsampling"],
+            {
+                "method": "lttb",
+                "original_points": 100000,
+                "points": 500,
+                "reduced": True,
+            },
+        )
+
+    def test_grid_binning_keeps_one_point_per_cell(self):
+        rng = np.random.default_rng(0)
+        x, y = rng.random(50000), rng.random(50000)
+        indices, counts = grid_indices(x, y, 100)
+        self.assertLessEqual(len(indices), 100)
+        self.assertEqual(counts.sum(), 50000)
+
+    def test_scatter_reports_cell_counts(self):
+        df = pd.DataFrame({"a": np.arange(20000) % 7, "b": np.arange(20000) % 3})
+        result = downsample_chart(df, "scatter", "a", "b", 400)
+        self.assertEqual(len(result["x"]), 21)
+        self.assertEqual(sum(result["counts"]), 20000)
+
+    def test_bar_chart_keeps_top_categories(self):
+        df = pd.DataFrame(
+            {"team": [f"T{i % 50}" for i in range(1000)], "points": [1] * 1000}
+        )
+        df.loc[df["team"] == "T7", "points"] = 5
+        result = downsample_chart(df, "bar", "team", "points", 10)
+        self.assertEqual(len(result["x"]), 10)
+        self.assertEqual(result["x"][0], "T7")
+        self.assertEqual(result["x"][-1], OTHER_LABEL)
+        self.assertEqual(sum(result["y"]), df["points"].sum())
+
+    def test_pie_counts_rows_for_text_values(self):
+        df = pd.DataFrame({"pos": ["G", "F", "G", "C"] * 10, "name": ["n"] * 40})
+        result = downsample_chart(df, "pie", "pos", "name", 3)
+        self.assertEqual(result["labels"], ["G", "F", "C"])
+        self.assertEqual(result["values"], [20, 10, 10])
+
+
+if __name__ == "__main__":
+    unittest.main()
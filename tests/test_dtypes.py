@@ -0,0 +1,168 @@
+import io
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from app import create_app
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.user import User
+from app.utils.dtypes import apply_dtypes, plan_dtypes, plan_from_profile
+from app.utils.frame_cache import FrameCache, load_dataset_frame
+from app.utils.sidecar import sidecar_meta
+
+
+def box_scores(rows=400):
+    rng = np.random.default_rng(2)
+    return pd.DataFrame(
+        {
+            "team": rng.choice(["Kings", "Wildcats", "United"], rows),
+            "player": [f"Player {i}" for i in range(rows)],
+            "points": rng.integers(0, 50, rows),
+            "minutes": rng.integers(0, 96, rows) / 2,
+            "fg_pct": rng.random(rows),
+            "salary": rng.integers(0, 3_000_000_000, rows),
+        }
+    )
+
+
+class TestDtypePlan(unittest.TestCase):
+    def test_plan_chooses_lossless_compact_types(self):
+        plan = plan_dtypes(box_scores())
+        self.assertEqual(plan["team"], "category")
+        self.assertEqual(plan["points"], "int8")
+        self.assertNotIn("minutes", plan)  # floats keep full precision
+        self.assertNotIn("fg_pct", plan)
+        self.assertNotIn("salary", plan)  # does not fit in int32
+        self.assertNotEqual(plan.get("player"), "category")
+
+    def test_apply_keeps_values_and_leaves_input_alone(self):
+        df = box_scores()
+        compact = apply_dtypes(df, plan_dtypes(df))
+        self.assertEqual(df["team"].dtype, object)
+        self.assertEqual(compact["points"].dtype, np.int8)
+        self.assertLess(
+            compact.memory_usage(deep=True).sum(), df.memory_usage(deep=True).sum()
+        )
+        pd.testing.assert_frame_equal(
+            compact.astype(object), df.astype(object), check_dtype=False
+        )
+
+    def test_apply_skips_missing_and_unconvertible_columns(self):
+        df = pd.DataFrame({"points": ["ten", "12"]})
+        result = apply_dtypes(df, {"points": "int8", "rebounds": "int8"})
+        self.assertIs(result, df)
+
+    def test_plan_from_profile(self):
+        profile = {
+            "column_types": {"team": "object", "points": "int64", "pct": "float64"},
+            "statistics": {
+                "points": {"count": 10.0, "min": -3.0, "max": 300.0},
+                "pct": {"count": 10.0, "min": 0.0, "max": 1.0},
+            },
+            "categorical_summary": {"team": {"count": 10, "distinct": 2}},
+        }
+        self.assertEqual(
+            plan_from_profile(profile), {"team": "category", "points": "int16"}
+        )
+
+
+class TestCompactLoads(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="packer", email="pack@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        cache_patch = patch("app.utils.frame_cache.frame_cache", FrameCache(10**8))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "packer", "password": "password"}
+        )
+        csv = box_scores().to_csv(index=False).encode()
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Box", "file": (io.BytesIO(csv), "box.csv")},
+            content_type="multipart/form-data",
+        )
+        self.dataset = Dataset.query.one()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_plan_is_stored_and_applied_on_load(self):
+        plan = self.dataset.schema.get_storage_dtypes()
+        self.assertEqual(plan["team"], "category")
+        # The schema keeps the parsed dtypes for column checks
+        self.assertIn(
+            {"name": "points", "dtype": "int64", "position": 2, "numeric": True},
+            self.dataset.schema.get_columns(),
+        )
+        self.assertEqual(
+            sidecar_meta(self.dataset.file_path)["dtypes"]["team"], "category"
+        )
+
+        df, error = load_dataset_frame(self.dataset)
+        self.assertIsNone(error)
+        self.assertEqual(str(df["team"].dtype), "category")
+        self.assertEqual(df["points"].dtype, np.int8)
+
+    def test_changed_file_is_loaded_without_stale_plan(self):
+        with open(self.dataset.file_path, "a") as f:
+            f.write("Kings,Player X,900,12.0,0.5,1\n")
+        df, error = load_dataset_frame(self.dataset)
+        self.assertIsNone(error)
+        self.assertEqual(df["points"].iloc[-1], 900)
+        self.assertEqual(df["points"].dtype, np.int64)
+
+    def test_grouped_chart_data_uses_compact_frame(self):
+        response = self.client.get(
+            f"/api/dataset/{self.dataset.id}/aggregate?group_by=team&agg=points:sum"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["total_groups"], 3)
+
+    def test_aggregates_match_full_precision_sums(self):
+        response = self.client.get(
+            f"/api/dataset/{self.dataset.id}/aggregate",
+            query_string={
+                "group_by": "team",
+                "agg": ["points:sum", "minutes:sum", "fg_pct:mean"],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        rows = {row["team"]: row for row in response.get_json()["rows"]}
+        expected = (
+            box_scores()
+            .groupby("team")
+            .agg(
+                points=("points", "sum"),
+                minutes=("minutes", "sum"),
+                fg=("fg_pct", "mean"),
+            )
+        )
+        for team, row in expected.iterrows():
+            self.assertEqual(rows[team]["points_sum"], row["points"])
+            np.testing.assert_allclose(rows[team]["minutes_sum"], row["minutes"])
+            np.testing.assert_allclose(rows[team]["fg_pct_mean"], row["fg"], rtol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import io
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from flask import g
+
+from app import create_app
+from app.datasets.exploration import _cache_key, cached_result, correlation_matrix
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.dataset_result import DatasetResult
+from app.models.share import Share
+from app.models.user import User
+from app.utils.frame_cache import FrameCache
+
+CSV = (
+    b"player,points,rebounds,assists\n"
+    b"Ann,10,5,2\nBob,20,9,4\nCy,30,12,1\nDee,40,20,3\nEd,50,21,\n"
+)
+
+
+class TestCorrelationMatrix(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.df = pd.DataFrame(rng.normal(size=(500, 4)), columns=list("abcd"))
+        self.df["b"] += self.df["a"] * 3
+        self.df["d"] = rng.integers(0, 4, 500)  # many ties
+
+    def assertMatchesPandas(self, df, method):
+        result = correlation_matrix(df, list(df.columns), method)
+        actual = np.array(result["matrix"], dtype=float)
+        expected = df.corr(method=method).to_numpy()
+        np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+    def test_complete_data_matches_pandas(self):
+        self.assertMatchesPandas(self.df, "pearson")
+        self.assertMatchesPandas(self.df, "spearman")
+
+    def test_missing_values_use_pairwise_complete_rows(self):
+        self.df.loc[::3, "a"] = np.nan
+        self.df.loc[::5, "c"] = np.nan
+        self.assertMatchesPandas(self.df, "pearson")
+
+    def test_undefined_correlations_are_none(self):
+        self.df["c"] = np.nan
+        self.df.loc[0, "c"] = 1.0
+        matrix = correlation_matrix(self.df, ["a", "c"], "pearson")["matrix"]
+        self.assertIsNone(matrix[0][1])
+        self.assertAlmostEqual(matrix[0][0], 1.0)
+
+
+class TestExplorationEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="explorer", email="explore@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        cache_patch = patch("app.utils.frame_cache.frame_cache", FrameCache(10**7))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "explorer", "password": "password"}
+        )
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Stats", "file": (io.BytesIO(CSV), "stats.csv")},
+            content_type="multipart/form-data",
+        )
+        self.dataset = Dataset.query.one()
+        self.base = f"/api/dataset/{self.dataset.id}"
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_correlations_are_cached_per_file_version(self):
+        data = self.client.get(f"{self.base}/correlations").get_json()
+        self.assertEqual(data["columns"], ["points", "rebounds", "assists"])
+        self.assertFalse(data["cached"])
+        expected = pd.read_csv(io.BytesIO(CSV))[["points", "rebounds"]].corr()
+        self.assertAlmostEqual(data["matrix"][0][1], expected.iloc[0, 1])
+
+        with patch("app.datasets.exploration.correlation_matrix") as compute:
+            again = self.client.get(f"{self.base}/correlations").get_json()
+        compute.assert_not_called()
+        self.assertTrue(again["cached"])
+        self.assertEqual(again["matrix"], data["matrix"])
+
+        with open(self.dataset.file_path, "ab") as f:
+            f.write(b"Flo,60,2,5\n")
+        changed = self.client.get(f"{self.base}/correlations").get_json()
+        self.assertFalse(changed["cached"])
+        self.assertNotEqual(changed["matrix"], data["matrix"])
+        self.assertEqual(DatasetResult.query.count(), 1)
+
+    def test_concurrent_store_of_same_result(self):
+        def compute():
+            # Another request stores the same key while this one computes
+            db.session.add(
+                DatasetResult(
+                    dataset_id=self.dataset.id,
+                    cache_key=_cache_key("kind", {}),
+                    file_version="other",
+                    result="{}",
+                )
+            )
+            db.session.commit()
+            return {"value": 1}
+
+        result, cached = cached_result(self.dataset, "kind", {}, compute)
+        self.assertEqual((result, cached), ({"value": 1}, False))
+        self.assertEqual(DatasetResult.query.count(), 1)
+
+    def test_spearman_on_chosen_columns(self):
+        data = self.client.get(
+            f"{self.base}/correlations?method=spearman&columns=points&columns=rebounds"
+        ).get_json()
+        np.testing.assert_allclose(data["matrix"], [[1.0, 1.0], [1.0, 1.0]])
+
+    def test_correlation_errors(self):
+        response = self.client.get(f"{self.base}/correlations?method=kendall")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f"{self.base}/correlations?columns=player")
+        self.assertEqual(response.status_code, 400)
+
+    def test_histogram_uses_profile_range(self):
+        data = self.client.get(f"{self.base}/histogram/points?bins=4").get_json()
+        self.assertEqual(data["edges"], [10.0, 20.0, 30.0, 40.0, 50.0])
+        self.assertEqual(data["counts"], [1, 1, 1, 2])
+        self.assertEqual((data["min"], data["max"], data["nulls"]), (10.0, 50.0, 0))
+
+        data = self.client.get(f"{self.base}/histogram/assists?bins=3").get_json()
+        self.assertEqual(sum(data["counts"]), 4)
+        self.assertEqual(data["nulls"], 1)
+        self.assertTrue(
+            self.client.get(f"{self.base}/histogram/assists?bins=3").get_json()[
+                "cached"
+            ]
+        )
+
+    def test_histogram_errors(self):
+        response = self.client.get(f"{self.base}/histogram/player")
+        self.assertEqual(response.get_json()["error"], "Column is not numeric: player")
+        response = self.client.get(f"{self.base}/histogram/steals")
+        self.assertEqual(response.status_code, 400)
+
+    def test_dataset_endpoints_check_access(self):
+        other = User(username="outsider", email="out@example.com", is_verified=True)
+        other.set_password("password")
+        db.session.add(other)
+        db.session.commit()
+        paths = [
+            "aggregate?group_by=player",
+            "correlations",
+            "histogram/points",
+            "rows",
+            "sheets",
+        ]
+
+        def status(client, path):
+            # Requests share the test's app context, where the user is cached
+            g.pop("_login_user", None)
+            return client.get(f"{self.base}/{path}").status_code
+
+        anonymous = self.app.test_client()
+        self.assertEqual([status(anonymous, path) for path in paths], [401] * 5)
+
+        outsider = self.app.test_client()
+        outsider.post(
+            "/auth/login", data={"username": "outsider", "password": "password"}
+        )
+        self.assertEqual([status(outsider, path) for path in paths], [403] * 5)
+
+        db.session.add(Share(dataset_id=self.dataset.id, shared_with_id=other.id))
+        db.session.commit()
+        self.assertEqual(status(outsider, "correlations"), 200)
+
+    def test_results_are_deleted_with_dataset(self):
+        self.client.get(f"{self.base}/correlations")
+        with patch("app.utils.validate_csrf"):
+            self.client.post(
+                f"/datasets/delete/{self.dataset.id}", data={"csrf_token": "token"}
+            )
+        self.assertEqual(DatasetResult.query.count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import unittest
+
+from app.extensions import GeminiAPI, GeminiAPIError
+from app.resilience import CircuitBreaker
+from scripts.fake_gemini_server import SCOUT_REPORT, FakeGeminiServer
+
+
+class TestFakeGeminiServer(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeGeminiServer(stream_interval_ms=0).start()
+        self.addCleanup(self.server.stop)
+        self.client = GeminiAPI(api_key="test-key", base_url=self.server.base_url)
+        self.addCleanup(self.client.close)
+
+    def test_generate_content_matches_gemini_shape(self):
+        text = self.client.generate_content("Analyze this report")
+        self.assertEqual(json.loads(text), SCOUT_REPORT)
+
+    def test_stream_generate_content(self):
+        pieces = list(self.client.stream_generate_content("Analyze this report"))
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(json.loads("".join(pieces)), SCOUT_REPORT)
+
+    def test_error_and_rate_limit_responses(self):
+        self.client.breaker = CircuitBreaker(failure_threshold=100)
+        self.server.error_rate = 1.0
+        with self.assertRaises(GeminiAPIError) as raised:
+            self.client.generate_content("hi")
+        self.assertEqual(raised.exception.status_code, 500)
+
+        self.server.error_rate = 0.0
+        self.server.rate_limit_rate = 1.0
+        with self.assertRaises(GeminiAPIError) as raised:
+            self.client.generate_content("hi")
+        self.assertEqual(raised.exception.status_code, 429)
+        self.assertEqual(self.server.counters["rate_limited"], 1)
+
+    def test_latency_distributions_are_non_negative(self):
+        for distribution in ("fixed", "uniform", "normal", "lognormal"):
+            self.server.distribution = distribution
+            self.server.latency, self.server.jitter = 0.1, 0.2
+            self.assertGreaterEqual(self.server.sample_latency(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
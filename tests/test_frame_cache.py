@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+from app import create_app
+from app.utils.frame_cache import FrameCache, load_dataset_frame
+
+
+def frame(rows):
+    return pd.DataFrame({"value": range(rows), "label": ["x"] * rows})
+
+
+class TestFrameCache(unittest.TestCase):
+    def test_hit_and_miss_counters(self):
+        cache = FrameCache(max_bytes=10**6)
+        self.assertIsNone(cache.get(1, "v1"))
+        df = frame(10)
+        cache.set(1, "v1", df)
+        self.assertIs(cache.get(1, "v1"), df)
+        self.assertIsNone(cache.get(1, "v2"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_evicts_least_recently_used_within_budget(self):
+        size = int(frame(100).memory_usage(index=True, deep=True).sum())
+        cache = FrameCache(max_bytes=size * 2)
+        cache.set(1, "v", frame(100))
+        cache.set(2, "v", frame(100))
+        cache.get(1, "v")
+        cache.set(3, "v", frame(100))
+
+        self.assertIsNotNone(cache.get(1, "v"))
+        self.assertIsNone(cache.get(2, "v"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["bytes"], size * 2)
+
+    def test_new_version_and_invalidate_drop_old_entries(self):
+        cache = FrameCache(max_bytes=10**6)
+        cache.set(1, "v1", frame(5))
+        cache.set(1, "v2", frame(6))
+        self.assertEqual(cache.stats()["entries"], 1)
+        cache.invalidate(1)
+        self.assertIsNone(cache.get(1, "v2"))
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_oversized_frames_are_not_cached(self):
+        cache = FrameCache(max_bytes=10)
+        cache.set(1, "v", frame(100))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+class TestLoadDatasetFrame(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dataset = SimpleNamespace(
+            id=42, file_path=os.path.join(self.tmp_dir, "data.csv")
+        )
+        frame(20).to_csv(self.dataset.file_path, index=False)
+        cache_patch = patch("app.utils.frame_cache.frame_cache", FrameCache(10**7))
+        self.cache = cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+    def tearDown(self):
+        self.app_context.pop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_repeat_loads_come_from_memory(self):
+        first, _ = load_dataset_frame(self.dataset)
+        with patch("app.utils.load_dataset") as load:
+            second, _ = load_dataset_frame(self.dataset)
+        load.assert_not_called()
+        self.assertIs(first, second)
+
+    def test_changed_file_is_reloaded(self):
+        load_dataset_frame(self.dataset)
+        frame(30).to_csv(self.dataset.file_path, index=False)
+        df, _ = load_dataset_frame(self.dataset)
+        self.assertEqual(len(df), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import threading
+import unittest
+from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app import create_app
+from app.extensions import GeminiAPI, GeminiAPIError, db, get_gemini_api
+from app.models.user import User
+from app.scout_analysis.services import ScoutAnalysisService
+
+ANALYSIS = {"player_name": "Test Player", "position": "Guard", "overall_rating": 80}
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("x-goog-api-key") != "test-key":
+            status, body = 400, {"error": {"message": "API key not valid"}}
+        else:
+            text = json.dumps(ANALYSIS)
+            status, body = 200, {
+                "candidates": [{"content": {"parts": [{"text": text}]}}]
+            }
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class TestGeminiClient(unittest.TestCase):
+    def setUp(self):
+        self.server = CountingServer(("127.0.0.1", 0), FakeGeminiHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1beta"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        """Sequential calls share one keep-alive connection"""
+        client = GeminiAPI(api_key="test-key", base_url=self.base_url)
+        for _ in range(5):
+            self.assertEqual(json.loads(client.generate_content("hi")), ANALYSIS)
+        client.close()
+        self.assertEqual(self.server.connections, 1)
+
+    def test_error_status_raises(self):
+        """Non-200 responses raise GeminiAPIError with the status code"""
+        client = GeminiAPI(api_key="wrong-key", base_url=self.base_url)
+        with self.assertRaises(GeminiAPIError) as ctx:
+            client.generate_content("hi")
+        self.assertEqual(ctx.exception.status_code, 400)
+        client.close()
+
+    def test_scout_analysis_uses_shared_client(self):
+        """analyze_report goes through the configured singleton client"""
+        app = create_app("testing")
+        app.config.update(GEMINI_API_KEY="test-key")
+        with app.app_context():
+            client = get_gemini_api()
+            original_base_url = client.base_url
+            client.base_url = self.base_url
+            try:
+                result = ScoutAnalysisService.analyze_report("Test Player report")
+            finally:
+                client.base_url = original_base_url
+        self.assertEqual(result, ANALYSIS)
+
+    def test_zero_rate_limit_disables_limiter(self):
+        """GEMINI_RATE_LIMIT_PER_MINUTE=0 builds a client without a limiter"""
+        app = create_app("testing")
+        app.config.update(GEMINI_RATE_LIMIT_PER_MINUTE=0)
+        with app.app_context(), patch("app.extensions._gemini_api_instance", None):
+            client = get_gemini_api()
+            self.assertIsNone(client.rate_limiter)
+            client.close()
+
+
+class TestAnalyzeEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, GEMINI_API_KEY="test-key")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        user = User(username="analyst", email="analyst@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_anonymous_requests_are_rejected(self):
+        with patch("app.api.gemini_analysis.analyze_sentiment") as analyze:
+            response = self.client.post("/api/analyze", json={"text": "Great game"})
+        self.assertEqual(response.status_code, 401)
+        analyze.assert_not_called()
+
+    def test_missing_body_is_a_bad_request(self):
+        self.client.post(
+            "/auth/login", data={"username": "analyst", "password": "password"}
+        )
+        response = self.client.post("/api/analyze", data="not json")
+        self.assertEqual(response.status_code, 400)
+
+        with patch(
+            "app.api.gemini_analysis.analyze_sentiment", return_value="positive"
+        ):
+            response = self.client.post("/api/analyze", json={"text": "Great game"})
+        self.assertEqual(response.get_json(), {"result": "positive"})
+
+
+if __name__ == "__main__":
+    unittest.main()
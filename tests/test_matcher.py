@@ -0,0 +1,92 @@
+import random
+import re
+import unittest
+
+from app.scout_analysis.matcher import KeywordMatcher
+from app.scout_analysis.mock_service import MockAnalysisService
+from app.scout_analysis.processors import SCOUT_KEYWORDS, score_scout_report
+
+
+def naive_score(text):
+    """Reference implementation with one scan per keyword and pattern"""
+    text_lower = text.lower()
+    keyword_count = sum(1 for keyword in SCOUT_KEYWORDS if keyword in text_lower)
+    patterns = [
+        r"strengths[：:].+?weaknesses[：:]",
+        r"advantages[：:].+?disadvantages[：:]",
+        r"player info|player information",
+        r"overall rating|comprehensive rating",
+        r"development|development direction",
+    ]
+    section_count = sum(
+        1 for pattern in patterns if re.search(pattern, text_lower, re.DOTALL)
+    )
+    return keyword_count, section_count
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_finds_overlapping_and_nested_keywords(self):
+        matcher = KeywordMatcher(["scout", "scout report", "report", "Scouting"])
+        self.assertEqual(
+            matcher.find("a scout report on scouting"),
+            {"scout", "scout report", "report", "scouting"},
+        )
+
+    def test_scan_reports_first_and_last_positions(self):
+        matcher = KeywordMatcher(["advantages:", "disadvantages:"])
+        positions = matcher.scan("disadvantages: x advantages:")
+        self.assertEqual(positions["disadvantages:"], (0, 0))
+        self.assertEqual(positions["advantages:"], (3, 17))
+
+    def test_duplicates_are_ignored(self):
+        self.assertEqual(KeywordMatcher(["a", "A", "b", "a"]).keywords, ("a", "b"))
+
+    def test_matches_substring_checks(self):
+        vocabulary = ["ab", "abc", "bca", "c", "cab", "b"]
+        matcher = KeywordMatcher(vocabulary)
+        rng = random.Random(5)
+        for _ in range(500):
+            text = "".join(rng.choice("abcx") for _ in range(rng.randint(0, 12)))
+            expected = {word for word in vocabulary if word in text}
+            self.assertEqual(matcher.find(text), expected, text)
+
+
+class TestReportScoring(unittest.TestCase):
+    def test_scores_match_reference_implementation(self):
+        pieces = [
+            "Strengths: ",
+            "Weaknesses：",
+            "advantages:",
+            "disadvantages:",
+            "Player Information",
+            "overall rating",
+            "player development",
+            "scout report",
+            "SCOUTING",
+            "draft potential",
+            "filler text ",
+            "\n",
+        ]
+        rng = random.Random(7)
+        for _ in range(300):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 8)))
+            self.assertEqual(score_scout_report(text), naive_score(text), text)
+
+    def test_section_markers_must_be_in_order(self):
+        self.assertEqual(score_scout_report("Weaknesses: a Strengths: b")[1], 0)
+        self.assertEqual(score_scout_report("Strengths: a Weaknesses: b")[1], 1)
+
+
+class TestMockAnalysis(unittest.TestCase):
+    def test_keywords_drive_mock_analysis(self):
+        result = MockAnalysisService.analyze_text(
+            "Curry and LeBron: a great SHOOTER with defensive instincts"
+        )
+        self.assertEqual(result["player_info"]["name"], "LeBron James")
+        self.assertEqual(result["offensive_rating"], 88)
+        self.assertEqual(result["defensive_rating"], 85)
+        self.assertEqual(result["physical_rating"], 78)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.datasets.numeric_stats import block_statistics, describe_numeric
+from app.datasets.profiling import profile_dataframe
+
+
+class TestNumericStats(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        points = rng.normal(12, 5, 1001)
+        points[::9] = np.nan
+        self.df = pd.DataFrame(
+            {
+                "points": points,
+                "rebounds": rng.poisson(6, 1001),
+                "blocks": pd.array(rng.integers(0, 3, 1001), dtype="Int64"),
+                "team": rng.choice(["A", "B"], 1001),
+            }
+        )
+        self.df.loc[3, "blocks"] = pd.NA
+        self.numeric = ["points", "rebounds", "blocks"]
+
+    def test_matches_describe(self):
+        expected = self.df[self.numeric].describe().to_dict()
+        actual = describe_numeric(self.df, self.numeric)
+        for col in self.numeric:
+            self.assertEqual(list(actual[col])[:8], list(expected[col]))
+            for stat, value in expected[col].items():
+                self.assertAlmostEqual(actual[col][stat], value, places=9)
+
+    def test_extra_statistics(self):
+        actual = describe_numeric(self.df, self.numeric)["points"]
+        series = self.df["points"]
+        self.assertEqual(actual["nulls"], series.isna().sum())
+        self.assertAlmostEqual(actual["sum"], series.sum(), places=6)
+        self.assertAlmostEqual(actual["var"], series.var(), places=9)
+
+    def test_empty_and_single_value_columns(self):
+        block = np.array([[np.nan, 4.0], [np.nan, np.nan]])
+        stats = block_statistics(block)
+        self.assertEqual(stats["count"].tolist(), [0, 1])
+        self.assertTrue(np.isnan(stats["mean"][0]))
+        self.assertTrue(np.isnan(stats["min"][0]))
+        self.assertEqual((stats["min"][1], stats["max"][1], stats[0.5][1]), (4, 4, 4))
+        self.assertTrue(np.isnan(stats["var"][1]))
+
+        empty = block_statistics(np.empty((0, 2)))
+        self.assertEqual(empty["count"].tolist(), [0, 0])
+        self.assertTrue(np.isnan(empty[0.25]).all())
+
+    def test_profile_uses_kernel_results_for_insights(self):
+        profile = profile_dataframe(self.df)
+        self.assertEqual(profile["numeric_columns"], self.numeric)
+        stats = profile["statistics"]["rebounds"]
+        self.assertIn(
+            f"Column rebounds has a maximum value of {stats['max']:.2f} "
+            f"and a minimum value of {stats['min']:.2f}.",
+            profile["insights"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
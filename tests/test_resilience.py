@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import MagicMock
+
+from app.extensions import GeminiAPI, GeminiAPIError, GeminiUnavailableError
+from app.resilience import CircuitBreaker, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            failure_threshold=3, recovery_timeout=10, clock=self.clock
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open())
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state()["trips"], 1)
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state()["state"], CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_closes_or_reopens(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+
+        # Only one probe is let through while half-open
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open())
+
+        self.clock.now = 20
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state()["state"], CircuitBreaker.CLOSED)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(
+            rate=2, capacity=2, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def test_burst_then_refill(self):
+        self.assertEqual(self.bucket.try_acquire(), 0.0)
+        self.assertEqual(self.bucket.try_acquire(), 0.0)
+        self.assertAlmostEqual(self.bucket.try_acquire(), 0.5)
+        self.clock.now = 0.5
+        self.assertEqual(self.bucket.try_acquire(), 0.0)
+
+    def test_acquire_waits_within_timeout(self):
+        self.bucket.try_acquire(2)
+        self.assertFalse(self.bucket.acquire(timeout=0.1))
+        self.assertTrue(self.bucket.acquire(timeout=1))
+        self.assertEqual(self.bucket.state()["throttled_calls"], 1)
+
+    def test_penalize_pauses_refill(self):
+        self.bucket.penalize(5)
+        self.clock.now = 4
+        self.assertGreater(self.bucket.try_acquire(), 0)
+        self.clock.now = 6
+        self.assertEqual(self.bucket.try_acquire(), 0.0)
+
+    def test_rate_and_capacity_are_validated(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, capacity=2)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, capacity=0)
+
+
+class TestGuardedGeminiClient(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.client = GeminiAPI(
+            api_key="test-key",
+            breaker=CircuitBreaker(
+                failure_threshold=2, recovery_timeout=30, clock=self.clock
+            ),
+            rate_limiter=TokenBucket(
+                rate=1, capacity=5, clock=self.clock, sleep=self.clock.sleep
+            ),
+        )
+        self.client._post = MagicMock()
+
+    def respond(self, status_code, headers=None):
+        response = MagicMock(status_code=status_code, text="", headers=headers or {})
+        response.json.return_value = {
+            "candidates": [{"content": {"parts": [{"text": "ok"}]}}]
+        }
+        self.client._post.return_value = response
+
+    def test_server_errors_trip_the_breaker(self):
+        """While open, calls fail fast without reaching Gemini"""
+        self.respond(503)
+        for _ in range(2):
+            with self.assertRaises(GeminiAPIError):
+                self.client.generate_content("hi")
+        with self.assertRaises(GeminiUnavailableError):
+            self.client.generate_content("hi")
+        self.assertEqual(self.client._post.call_count, 2)
+
+        # A successful half-open probe closes the circuit again
+        self.clock.now = 30
+        self.respond(200)
+        self.assertEqual(self.client.generate_content("hi"), "ok")
+        self.assertEqual(self.client.state()["circuit_breaker"]["state"], "closed")
+
+    def test_timeouts_count_as_failures(self):
+        self.client._post.side_effect = TimeoutError("read timed out")
+        for _ in range(2):
+            with self.assertRaises(TimeoutError):
+                self.client.generate_content("hi")
+        self.assertTrue(self.client.breaker.is_open())
+
+    def test_429_pauses_the_rate_limiter(self):
+        """Quota errors stop further calls until Retry-After has passed"""
+        self.respond(429, headers={"Retry-After": "20"})
+        with self.assertRaises(GeminiAPIError):
+            self.client.generate_content("hi")
+        with self.assertRaises(GeminiUnavailableError):
+            self.client.generate_content("hi")
+        self.assertEqual(self.client._post.call_count, 1)
+        self.assertEqual(self.client.state()["circuit_breaker"]["state"], "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from app import create_app
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.user import User
+from app.utils.row_index import (
+    build_row_index,
+    load_row_index,
+    read_rows,
+    remove_row_index,
+)
+
+
+class TestRowIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "rows.csv")
+        self.df = pd.DataFrame(
+            {
+                "id": range(300),
+                "note": [
+                    'said "hi"\nthen left' if i % 9 == 0 else "ok" for i in range(300)
+                ],
+            }
+        )
+        self.df.to_csv(self.path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_index_skips_quoted_line_breaks(self):
+        index = build_row_index(self.path, stride=16)
+        self.assertEqual(index["row_count"], 300)
+        self.assertEqual(len(index["offsets"]), 19)
+
+    def test_windows_match_full_parse(self):
+        build_row_index(self.path, stride=16)
+        for offset, limit in ((0, 5), (15, 3), (16, 40), (290, 50)):
+            rows, total = read_rows(self.path, offset, limit)
+            expected = self.df.iloc[offset : offset + limit].reset_index(drop=True)
+            pd.testing.assert_frame_equal(rows, expected)
+            self.assertEqual(total, 300)
+
+    def test_past_the_end_is_empty(self):
+        rows, total = read_rows(self.path, 500, 10)
+        self.assertTrue(rows.empty)
+        self.assertEqual(list(rows.columns), ["id", "note"])
+
+    def test_changed_file_rebuilds_index(self):
+        build_row_index(self.path)
+        with open(self.path, "a") as f:
+            f.write("300,new\n")
+        self.assertEqual(load_row_index(self.path)["row_count"], 301)
+
+    def test_index_from_older_version_is_rebuilt(self):
+        index = build_row_index(self.path)
+        del index["has_header"]
+        index["version"] = 1
+        with open(f"{self.path}.index.json", "w") as f:
+            json.dump(index, f)
+        self.assertTrue(load_row_index(self.path)["has_header"])
+
+    def test_failed_write_leaves_no_temp_file(self):
+        with patch("json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                build_row_index(self.path)
+        self.assertEqual(os.listdir(self.tmp_dir), ["rows.csv"])
+
+    def test_remove_deletes_index_and_leftover_temp_files(self):
+        build_row_index(self.path)
+        leftover = f"{self.path}.index.json.abc123.tmp"
+        open(leftover, "w").close()
+        remove_row_index(self.path)
+        self.assertEqual(os.listdir(self.tmp_dir), ["rows.csv"])
+
+
+class TestRowsEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="pager", email="pager@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "pager", "password": "password"}
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_rows_are_paged_through_the_index(self):
+        csv = "player,points\n" + "".join(f"P{i},{i}\n" for i in range(2500))
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Rows", "file": (io.BytesIO(csv.encode()), "rows.csv")},
+            content_type="multipart/form-data",
+        )
+        dataset = Dataset.query.order_by(Dataset.id.desc()).first()
+        self.assertTrue(os.path.exists(f"{dataset.file_path}.index.json"))
+
+        with patch("app.api.routes.load_dataset_frame") as load:
+            response = self.client.get(
+                f"/api/dataset/{dataset.id}/rows?offset=2048&limit=3"
+            )
+        load.assert_not_called()
+        data = response.get_json()
+        self.assertEqual(data["total_rows"], 2500)
+        self.assertEqual(
+            data["rows"],
+            [{"player": f"P{i}", "points": i} for i in range(2048, 2051)],
+        )
+
+    def test_blank_lines_are_not_rows(self):
+        csv = b"a,b\n1,2\n\n3,4\n \r\n5,6\n\n"
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Gaps", "file": (io.BytesIO(csv), "gaps.csv")},
+            content_type="multipart/form-data",
+        )
+        dataset = Dataset.query.order_by(Dataset.id.desc()).first()
+        response = self.client.get(f"/api/dataset/{dataset.id}/rows?offset=1&limit=2")
+        data = response.get_json()
+        self.assertEqual(data["total_rows"], 3)
+        self.assertEqual(data["rows"], [{"a": 3, "b": 4}, {"a": 5, "b": 6}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app import create_app
+from app.datasets.profiling import profile_dataframe
+from app.datasets.sketches import CategoricalSketch, HyperLogLog, SpaceSaving
+from app.datasets.streaming import profile_file
+
+
+def words(ids):
+    return pd.Series([f"player-{i}" for i in ids])
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_estimate_is_close(self):
+        for distinct in (50, 5000, 200000):
+            sketch = HyperLogLog()
+            sketch.update(words(np.arange(distinct)))
+            self.assertLess(abs(sketch.estimate() - distinct) / distinct, 0.05)
+
+    def test_merge_counts_the_union(self):
+        left, right, whole = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        left.update(words(range(0, 30000)))
+        right.update(words(range(20000, 50000)))
+        whole.update(words(range(0, 50000)))
+        left.merge(right)
+        self.assertEqual(left.estimate(), whole.estimate())
+
+    def test_duplicates_do_not_change_the_estimate(self):
+        once, twice = HyperLogLog(), HyperLogLog()
+        once.update(words(range(1000)))
+        twice.update(words(list(range(1000)) * 2))
+        self.assertEqual(once.estimate(), twice.estimate())
+
+
+class TestSpaceSaving(unittest.TestCase):
+    def test_exact_below_capacity(self):
+        sketch = SpaceSaving(capacity=8)
+        for chunk in (["A", "B", "A"], ["C", "A"], ["B"]):
+            sketch.update(pd.Series(chunk))
+        self.assertTrue(sketch.is_exact())
+        self.assertEqual(
+            sketch.top(2),
+            [
+                {"value": "A", "count": 3, "error": 0},
+                {"value": "B", "count": 2, "error": 0},
+            ],
+        )
+
+    def test_heavy_hitters_are_bounded(self):
+        rng = np.random.default_rng(3)
+        values = pd.Series(rng.zipf(1.3, 200000).astype(str))
+        sketch = SpaceSaving(capacity=32)
+        for start in range(0, len(values), 10000):
+            sketch.update(values.iloc[start : start + 10000])
+        self.assertFalse(sketch.is_exact())
+
+        exact = values.value_counts()
+        top = sketch.top(5)
+        self.assertEqual([item["value"] for item in top], exact.index[:5].tolist())
+        for item in top:
+            true_count = exact[item["value"]]
+            self.assertGreaterEqual(item["count"], true_count)
+            self.assertLessEqual(item["count"] - item["error"], true_count)
+
+
+class TestCategoricalSummary(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_summary_counts_nulls_and_values(self):
+        sketch = CategoricalSketch()
+        sketch.update(pd.Series(["PG", None, "C", "PG"]))
+        self.assertEqual(
+            sketch.summary(),
+            {
+                "count": 3,
+                "nulls": 1,
+                "distinct": 2,
+                "distinct_exact": True,
+                "top_values": [
+                    {"value": "PG", "count": 2, "error": 0},
+                    {"value": "C", "count": 1, "error": 0},
+                ],
+            },
+        )
+
+    def test_streamed_summary_matches_in_memory_profile(self):
+        rng = np.random.default_rng(5)
+        df = pd.DataFrame(
+            {
+                "team": rng.choice(["Kings", "Wildcats", "United"], 3000),
+                "player": [f"p{i}" for i in rng.integers(0, 900, 3000)],
+                "points": rng.integers(0, 40, 3000),
+            }
+        )
+        path = os.path.join(self.tmp_dir, "games.csv")
+        df.to_csv(path, index=False)
+
+        streamed = profile_file(path, chunk_rows=250)["categorical_summary"]
+        expected = profile_dataframe(pd.read_csv(path))["categorical_summary"]
+
+        self.assertEqual(list(streamed), ["team", "player"])
+        self.assertEqual(streamed["team"], expected["team"])
+        self.assertEqual(streamed["player"]["distinct"], expected["player"]["distinct"])
+        distinct = df["player"].nunique()
+        self.assertLess(abs(expected["player"]["distinct"] - distinct) / distinct, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
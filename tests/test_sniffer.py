@@ -0,0 +1,148 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from app import create_app
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.dataset_schema import DatasetSchema
+from app.models.user import User
+from app.utils.frame_cache import FrameCache
+from app.utils.row_index import read_rows
+from app.utils.sniffer import sniff_read_options
+
+
+class TestSniffer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def write(self, data, name="data.txt"):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_tab_delimited_export(self):
+        path = self.write(b"player\tteam\tpoints\nA, B\tPerth\t12\nC\tSydney\t8\n")
+        options = sniff_read_options(path)
+        self.assertEqual(options["sep"], "\t")
+        self.assertEqual(options["header"], 0)
+        self.assertEqual(options["engine"], "c")
+        df = pd.read_csv(path, **options)
+        self.assertEqual(df["player"].tolist(), ["A, B", "C"])
+
+    def test_semicolons_with_quoted_delimiters(self):
+        path = self.write(b'name;note;pts\n"Doe; J";"a;b";3\nRoe;c;4\nPoe;d;5\n')
+        options = sniff_read_options(path)
+        self.assertEqual(options["sep"], ";")
+        self.assertEqual(pd.read_csv(path, **options)["name"][0], "Doe; J")
+
+    def test_missing_header_is_detected(self):
+        path = self.write(b"LeBron|23|27.1\nCurry|30|24.8\nDurant|35|27.3\n")
+        options = sniff_read_options(path)
+        self.assertEqual((options["sep"], options["header"]), ("|", None))
+        df = pd.read_csv(path, **options)
+        self.assertEqual(list(df.columns), ["column_0", "column_1", "column_2"])
+        self.assertEqual(len(df), 3)
+
+    def test_encodings(self):
+        bom = self.write("a,b\né,1\n".encode("utf-8-sig"))
+        self.assertEqual(sniff_read_options(bom)["encoding"], "utf-8-sig")
+        legacy = self.write("a,b\nJosé,1\n".encode("cp1252"), "legacy.txt")
+        options = sniff_read_options(legacy)
+        self.assertEqual(options["encoding"], "cp1252")
+        self.assertEqual(pd.read_csv(legacy, **options)["a"][0], "José")
+
+    def test_sample_is_bounded(self):
+        path = self.write(b"x;y\n" + b"1;2\n" * 100000)
+        self.assertEqual(sniff_read_options(path, sample_bytes=1024)["sep"], ";")
+
+    def test_row_window_without_header(self):
+        path = self.write(b"".join(b"P%d\t%d\n" % (i, i) for i in range(50)))
+        options = sniff_read_options(path)
+        rows, total = read_rows(path, 10, 2, options)
+        self.assertEqual(total, 50)
+        self.assertEqual(rows.values.tolist(), [["P10", 10], ["P11", 11]])
+
+
+class TestStoredParseOptions(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="sniff", email="sniff@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        cache_patch = patch("app.utils.frame_cache.frame_cache", FrameCache(10**7))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "sniff", "password": "password"}
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_options_are_stored_and_reused(self):
+        data = b"player\tpoints\n" + b"".join(b"P%d\t%d\n" % (i, i) for i in range(30))
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Tabs", "file": (io.BytesIO(data), "tabs.txt")},
+            content_type="multipart/form-data",
+        )
+        dataset = Dataset.query.order_by(Dataset.id.desc()).first()
+        schema = DatasetSchema.query.filter_by(dataset_id=dataset.id).one()
+        self.assertEqual(schema.get_parse_options()["sep"], "\t")
+        self.assertEqual(schema.column_names(), ["player", "points"])
+
+        with patch("app.utils.sniffer.sniff_read_options") as sniff:
+            response = self.client.get(
+                f"/api/dataset/{dataset.id}/rows?offset=5&limit=1"
+            )
+        sniff.assert_not_called()
+        self.assertEqual(response.get_json()["rows"], [{"player": "P5", "points": 5}])
+
+    def test_headerless_columns_can_be_requested_by_name(self):
+        data = b"".join(b"P%d\t%d\t%d\n" % (i, i, 2 * i) for i in range(30))
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Bare", "file": (io.BytesIO(data), "bare.txt")},
+            content_type="multipart/form-data",
+        )
+        dataset = Dataset.query.order_by(Dataset.id.desc()).first()
+        schema = DatasetSchema.query.filter_by(dataset_id=dataset.id).one()
+        self.assertEqual(schema.column_names(), ["column_0", "column_1", "column_2"])
+
+        response = self.client.get(
+            f"/api/dataset/{dataset.id}/visualize",
+            query_string={"x_column": "column_1", "y_column": "column_2"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["y"][:3], [0, 2, 4])
+
+        response = self.client.get(f"/api/dataset/{dataset.id}/correlations")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["columns"], ["column_1", "column_2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
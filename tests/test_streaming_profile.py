@@ -0,0 +1,120 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app import create_app
+from app.datasets.profiling import profile_dataframe, use_streaming
+from app.datasets.streaming import ColumnAccumulator, QuantileSketch, profile_file
+
+
+class TestStreamingProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def write_csv(self, df, name="data.csv"):
+        path = os.path.join(self.tmp_dir, name)
+        df.to_csv(path, index=False)
+        return path
+
+    def test_matches_in_memory_profile(self):
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(
+            {
+                "points": rng.integers(0, 40, 500),
+                "minutes": rng.normal(24, 6, 500).round(1),
+                "team": rng.choice(["A", "B", "C"], 500),
+            }
+        )
+        df.loc[::17, "minutes"] = np.nan
+        path = self.write_csv(df)
+
+        streamed = profile_file(path, chunk_rows=64)
+        expected = profile_dataframe(pd.read_csv(path))
+
+        for key in ("row_count", "column_count", "column_types"):
+            self.assertEqual(streamed[key], expected[key], key)
+        # NaN never compares equal, so compare the serialized preview
+        self.assertEqual(
+            json.dumps(streamed["preview"]), json.dumps(expected["preview"])
+        )
+        self.assertEqual(streamed["numeric_columns"], ["points", "minutes"])
+        self.assertEqual(streamed["insights"], expected["insights"])
+        for col in ("points", "minutes"):
+            for stat, value in expected["statistics"][col].items():
+                self.assertAlmostEqual(streamed["statistics"][col][stat], value)
+
+    def test_column_becomes_text_in_a_later_chunk(self):
+        df = pd.DataFrame({"value": [1, 2, 3, 4, "none", 6]})
+        streamed = profile_file(self.write_csv(df), chunk_rows=2)
+        self.assertEqual(streamed["numeric_columns"], [])
+        self.assertEqual(streamed["column_types"], {"value": "object"})
+        self.assertNotIn("statistics", streamed)
+
+    def test_accumulators_merge_like_a_single_pass(self):
+        values = np.random.default_rng(2).normal(10, 3, 10000)
+        left, right = ColumnAccumulator(), ColumnAccumulator()
+        left.update(pd.Series(values[:3000]))
+        right.update(pd.Series(values[3000:]))
+        left.merge(right)
+        stats = left.describe()
+        self.assertAlmostEqual(stats["mean"], values.mean())
+        self.assertAlmostEqual(stats["std"], values.std(ddof=1))
+
+    @staticmethod
+    def rank_errors(sketch, values):
+        """Distance of each estimated quartile's rank from the requested one"""
+        ordered = np.sort(values)
+        errors = []
+        for q in (0.25, 0.5, 0.75):
+            estimate = sketch.quantile(q)
+            low = np.searchsorted(ordered, estimate, side="left")
+            high = np.searchsorted(ordered, estimate, side="right")
+            errors.append((low + high) / 2 / len(ordered) - q)
+        return np.array(errors)
+
+    def test_sketch_memory_is_bounded(self):
+        rng = np.random.default_rng(3)
+        for values in (
+            rng.random(200000),
+            rng.normal(size=200000),
+            np.arange(200000.0),  # already sorted
+        ):
+            sketch = QuantileSketch(capacity=256)
+            for chunk in np.array_split(values, 40):
+                sketch.update(chunk)
+            levels = sum(len(level) for level in sketch.levels)
+            self.assertLessEqual(levels, 256 * 12)
+            self.assertLess(np.abs(self.rank_errors(sketch, values)).max(), 0.01)
+
+    def test_sketch_quartiles_are_unbiased(self):
+        errors = []
+        for seed in range(20):
+            values = np.random.default_rng(seed).random(20000)
+            sketch = QuantileSketch(capacity=256, seed=seed)
+            for start in range(0, len(values), 300):
+                sketch.update(values[start : start + 300])
+            errors.append(self.rank_errors(sketch, values))
+        self.assertLess(np.abs(np.mean(errors, axis=0)).max(), 0.002)
+
+    def test_threshold_selects_streaming(self):
+        path = self.write_csv(pd.DataFrame({"a": range(100)}))
+        self.app.config["DATASET_STREAMING_THRESHOLD_BYTES"] = 10
+        self.assertTrue(use_streaming(path))
+        self.app.config["DATASET_STREAMING_THRESHOLD_BYTES"] = 10**9
+        self.assertFalse(use_streaming(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from app import create_app
+from app.extensions import db
+from app.models.dataset import Dataset
+from app.models.user import User
+from app.utils import load_dataset
+from app.utils.frame_cache import FrameCache
+from app.utils.sidecar import remove_sidecar
+from app.utils.workbook import convert_workbook, load_sheet, read_catalog
+
+SHEETS = {
+    "Players": pd.DataFrame({"player": ["A", "B", "C"], "points": [10, 20, 30]}),
+    "Teams": pd.DataFrame({"team": ["Perth", "Sydney"], "wins": [18, 12]}),
+}
+
+
+def fake_read_excel(file_path, sheet_name=0, **kwargs):
+    """Stand-in for the Excel parser, which needs openpyxl or xlrd"""
+    if sheet_name is None:
+        return {name: df.copy() for name, df in SHEETS.items()}
+    return list(SHEETS.values())[0].copy()
+
+
+class TestWorkbookConversion(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "stats.xlsx")
+        with open(self.path, "wb") as f:
+            f.write(b"workbook bytes")
+        read_patch = patch("pandas.read_excel", side_effect=fake_read_excel)
+        self.read_excel = read_patch.start()
+        self.addCleanup(read_patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_workbook_is_parsed_once(self):
+        df, error = load_sheet(self.path)
+        self.assertIsNone(error)
+        self.assertEqual(df["points"].tolist(), [10, 20, 30])
+
+        teams, _ = load_sheet(self.path, "Teams")
+        again, _ = load_dataset(self.path, sheet="Teams")
+        pd.testing.assert_frame_equal(teams, SHEETS["Teams"])
+        pd.testing.assert_frame_equal(again, SHEETS["Teams"])
+        self.assertEqual(self.read_excel.call_count, 1)
+
+    def test_catalog_lists_sheets(self):
+        load_sheet(self.path)
+        catalog = read_catalog(self.path)
+        self.assertEqual(
+            [(s["name"], s["rows"]) for s in catalog["sheets"]],
+            [("Players", 3), ("Teams", 2)],
+        )
+        self.assertEqual(catalog["sheets"][1]["columns"], ["team", "wins"])
+
+    def test_unknown_sheet(self):
+        df, error = load_sheet(self.path, "Games")
+        self.assertIsNone(df)
+        self.assertEqual(error, "Sheet not found: Games")
+
+    def test_changed_workbook_is_converted_again(self):
+        load_sheet(self.path)
+        with open(self.path, "ab") as f:
+            f.write(b" edited")
+        self.assertIsNone(read_catalog(self.path))
+        load_sheet(self.path)
+        self.assertEqual(self.read_excel.call_count, 2)
+
+    def test_remove_sidecar_deletes_sheets(self):
+        load_sheet(self.path)
+        remove_sidecar(self.path)
+        self.assertEqual(os.listdir(self.tmp_dir), ["stats.xlsx"])
+
+    def test_failed_catalog_write_leaves_no_temp_file(self):
+        real_replace = os.replace
+
+        def replace(src, dst):
+            if dst.endswith(".sheets.cache.json"):
+                raise OSError("disk full")
+            real_replace(src, dst)
+
+        with patch("os.replace", side_effect=replace):
+            with self.assertRaises(OSError):
+                convert_workbook(self.path)
+        self.assertEqual(
+            [name for name in os.listdir(self.tmp_dir) if name.endswith(".tmp")], []
+        )
+
+    def test_remove_sidecar_deletes_leftover_catalog_writes(self):
+        load_sheet(self.path)
+        open(f"{self.path}.sheets.cache.json.abc123.tmp", "w").close()
+        remove_sidecar(self.path)
+        self.assertEqual(os.listdir(self.tmp_dir), ["stats.xlsx"])
+
+
+class TestSheetEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = create_app("testing")
+        self.app.config.update(WTF_CSRF_ENABLED=False, UPLOAD_FOLDER=self.upload_dir)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(username="excel", email="excel@example.com", is_verified=True)
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        for target, kwargs in (
+            ("pandas.read_excel", {"side_effect": fake_read_excel}),
+            ("app.utils.frame_cache.frame_cache", {"new": FrameCache(10**7)}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"username": "excel", "password": "password"}
+        )
+        self.client.post(
+            "/datasets/upload",
+            data={"title": "Book", "file": (io.BytesIO(b"xls bytes"), "book.xls")},
+            content_type="multipart/form-data",
+        )
+        self.dataset = Dataset.query.order_by(Dataset.id.desc()).first()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_upload_converts_workbook(self):
+        self.assertIsNotNone(read_catalog(self.dataset.file_path))
+        response = self.client.get(f"/api/dataset/{self.dataset.id}/analyze")
+        self.assertEqual(response.get_json()["numeric_columns"], ["points"])
+
+    def test_sheets_and_sheet_charts(self):
+        sheets = self.client.get(f"/api/dataset/{self.dataset.id}/sheets").get_json()
+        self.assertEqual([s["name"] for s in sheets["sheets"]], ["Players", "Teams"])
+
+        data = self.client.get(
+            f"/api/dataset/{self.dataset.id}/visualize?sheet=Teams"
+        ).get_json()
+        self.assertEqual((data["x"], data["y"]), (["Perth", "Sydney"], [18, 12]))
+
+        rows = self.client.get(
+            f"/api/dataset/{self.dataset.id}/rows?sheet=Teams&offset=1"
+        ).get_json()
+        self.assertEqual(rows["rows"], [{"team": "Sydney", "wins": 12}])
+
+
+if __name__ == "__main__":
+    unittest.main()